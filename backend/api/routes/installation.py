@@ -4,28 +4,78 @@ Installation API Routes for K8s Auto Installer
 Provides REST endpoints for managing Kubernetes installations
 """
 
+import gzip
+import hashlib
 import threading
 import time
-from flask import Blueprint, request, jsonify
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from typing import Dict, Any, List, Callable, Optional, Tuple, Deque
 import uuid
+import zlib
+from collections import deque
+import orjson
+from jsonschema import Draft7Validator, FormatChecker
+from jsonschema.exceptions import ValidationError as JsonSchemaValidationError
 
 from backend.core.installer import (
     create_installer, InstallationConfig, InstallationMode,
     NodeConfig, CNIProvider, InstallationStatus
 )
-from backend.core.ssh_manager import SSHConfig, SSHAuthMethod
+from backend.core.ssh_manager import SSHConfig, SSHAuthMethod, SSHBackend
 from backend.config.settings import settings
-from backend.utils.logger import get_logger, log_manager
+from backend.utils.logger import get_logger, log_manager, LogLevel
 from backend.utils.helpers import validate_ip_address, validate_cidr, validate_k8s_version
 
 # Create blueprint
 installation_bp = Blueprint('installation', __name__, url_prefix='/api/v1/installation')
 logger = get_logger(__name__)
 
-# Global storage for installation instances
+# Global storage for installation instances, guarded by _installations_lock
 installations: Dict[str, Any] = {}
-installation_threads: Dict[str, threading.Thread] = {}
+_installations_lock = threading.Lock()
+
+# Completed installations are kept for a while and then evicted oldest first;
+# running installations are never evicted
+MAX_COMPLETED_INSTALLATIONS = 256
+COMPLETED_RETENTION_SECONDS = 24 * 3600
+_completed_ids: Deque[str] = deque()
+
+# Shared worker pool for background installations
+MAX_CONCURRENT_INSTALLATIONS = 8
+EXECUTOR = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_INSTALLATIONS,
+    thread_name_prefix='installation'
+)
+
+# Log responses at least this large are gzipped for clients that accept it
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 4
+
+# Numeric rank for each log level name accepted by the logs endpoint
+LEVEL_RANK = {level.name: level.value for level in LogLevel}
+
+# Settings sections read on every start request
+_K8S = settings.k8s
+_SSH = settings.ssh
+_SEC = settings.security
+_MON = settings.monitoring
+_UUID4 = uuid.uuid4
+
+# Start requests larger than this are rejected before the body is parsed
+MAX_START_BODY_BYTES = 256 * 1024
+
+# Top-level request fields read by validation and create_installation_config
+KNOWN_FIELDS = frozenset((
+    'k8s_version', 'pod_cidr', 'service_cidr', 'cni_provider', 'cluster_name',
+    'enable_rbac', 'enable_network_policies', 'enable_monitoring',
+    'masters', 'workers', 'load_balancer', 'ssh_config'
+))
+
+# Accepted installation modes and CNI providers, computed once for lookups
+VALID_MODES = frozenset(('all_in_one', 'ha_secure'))
+ESTIMATED_DURATIONS = {'all_in_one': '10-15 minutes', 'ha_secure': '30-45 minutes'}
+SUPPORTED_CNIS = [cni.value for cni in CNIProvider]
 
 # Request validation schemas
 REQUIRED_FIELDS = {
@@ -33,93 +83,142 @@ REQUIRED_FIELDS = {
     'ha_secure': ['k8s_version', 'masters', 'load_balancer']
 }
 
-def validate_request_data(data: Dict[str, Any], mode: str) -> tuple[bool, str]:
-    """Validate request data"""
-    errors = []
+# Error messages for missing fields that need more context than the default
+MISSING_FIELD_MESSAGES = {
+    ('ssh_config',): "SSH configuration required for HA mode",
+    ('ssh_config', 'username'): "SSH username is required",
+    ('ssh_config', 'password'): "SSH password is required for password authentication",
+    ('ssh_config', 'key_path'): "SSH key path is required for key authentication",
+}
+
+def _string_format(check: Callable[[str], bool]) -> Callable[[Any], bool]:
+    """Apply a format check to strings only, as JSON Schema formats do"""
+    return lambda instance: not isinstance(instance, str) or check(instance)
+
+FORMAT_CHECKER = FormatChecker(formats=())
+FORMAT_CHECKER.checks('ip-address')(_string_format(validate_ip_address))
+FORMAT_CHECKER.checks('cidr')(_string_format(validate_cidr))
+FORMAT_CHECKER.checks('k8s-version')(_string_format(validate_k8s_version))
+
+def _build_schema(mode: str) -> Dict[str, Any]:
+    """Build the JSON Schema for an installation request"""
+    ip_address = {'type': 'string', 'format': 'ip-address'}
+    schema = {
+        'type': 'object',
+        'required': REQUIRED_FIELDS[mode],
+        'properties': {
+            'k8s_version': {
+                'type': 'string',
+                'format': 'k8s-version',
+                'if': {'format': 'k8s-version'},
+                'then': {'enum': list(settings.k8s.supported_versions)}
+            },
+            'pod_cidr': {'type': 'string', 'format': 'cidr'},
+            'service_cidr': {'type': 'string', 'format': 'cidr'},
+            'cni_provider': {'enum': SUPPORTED_CNIS}
+        }
+    }
 
-    # Check required fields
-    required = REQUIRED_FIELDS.get(mode, [])
-    for field in required:
-        if field not in data:
-            errors.append(f"Missing required field: {field}")
-
-    # Validate Kubernetes version
-    if 'k8s_version' in data:
-        if not validate_k8s_version(data['k8s_version']):
-            errors.append(f"Invalid Kubernetes version: {data['k8s_version']}")
-        elif data['k8s_version'] not in settings.k8s.supported_versions:
-            errors.append(f"Unsupported Kubernetes version: {data['k8s_version']}")
-
-    # Validate CIDR ranges
-    if 'pod_cidr' in data and not validate_cidr(data['pod_cidr']):
-        errors.append(f"Invalid pod CIDR: {data['pod_cidr']}")
-
-    if 'service_cidr' in data and not validate_cidr(data['service_cidr']):
-        errors.append(f"Invalid service CIDR: {data['service_cidr']}")
-
-    # Validate CNI provider
-    if 'cni_provider' in data:
-        try:
-            CNIProvider(data['cni_provider'])
-        except ValueError:
-            valid_cnis = [cni.value for cni in CNIProvider]
-            errors.append(f"Invalid CNI provider. Valid options: {', '.join(valid_cnis)}")
-
-    # Mode-specific validation
     if mode == 'ha_secure':
-        # Validate masters
-        if 'masters' in data:
-            if not isinstance(data['masters'], list) or len(data['masters']) < 3:
-                errors.append("HA mode requires at least 3 master nodes")
-
-            for i, master in enumerate(data['masters']):
-                if not validate_ip_address(master):
-                    errors.append(f"Invalid IP address for master {i+1}: {master}")
-
-        # Validate load balancer
-        if 'load_balancer' in data and not validate_ip_address(data['load_balancer']):
-            errors.append(f"Invalid load balancer IP: {data['load_balancer']}")
-
-        # Validate workers (optional)
-        if 'workers' in data:
-            if not isinstance(data['workers'], list):
-                errors.append("Workers must be a list of IP addresses")
-
-            for i, worker in enumerate(data['workers']):
-                if not validate_ip_address(worker):
-                    errors.append(f"Invalid IP address for worker {i+1}: {worker}")
-
-        # SSH configuration is required for HA mode
-        if 'ssh_config' not in data:
-            errors.append("SSH configuration required for HA mode")
-        else:
-            ssh_config = data['ssh_config']
-            if 'username' not in ssh_config:
-                errors.append("SSH username is required")
+        schema['required'] = REQUIRED_FIELDS[mode] + ['ssh_config']
+        schema['properties'].update({
+            'masters': {'type': 'array', 'minItems': 3, 'items': ip_address},
+            'load_balancer': ip_address,
+            'workers': {'type': 'array', 'items': ip_address},
+            'ssh_config': {
+                'type': 'object',
+                'required': ['username'],
+                'properties': {'backend': {'enum': [backend.value for backend in SSHBackend]}},
+                'allOf': [
+                    {
+                        'if': {'properties': {'auth_method': {'const': 'password'}}, 'required': ['auth_method']},
+                        'then': {'required': ['password']}
+                    },
+                    {
+                        'if': {'properties': {'auth_method': {'const': 'key'}}, 'required': ['auth_method']},
+                        'then': {'required': ['key_path']}
+                    }
+                ]
+            }
+        })
+
+    return schema
 
-            if ssh_config.get('auth_method') == 'password' and 'password' not in ssh_config:
-                errors.append("SSH password is required for password authentication")
+# Validators are compiled once and shared by all requests
+SCHEMAS = {mode: _build_schema(mode) for mode in REQUIRED_FIELDS}
+_VALIDATORS = {
+    mode: Draft7Validator(schema, format_checker=FORMAT_CHECKER)
+    for mode, schema in SCHEMAS.items()
+}
 
-            if ssh_config.get('auth_method') == 'key' and 'key_path' not in ssh_config:
-                errors.append("SSH key path is required for key authentication")
+def _describe_error(error: JsonSchemaValidationError) -> List[str]:
+    """Translate a schema validation error into user-facing messages"""
+    path = tuple(error.absolute_path)
+
+    if error.validator == 'required':
+        return [
+            MISSING_FIELD_MESSAGES.get(path + (field,), f"Missing required field: {field}")
+            for field in error.validator_value
+            if field not in error.instance
+        ]
+
+    field = path[0] if path else None
+    value = error.instance
+
+    if field == 'k8s_version':
+        if error.validator == 'enum':
+            return [f"Unsupported Kubernetes version: {value}"]
+        return [f"Invalid Kubernetes version: {value}"]
+    if field == 'pod_cidr':
+        return [f"Invalid pod CIDR: {value}"]
+    if field == 'service_cidr':
+        return [f"Invalid service CIDR: {value}"]
+    if field == 'cni_provider':
+        return [f"Invalid CNI provider. Valid options: {', '.join(SUPPORTED_CNIS)}"]
+    if field == 'masters':
+        if len(path) > 1:
+            return [f"Invalid IP address for master {path[1] + 1}: {value}"]
+        return ["HA mode requires at least 3 master nodes"]
+    if field == 'workers':
+        if len(path) > 1:
+            return [f"Invalid IP address for worker {path[1] + 1}: {value}"]
+        return ["Workers must be a list of IP addresses"]
+    if field == 'load_balancer':
+        return [f"Invalid load balancer IP: {value}"]
+    if field == 'ssh_config':
+        return ["SSH configuration must be an object"]
+
+    return [error.message]
 
+def validate_request_data(data: Dict[str, Any], mode: str) -> tuple[bool, str]:
+    """Validate request data"""
+    validator = _VALIDATORS.get(mode)
+    if validator is None:
+        return False, f"Invalid installation mode: {mode}"
+
+    errors = []
+    for error in validator.iter_errors(data):
+        errors.extend(_describe_error(error))
+
+    # Required errors are reported once per missing field
+    errors = list(dict.fromkeys(errors))
     return len(errors) == 0, "; ".join(errors)
 
 def create_installation_config(data: Dict[str, Any], mode: str) -> InstallationConfig:
     """Create installation configuration from request data"""
-    installation_id = str(uuid.uuid4())[:8]
+    installation_id = _UUID4().hex[:8]
 
     config = InstallationConfig(
         installation_id=installation_id,
         mode=InstallationMode(mode),
-        k8s_version=data.get('k8s_version', settings.k8s.default_version),
-        pod_cidr=data.get('pod_cidr', settings.k8s.default_pod_cidr),
-        service_cidr=data.get('service_cidr', settings.k8s.default_service_cidr),
-        cni_provider=CNIProvider(data.get('cni_provider', settings.k8s.default_cni)),
+        k8s_version=data.get('k8s_version', _K8S.default_version),
+        pod_cidr=data.get('pod_cidr', _K8S.default_pod_cidr),
+        service_cidr=data.get('service_cidr', _K8S.default_service_cidr),
+        cni_provider=CNIProvider(data.get('cni_provider', _K8S.default_cni)),
         cluster_name=data.get('cluster_name', 'kubernetes'),
-        enable_rbac=data.get('enable_rbac', settings.security.enable_rbac),
-        enable_network_policies=data.get('enable_network_policies', settings.security.enable_network_policies),
-        enable_monitoring=data.get('enable_monitoring', settings.monitoring.enable_metrics)
+        enable_rbac=data.get('enable_rbac', _SEC.enable_rbac),
+        enable_network_policies=data.get('enable_network_policies', _SEC.enable_network_policies),
+        enable_monitoring=data.get('enable_monitoring', _MON.enable_metrics)
     )
 
     # Add nodes based on mode
@@ -127,121 +226,185 @@ def create_installation_config(data: Dict[str, Any], mode: str) -> InstallationC
         config.nodes = [NodeConfig(host="localhost", role="master")]
 
     elif mode == 'ha_secure':
-        # Add load balancer
-        lb_ssh_config = create_ssh_config(data.get('ssh_config', {}), data['load_balancer'])
-        config.nodes.append(NodeConfig(
-            host=data['load_balancer'],
-            role="loadbalancer",
-            ssh_config=lb_ssh_config
-        ))
-
-        # Add masters
-        for master_ip in data['masters']:
-            master_ssh_config = create_ssh_config(data.get('ssh_config', {}), master_ip)
-            config.nodes.append(NodeConfig(
-                host=master_ip,
-                role="master",
-                ssh_config=master_ssh_config
-            ))
-
-        # Add workers (optional)
-        for worker_ip in data.get('workers', []):
-            worker_ssh_config = create_ssh_config(data.get('ssh_config', {}), worker_ip)
-            config.nodes.append(NodeConfig(
-                host=worker_ip,
-                role="worker",
-                ssh_config=worker_ssh_config
-            ))
+        # SSH settings are shared by every node; only the host differs
+        ssh_fields = _ssh_config_fields(data.get('ssh_config', {}))
+        node_hosts = [('loadbalancer', [data['load_balancer']]),
+                      ('master', data['masters']),
+                      ('worker', data.get('workers', []))]
+        config.nodes = [
+            NodeConfig(host=ip, role=role, ssh_config=SSHConfig(host=ip, **ssh_fields))
+            for role, ips in node_hosts
+            for ip in ips
+        ]
 
     return config
 
-def create_ssh_config(ssh_data: Dict[str, Any], host: str) -> SSHConfig:
-    """Create SSH configuration"""
-    return SSHConfig(
-        host=host,
+def _ssh_config_fields(ssh_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve the host-independent SSH settings from request data"""
+    return dict(
         port=ssh_data.get('port', 22),
-        username=ssh_data.get('username', settings.ssh.default_user),
+        username=ssh_data.get('username', _SSH.default_user),
         password=ssh_data.get('password'),
         key_path=ssh_data.get('key_path'),
         key_passphrase=ssh_data.get('key_passphrase'),
         auth_method=SSHAuthMethod(ssh_data.get('auth_method', 'key')),
-        timeout=ssh_data.get('timeout', settings.ssh.connection_timeout),
+        backend=SSHBackend(ssh_data.get('backend', SSHBackend.PARAMIKO.value)),
+        timeout=ssh_data.get('timeout', _SSH.connection_timeout),
+        keepalive=_SSH.keep_alive_interval,
         allow_host_key_policy=ssh_data.get('allow_host_key_policy', True)
     )
 
-def run_installation(installation_id: str):
-    """Run installation in background thread"""
-    try:
-        installer = installations[installation_id]['installer']
-        success = installer.install()
-
-        installations[installation_id]['completed'] = True
-        installations[installation_id]['success'] = success
-
-        if success:
-            logger.info(f"Installation {installation_id} completed successfully")
-        else:
-            logger.error(f"Installation {installation_id} failed")
-
-    except Exception as e:
-        logger.error(f"Installation {installation_id} failed with exception: {e}")
-        installations[installation_id]['completed'] = True
-        installations[installation_id]['success'] = False
-        installations[installation_id]['error'] = str(e)
+def create_ssh_config(ssh_data: Dict[str, Any], host: str) -> SSHConfig:
+    """Create SSH configuration"""
+    return SSHConfig(host=host, **_ssh_config_fields(ssh_data))
 
-@installation_bp.route('/modes', methods=['GET'])
-def get_installation_modes():
-    """Get available installation modes"""
+def _build_modes_response() -> Dict[str, Any]:
+    """Build the installation modes response body"""
     modes = {
         'all_in_one': {
             'name': 'All-in-One',
             'description': 'Single-node Kubernetes cluster for development and testing',
             'requirements': ['Root access on local machine'],
             'features': ['Quick setup', 'Single node', 'Local development', 'Basic CNI'],
-            'estimated_time': '10-15 minutes'
+            'estimated_time': ESTIMATED_DURATIONS['all_in_one']
         },
         'ha_secure': {
             'name': 'HA Secure',
             'description': 'High-availability Kubernetes cluster with multiple masters',
             'requirements': ['Minimum 4 servers', 'SSH access to all nodes', 'Load balancer'],
             'features': ['High availability', 'Multi-master', 'Production ready', 'Advanced CNI'],
-            'estimated_time': '30-45 minutes'
+            'estimated_time': ESTIMATED_DURATIONS['ha_secure']
         }
     }
 
-    return jsonify({
+    return {
         'success': True,
         'modes': modes,
         'supported_versions': settings.k8s.supported_versions,
-        'supported_cnis': [cni.value for cni in CNIProvider],
+        'supported_cnis': SUPPORTED_CNIS,
         'default_config': {
             'k8s_version': settings.k8s.default_version,
             'pod_cidr': settings.k8s.default_pod_cidr,
             'service_cidr': settings.k8s.default_service_cidr,
             'cni_provider': settings.k8s.default_cni
         }
-    })
+    }
 
-@installation_bp.route('/<mode>/start', methods=['POST'])
-def start_installation(mode: str):
-    """Start a new installation"""
-    # Validate mode
-    if mode not in ['all_in_one', 'ha_secure']:
-        return jsonify({
+# The modes response is static for the process lifetime, so serialize it once
+_MODES_JSON = orjson.dumps(_build_modes_response())
+_MODES_ETAG = hashlib.sha1(_MODES_JSON).hexdigest()
+_MODES_HEADERS = {
+    'Cache-Control': 'public, max-age=3600',
+    'ETag': f'"{_MODES_ETAG}"'
+}
+
+def get_installation_snapshot(installation_id: str) -> Optional[Dict[str, Any]]:
+    """Get a point-in-time copy of an installation record"""
+    with _installations_lock:
+        installation = installations.get(installation_id)
+        return dict(installation) if installation is not None else None
+
+def _evict_completed(now: float):
+    """Drop completed installations past the retention limits; caller holds the lock"""
+    while _completed_ids:
+        oldest = installations.get(_completed_ids[0])
+        if (oldest is not None and len(_completed_ids) <= MAX_COMPLETED_INSTALLATIONS
+                and now - oldest['completed_at'] < COMPLETED_RETENTION_SECONDS):
+            break
+        evicted_id = _completed_ids.popleft()
+        evicted = installations.pop(evicted_id, None)
+        if evicted is not None:
+            # The installer's logger holds its in-memory log buffer and an open log file
+            log_manager.cleanup_installation_logger(evicted_id, evicted['installer'].logger.component)
+
+def _complete(installation_id: str, installation: Dict[str, Any], success: bool, error: Optional[str] = None):
+    """Mark an installation completed and queue it for eviction; caller holds the lock"""
+    now = time.time()
+    installation['completed'] = True
+    installation['completed_at'] = now
+    installation['success'] = success
+    if error:
+        installation['error'] = error
+    _completed_ids.append(installation_id)
+    _evict_completed(now)
+
+def _mark_completed(installation_id: str, success: bool, error: Optional[str] = None):
+    """Record the final state unless the installation was already completed (e.g. cancelled)"""
+    with _installations_lock:
+        installation = installations.get(installation_id)
+        if installation is None or installation['completed']:
+            return
+
+        _complete(installation_id, installation, success, error)
+
+def run_installation(installation_id: str):
+    """Run installation in background thread"""
+    try:
+        with _installations_lock:
+            installer = installations[installation_id]['installer']
+        success = installer.install()
+
+        _mark_completed(installation_id, success)
+
+        if success:
+            logger.info(f"Installation {installation_id} completed successfully")
+        else:
+            logger.error(f"Installation {installation_id} failed")
+
+    except Exception as e:
+        logger.error(f"Installation {installation_id} failed with exception: {e}")
+        _mark_completed(installation_id, False, str(e))
+
+def _accepts_gzip() -> bool:
+    """Whether the client accepts a gzip-encoded response"""
+    return request.accept_encodings.quality('gzip') > 0
+
+def _gzip_response(response: Response) -> Response:
+    """Gzip a buffered response body when it is worth compressing"""
+    body = response.get_data()
+    response.vary.add('Accept-Encoding')
+    if len(body) >= COMPRESS_MIN_SIZE:
+        response.set_data(gzip.compress(body, COMPRESS_LEVEL))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+def _gzip_stream(chunks):
+    """Gzip a stream of byte chunks incrementally"""
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+@installation_bp.route('/modes', methods=['GET'])
+def get_installation_modes():
+    """Get available installation modes"""
+    if request.if_none_match.contains(_MODES_ETAG):
+        return Response(status=304, headers=_MODES_HEADERS)
+
+    return Response(_MODES_JSON, mimetype='application/json', headers=_MODES_HEADERS)
+
+def _project(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the top-level fields an installation request uses"""
+    return {field: data[field] for field in KNOWN_FIELDS if field in data}
+
+def _start(data: Dict[str, Any], mode: str) -> Tuple[Dict[str, Any], int]:
+    """Validate, configure and launch one installation; returns (body, status)"""
+    # Validate mode; batch items may carry any JSON value here
+    if not isinstance(mode, str) or mode not in VALID_MODES:
+        return {
             'success': False,
             'error': f'Invalid installation mode: {mode}'
-        }), 400
-
-    # Get request data
-    data = request.get_json() or {}
+        }, 400
 
     # Validate request data
     valid, error_message = validate_request_data(data, mode)
     if not valid:
-        return jsonify({
+        return {
             'success': False,
             'error': f'Validation failed: {error_message}'
-        }), 400
+        }, 400
 
     try:
         # Create installation configuration
@@ -250,63 +413,114 @@ def start_installation(mode: str):
         # Validate configuration
         config_errors = config.validate()
         if config_errors:
-            return jsonify({
+            return {
                 'success': False,
                 'error': f'Configuration validation failed: {"; ".join(config_errors)}'
-            }), 400
+            }, 400
 
         # Create installer
         installer = create_installer(config)
 
-        # Store installation
-        installations[config.installation_id] = {
-            'installer': installer,
-            'config': config,
-            'started_at': time.time(),
-            'completed': False,
-            'success': False,
-            'error': None
-        }
-
-        # Start installation in background thread
-        thread = threading.Thread(
-            target=run_installation,
-            args=(config.installation_id,),
-            name=f"installation-{config.installation_id}"
-        )
-        thread.daemon = True
-        thread.start()
-
-        installation_threads[config.installation_id] = thread
+        # Store installation and start it on the worker pool
+        with _installations_lock:
+            _evict_completed(time.time())
+            installations[config.installation_id] = {
+                'installer': installer,
+                'config': config,
+                'started_at': time.time(),
+                'completed': False,
+                'success': False,
+                'error': None
+            }
+            future = EXECUTOR.submit(run_installation, config.installation_id)
+            installations[config.installation_id]['future'] = future
 
         logger.info(f"Started {mode} installation: {config.installation_id}")
 
-        return jsonify({
+        return {
             'success': True,
             'installation_id': config.installation_id,
-            'message': f'Installation started successfully',
+            'message': 'Installation started successfully',
             'mode': mode,
-            'estimated_duration': '10-15 minutes' if mode == 'all_in_one' else '30-45 minutes'
-        }), 202
+            'estimated_duration': ESTIMATED_DURATIONS[mode]
+        }, 202
 
     except Exception as e:
         logger.error(f"Failed to start installation: {e}")
-        return jsonify({
+        return {
             'success': False,
             'error': f'Failed to start installation: {str(e)}'
-        }), 500
+        }, 500
+
+@installation_bp.route('/<mode>/start', methods=['POST'])
+def start_installation(mode: str):
+    """Start a new installation"""
+    if request.content_length and request.content_length > MAX_START_BODY_BYTES:
+        return jsonify({
+            'success': False,
+            'error': f'Request body exceeds {MAX_START_BODY_BYTES} bytes'
+        }), 413
+
+    raw = request.get_data(cache=False)
+    try:
+        parsed = orjson.loads(raw) if raw else {}
+    except orjson.JSONDecodeError:
+        return jsonify({
+            'success': False,
+            'error': 'Request body must be valid JSON'
+        }), 400
+    if not isinstance(parsed, dict):
+        return jsonify({
+            'success': False,
+            'error': 'Request body must be a JSON object'
+        }), 400
+
+    body, status = _start(_project(parsed), mode)
+    return jsonify(body), status
+
+@installation_bp.route('/batch/start', methods=['POST'])
+def start_installation_batch():
+    """Start several installations from a single request"""
+    if request.content_length and request.content_length > MAX_START_BODY_BYTES:
+        return jsonify({
+            'success': False,
+            'error': f'Request body exceeds {MAX_START_BODY_BYTES} bytes'
+        }), 413
+
+    data = request.get_json() or {}
+    installs = data.get('installs') if isinstance(data, dict) else None
+    if not isinstance(installs, list) or not installs:
+        return jsonify({
+            'success': False,
+            'error': 'Field installs must be a non-empty list'
+        }), 400
+
+    results = []
+    for item in installs:
+        if not isinstance(item, dict):
+            results.append({'success': False, 'error': 'Each install must be an object'})
+            continue
+        body, _ = _start(_project(item), item.get('mode'))
+        results.append(body)
+
+    started = sum(1 for result in results if result['success'])
+    return jsonify({
+        'success': started > 0,
+        'started': started,
+        'results': results
+    }), 202 if started else 400
 
 @installation_bp.route('/<installation_id>/status', methods=['GET'])
 def get_installation_status(installation_id: str):
     """Get installation status and progress"""
-    if installation_id not in installations:
+    installation = get_installation_snapshot(installation_id)
+    if installation is None:
         return jsonify({
             'success': False,
             'error': 'Installation not found'
         }), 404
 
     try:
-        installation = installations[installation_id]
         installer = installation['installer']
 
         progress = installer.get_progress()
@@ -340,35 +554,49 @@ def get_installation_status(installation_id: str):
 @installation_bp.route('/<installation_id>/logs', methods=['GET'])
 def get_installation_logs(installation_id: str):
     """Get installation logs"""
-    if installation_id not in installations:
+    installation = get_installation_snapshot(installation_id)
+    if installation is None:
         return jsonify({
             'success': False,
             'error': 'Installation not found'
         }), 404
 
+    # Get log level filter and recent logs limit (last N entries) from query params
+    limit = request.args.get('limit', type=int)
+    if limit is not None and limit < 0:
+        return jsonify({
+            'success': False,
+            'error': 'Field limit must not be negative'
+        }), 400
+
     try:
-        installation = installations[installation_id]
         installer = installation['installer']
 
-        progress = installer.get_progress()
-        logs = progress.get('logs', [])
+        min_rank = LEVEL_RANK.get(request.args.get('level', '').upper())
+        logs = installer.get_logs(min_rank, limit)
 
-        # Get log level filter from query params
-        level_filter = request.args.get('level', '').upper()
-        if level_filter and level_filter in ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']:
-            logs = [log for log in logs if log.get('level', '').upper() >= level_filter]
+        gzip_ok = _accepts_gzip()
 
-        # Get recent logs (last N entries)
-        limit = request.args.get('limit', type=int)
-        if limit:
-            logs = logs[-limit:]
+        if request.args.get('format') == 'ndjson':
+            def generate():
+                for log in logs:
+                    yield orjson.dumps(log) + b"\n"
 
-        return jsonify({
+            if not gzip_ok:
+                return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+            response = Response(stream_with_context(_gzip_stream(generate())), mimetype='application/x-ndjson')
+            response.headers['Content-Encoding'] = 'gzip'
+            response.vary.add('Accept-Encoding')
+            return response
+
+        response = jsonify({
             'success': True,
             'installation_id': installation_id,
             'logs': logs,
             'total_logs': len(logs)
         })
+        return _gzip_response(response) if gzip_ok else response
 
     except Exception as e:
         logger.error(f"Error getting installation logs: {e}")
@@ -380,14 +608,13 @@ def get_installation_logs(installation_id: str):
 @installation_bp.route('/<installation_id>/cancel', methods=['POST'])
 def cancel_installation(installation_id: str):
     """Cancel running installation"""
-    if installation_id not in installations:
-        return jsonify({
-            'success': False,
-            'error': 'Installation not found'
-        }), 404
-
-    try:
-        installation = installations[installation_id]
+    with _installations_lock:
+        installation = installations.get(installation_id)
+        if installation is None:
+            return jsonify({
+                'success': False,
+                'error': 'Installation not found'
+            }), 404
 
         if installation['completed']:
             return jsonify({
@@ -395,14 +622,18 @@ def cancel_installation(installation_id: str):
                 'error': 'Installation already completed'
             }), 400
 
-        # Cancel the installation
-        installer = installation['installer']
-        installer.cancel()
+        # Mark as completed so the worker does not overwrite the cancelled state
+        _complete(installation_id, installation, False, 'Cancelled by user')
 
-        # Mark as completed
-        installation['completed'] = True
-        installation['success'] = False
-        installation['error'] = 'Cancelled by user'
+    try:
+        # Cancel the installation, dropping it from the queue if it has not started yet
+        future = installation.get('future')
+        installer = installation['installer']
+        if future is not None and future.cancel():
+            # install() never runs, so release the SSH hosts its constructor registered
+            installer._cleanup()
+        else:
+            installer.cancel()
 
         logger.info(f"Installation {installation_id} cancelled")
 
@@ -5,8 +5,9 @@ Centralizes all application settings with environment-specific overrides
 """
 
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, FrozenSet
 from dataclasses import dataclass
 from enum import Enum
 
@@ -66,7 +67,7 @@ class WebSocketConfig:
 class K8sConfig:
     """Kubernetes installation defaults"""
     # Supported versions
-    supported_versions: List[str] = None
+    supported_versions: Tuple[str, ...] = None
     default_version: str = "1.30"
     
     # Network configuration
@@ -74,9 +75,12 @@ class K8sConfig:
     default_service_cidr: str = "10.96.0.0/12"
     
     # CNI options
-    supported_cnis: List[str] = None
+    supported_cnis: Tuple[str, ...] = None
     default_cni: str = "cilium"
     
+    # Docker Hub pull-through mirror for images in the applied manifests
+    registry_mirror: Optional[str] = None
+    
     # Timeouts (seconds)
     api_server_timeout: int = 300
     pod_ready_timeout: int = 600
@@ -88,9 +92,23 @@ class K8sConfig:
     
     def __post_init__(self):
         if self.supported_versions is None:
-            self.supported_versions = ["1.28", "1.29", "1.30", "1.31"]
+            self.supported_versions = ("1.28", "1.29", "1.30", "1.31")
         if self.supported_cnis is None:
-            self.supported_cnis = ["cilium", "calico", "flannel"]
+            self.supported_cnis = ("cilium", "calico", "flannel")
+        self.supported_versions = tuple(self.supported_versions)
+        self.supported_cnis = tuple(self.supported_cnis)
+        self._supported_versions_set = frozenset(self.supported_versions)
+        self._supported_cnis_set = frozenset(self.supported_cnis)
+    
+    @property
+    def supported_versions_set(self) -> FrozenSet[str]:
+        """Supported versions for membership checks"""
+        return self._supported_versions_set
+    
+    @property
+    def supported_cnis_set(self) -> FrozenSet[str]:
+        """Supported CNIs for membership checks"""
+        return self._supported_cnis_set
 
 @dataclass
 class SSHConfig:
@@ -145,10 +163,16 @@ class StorageConfig:
     def __post_init__(self):
         if self.allowed_extensions is None:
             self.allowed_extensions = ['.yaml', '.yml', '.json', '.pem', '.key']
-        
-        # Ensure directories exist
-        for directory in [self.logs_directory, self.temp_directory, self.backup_directory]:
-            Path(directory).mkdir(parents=True, exist_ok=True)
+    
+    def ensure_directories(self) -> None:
+        """Create the storage directories; called by code that writes to them"""
+        _ensure_dirs(self.logs_directory, self.temp_directory, self.backup_directory)
+
+@lru_cache(maxsize=None)
+def _ensure_dirs(*directories: str) -> None:
+    """Create each directory once per process"""
+    for directory in directories:
+        Path(directory).mkdir(parents=True, exist_ok=True)
 
 class Settings:
     """Main settings class with environment-specific configurations"""
@@ -162,7 +186,7 @@ class Settings:
         self.database = self._get_database_config()
         self.redis = self._get_redis_config()
         self.websocket = self._get_websocket_config()
-        self.k8s = K8sConfig()
+        self.k8s = K8sConfig(registry_mirror=os.getenv("REGISTRY_MIRROR") or None)
         self.ssh = SSHConfig()
         self.security = self._get_security_config()
         self.monitoring = self._get_monitoring_config()
@@ -266,6 +290,11 @@ class Settings:
             "ENABLE_METRICS": str(self.monitoring.enable_metrics),
         }
     
+    @cached_property
+    def validation_errors(self) -> List[str]:
+        """Validation errors, computed on first access"""
+        return self.validate()
+    
     def validate(self) -> List[str]:
         """Validate configuration and return any errors"""
         errors = []
@@ -289,10 +318,10 @@ class Settings:
             errors.append("JWT_SECRET_KEY must be set in production environment")
         
         # Validate K8s configuration
-        if self.k8s.default_version not in self.k8s.supported_versions:
+        if self.k8s.default_version not in self.k8s.supported_versions_set:
             errors.append(f"Default K8s version {self.k8s.default_version} not in supported versions")
         
-        if self.k8s.default_cni not in self.k8s.supported_cnis:
+        if self.k8s.default_cni not in self.k8s.supported_cnis_set:
             errors.append(f"Default CNI {self.k8s.default_cni} not in supported CNIs")
         
         return errors
@@ -304,10 +333,9 @@ class Settings:
 # Global settings instance
 settings = Settings()
 
-# Validation on import
-validation_errors = settings.validate()
-if validation_errors and settings.environment == Environment.PRODUCTION:
-    raise RuntimeError(f"Configuration validation failed: {'; '.join(validation_errors)}")
+# Validation on import; other environments validate on first use
+if settings.environment == Environment.PRODUCTION and settings.validation_errors:
+    raise RuntimeError(f"Configuration validation failed: {'; '.join(settings.validation_errors)}")
 
 # Export commonly used configs
 __all__ = [
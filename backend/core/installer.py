@@ -5,27 +5,44 @@ Provides foundation for All-in-One and HA Secure installations
 """
 
 import os
-import sys
+import platform
 import time
+import random
 import uuid
 import json
+import hashlib
+import shlex
+import shutil
 import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Tuple, Any, Callable, Union
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Any, Callable
 from enum import Enum
 from pathlib import Path
-import subprocess
 
 from ..config.settings import settings
 from ..utils.helpers import (
-    run_command, validate_ip_address, validate_cidr, validate_k8s_version,
-    K8sInstallerError, ConfigurationError, InstallationError, safe_execute,
-    format_duration, ensure_directory
+    run_command, stream_command, validate_ip_address, validate_cidr, validate_k8s_version,
+    K8sInstallerError, ConfigurationError, InstallationError,
+    format_duration, ensure_directory, fast_to_dict
 )
 from ..utils.logger import get_installation_logger, InstallationLogger
 from .ssh_manager import ssh_manager, SSHConfig, SSHAuthMethod
 
+# Completed resumable steps are remembered this long for a retried installation
+STEP_CACHE_TTL = 24 * 3600
+
+# Upper bound on concurrent SSH sessions per installer; stays under sshd's
+# default MaxStartups of 10 so unauthenticated connections are not dropped
+MAX_PARALLEL_SSH = 8
+
+# Prefix of the line execute_script prints before each step
+SCRIPT_STEP_MARKER = "==> "
+
+# SSHConfig fields kept out of saved configurations and the fingerprint
+SSH_SECRET_FIELDS = ("password", "key_passphrase")
+
 class InstallationMode(Enum):
     """Installation modes supported"""
     ALL_IN_ONE = "all_in_one"
@@ -48,6 +65,7 @@ class CNIProvider(Enum):
     CALICO = "calico"
     FLANNEL = "flannel"
 
+@fast_to_dict
 @dataclass
 class NodeConfig:
     """Configuration for a Kubernetes node"""
@@ -64,6 +82,7 @@ class NodeConfig:
                 auth_method=SSHAuthMethod.KEY
             )
 
+@fast_to_dict
 @dataclass
 class InstallationConfig:
     """Configuration for K8s installation"""
@@ -106,7 +125,7 @@ class InstallationConfig:
         # Validate Kubernetes version
         if not validate_k8s_version(self.k8s_version):
             errors.append(f"Invalid Kubernetes version: {self.k8s_version}")
-        elif self.k8s_version not in settings.k8s.supported_versions:
+        elif self.k8s_version not in settings.k8s.supported_versions_set:
             errors.append(f"Unsupported Kubernetes version: {self.k8s_version}")
         
         # Validate CIDR ranges
@@ -146,16 +165,41 @@ class InstallationConfig:
         
         return errors
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return asdict(self)
-    
-    def save_to_file(self, file_path: str) -> bool:
-        """Save configuration to file"""
+    def _to_jsonable(self) -> Dict[str, Any]:
+        """Convert to a dictionary of JSON-native values, enums as their values, without SSH secrets"""
+        data = self.to_dict()
+        data['mode'] = self.mode.value
+        data['cni_provider'] = self.cni_provider.value
+        for node in data['nodes']:
+            ssh_config = node['ssh_config']
+            if ssh_config:
+                for secret in SSH_SECRET_FIELDS:
+                    ssh_config.pop(secret, None)
+                ssh_config['auth_method'] = ssh_config['auth_method'].value
+                ssh_config['backend'] = ssh_config['backend'].value
+        return data
+    
+    def fingerprint(self) -> str:
+        """Digest of the configuration, ignoring the per-run installation id"""
+        data = self._to_jsonable()
+        data.pop('installation_id', None)
+        payload = json.dumps(data, sort_keys=True).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def save_to_file(self, file_path: str, pretty: bool = False) -> bool:
+        """Save configuration to file atomically, skipping the write if unchanged"""
         try:
-            ensure_directory(Path(file_path).parent)
-            with open(file_path, 'w') as f:
-                json.dump(self.to_dict(), f, indent=2, default=str)
+            path = Path(file_path)
+            data = json.dumps(self._to_jsonable(), indent=2 if pretty else None).encode()
+            
+            # Skip rewriting identical content
+            if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+                return True
+            
+            ensure_directory(path.parent)
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
             return True
         except Exception as e:
             return False
@@ -171,6 +215,9 @@ class InstallationStep:
     retry_count: int = 0
     max_retries: int = 3
     hosts: Optional[List[str]] = None  # Hosts this step applies to
+    parallel_across_hosts: bool = False  # Call function(host) for each host concurrently
+    resumable: bool = False  # Skip when a previous run with the same config completed it
+    depends_on: Optional[List[str]] = None  # Steps that must finish first; None means all earlier steps
     
     def __post_init__(self):
         if self.hosts is None:
@@ -185,6 +232,20 @@ class StepResult:
     error_message: Optional[str] = None
     output: Optional[str] = None
     host: Optional[str] = None
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Dictionary form, built once since results are not modified after recording"""
+        if self._cached_dict is None:
+            self._cached_dict = {
+                'step_name': self.step_name,
+                'success': self.success,
+                'duration': self.duration,
+                'error_message': self.error_message,
+                'output': self.output,
+                'host': self.host
+            }
+        return self._cached_dict
 
 @dataclass
 class InstallationProgress:
@@ -223,7 +284,7 @@ class InstallationProgress:
             'start_time': self.start_time,
             'end_time': self.end_time,
             'error_message': self.error_message,
-            'step_results': [asdict(result) for result in self.step_results]
+            'step_results': [result.as_dict() for result in self.step_results]
         }
 
 class BaseInstaller(ABC):
@@ -232,6 +293,7 @@ class BaseInstaller(ABC):
     def __init__(self, config: InstallationConfig):
         self.config = config
         self.progress = InstallationProgress(installation_id=config.installation_id)
+        self._progress_snapshot = self.progress.to_dict()
         self.logger = get_installation_logger(config.installation_id, self.__class__.__name__)
         
         # Installation state
@@ -241,6 +303,7 @@ class BaseInstaller(ABC):
         
         # Kubeconfig path
         self.kubeconfig_path = Path.home() / ".kube" / f"config-{config.installation_id}"
+        self._kubeconfig_arg = f"--kubeconfig={self.kubeconfig_path}"
         
         # Setup SSH connections for remote nodes
         self._setup_ssh_connections()
@@ -249,7 +312,8 @@ class BaseInstaller(ABC):
         """Setup SSH connections for remote nodes"""
         for node in self.config.nodes:
             if node.host != "localhost" and node.ssh_config:
-                if not ssh_manager.add_host(node.host, node.ssh_config):
+                # Keep one connection per host open for the whole installation
+                if not ssh_manager.add_host(node.host, node.ssh_config, persistent=True):
                     raise ConfigurationError(f"Failed to setup SSH for host: {node.host}")
     
     @abstractmethod
@@ -261,6 +325,7 @@ class BaseInstaller(ABC):
         """Pre-installation validation"""
         self.logger.info("🔍 Running pre-installation checks...")
         self.progress.status = InstallationStatus.VALIDATING
+        self._publish_progress()
         
         try:
             # Validate configuration
@@ -309,16 +374,14 @@ class BaseInstaller(ABC):
     
     def _check_connectivity(self) -> bool:
         """Check connectivity to remote nodes"""
-        remote_nodes = [n for n in self.config.nodes if n.host != "localhost"]
+        remote_nodes = [n for n in self._unique_nodes() if n.host != "localhost"]
         if not remote_nodes:
             return True
         
         self.logger.info(f"  → Testing connectivity to {len(remote_nodes)} remote nodes...")
         
-        failed_hosts = []
-        for node in remote_nodes:
-            if not ssh_manager.test_connectivity(node.host):
-                failed_hosts.append(node.host)
+        reachable = self._map_nodes(lambda node: ssh_manager.test_connectivity(node.host), remote_nodes)
+        failed_hosts = [node.host for node, ok in zip(remote_nodes, reachable) if not ok]
         
         if failed_hosts:
             self.logger.error(f"Failed to connect to hosts: {', '.join(failed_hosts)}")
@@ -331,33 +394,45 @@ class BaseInstaller(ABC):
         """Check prerequisites on all nodes"""
         self.logger.info("  → Checking prerequisites on nodes...")
         
-        for node in self.config.nodes:
+        def check(node: NodeConfig) -> bool:
             self.logger.info(f"    → Checking {node.host}...")
-            
-            if not self._check_node_prerequisites(node):
-                return False
+            return self._check_node_prerequisites(node)
         
-        return True
+        return all(self._map_nodes(check, self._unique_nodes()))
+    
+    def _unique_nodes(self) -> List[NodeConfig]:
+        """Nodes with distinct hosts; a host serving several roles is checked once"""
+        unique: Dict[str, NodeConfig] = {}
+        for node in self.config.nodes:
+            unique.setdefault(node.host, node)
+        return list(unique.values())
+    
+    def _map_nodes(self, func: Callable[[Any], Any], nodes: List[Any]) -> List[Any]:
+        """Apply func to each node (or host) concurrently, returning results in order"""
+        if len(nodes) <= 1:
+            return [func(node) for node in nodes]
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_SSH, len(nodes))) as executor:
+            return list(executor.map(func, nodes))
     
     def _check_node_prerequisites(self, node: NodeConfig) -> bool:
         """Check prerequisites on a single node"""
         try:
             # Get system information
             if node.host == "localhost":
-                # Local checks
-                commands = [
-                    ("Check OS", "cat /etc/os-release | grep 'ID=' | head -1"),
-                    ("Check architecture", "uname -m"),
-                    ("Check memory", "free -h"),
-                ]
+                # Local checks, read directly instead of spawning shell pipelines
+                try:
+                    with open("/etc/os-release") as f:
+                        os_info = dict(line.rstrip().split("=", 1) for line in f if "=" in line)
+                    with open("/proc/meminfo") as f:
+                        mem_kb = int(next(line for line in f if line.startswith("MemTotal")).split()[1])
+                except (OSError, StopIteration, ValueError) as e:
+                    self.logger.error(f"      ❌ Reading system information failed: {e}")
+                    return False
                 
-                for description, command in commands:
-                    success, stdout, stderr = run_command(command)
-                    if not success:
-                        self.logger.error(f"      ❌ {description} failed: {stderr}")
-                        return False
-                    
-                    self.logger.debug(f"      ✅ {description}: {stdout}")
+                self.logger.debug(f"      ✅ Check OS: ID={os_info.get('ID', 'unknown')}")
+                self.logger.debug(f"      ✅ Check architecture: {platform.machine()}")
+                self.logger.debug(f"      ✅ Check memory: {mem_kb / (1024 ** 2):.1f}Gi")
             
             else:
                 # Remote checks via SSH
@@ -380,10 +455,27 @@ class BaseInstaller(ABC):
             return False
         
         step_name = f"[{self.progress.current_step + 1}/{self.progress.total_steps}] {step.name}"
-        start_time = time.time()
+        start_time = time.monotonic()
         
         self.logger.step_start(step.name, step.description)
         
+        if step.resumable and self._step_previously_completed(step):
+            self.progress.step_results.append(StepResult(
+                step_name=step.name,
+                success=True,
+                duration=0.0,
+                output="Completed by a previous run"
+            ))
+            self._publish_progress()
+            self.logger.info(f"⏭️  Skipping {step.name}: completed by a previous run")
+            return True
+        
+        if step.parallel_across_hosts and step.hosts:
+            success = self._execute_step_across_hosts(step, start_time)
+            if success and step.resumable:
+                self._mark_step_completed(step)
+            return success
+        
         for attempt in range(step.max_retries + 1):
             if self.cancelled:
                 return False
@@ -395,7 +487,7 @@ class BaseInstaller(ABC):
                 
                 # Execute the step
                 success = step.function()
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
                 
                 # Record result
                 result = StepResult(
@@ -406,9 +498,12 @@ class BaseInstaller(ABC):
                 )
                 
                 self.progress.step_results.append(result)
+                self._publish_progress()
                 
                 if success:
                     self.logger.step_success(step.name, duration)
+                    if step.resumable:
+                        self._mark_step_completed(step)
                     return True
                 else:
                     if attempt < step.max_retries:
@@ -418,7 +513,7 @@ class BaseInstaller(ABC):
                         return not step.required
                         
             except Exception as e:
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
                 error_msg = str(e)
                 
                 # Record result
@@ -430,6 +525,7 @@ class BaseInstaller(ABC):
                 )
                 
                 self.progress.step_results.append(result)
+                self._publish_progress()
                 
                 if attempt < step.max_retries:
                     self.logger.warning(f"⚠️  Exception in {step.name}: {error_msg}, retrying...")
@@ -439,9 +535,75 @@ class BaseInstaller(ABC):
         
         return False
     
+    @property
+    def _step_cache_dir(self) -> Path:
+        """Directory of completion markers for installations with this configuration"""
+        return Path(settings.storage.logs_directory) / ".step_cache" / self.config.fingerprint()
+    
+    def _step_marker(self, step: InstallationStep) -> Path:
+        """Completion marker path for a step"""
+        function_name = getattr(step.function, '__qualname__', repr(step.function))
+        key = hashlib.blake2b(f"{step.name}|{function_name}".encode(), digest_size=16).hexdigest()
+        return self._step_cache_dir / f"{key}.ok"
+    
+    def _step_previously_completed(self, step: InstallationStep) -> bool:
+        """Whether a recent run with the same configuration completed this step"""
+        try:
+            return time.time() - self._step_marker(step).stat().st_mtime < STEP_CACHE_TTL
+        except OSError:
+            return False
+    
+    def _mark_step_completed(self, step: InstallationStep):
+        """Record that a resumable step completed"""
+        try:
+            marker = self._step_marker(step)
+            ensure_directory(marker.parent)
+            marker.touch()
+        except OSError as e:
+            self.logger.debug(f"Could not record completion of {step.name}: {e}")
+    
+    def _execute_step_across_hosts(self, step: InstallationStep, start_time: float) -> bool:
+        """Run a per-host step on all its hosts concurrently, retrying only the hosts that failed"""
+        def run_on_host(host: str) -> StepResult:
+            host_start = time.monotonic()
+            try:
+                success = step.function(host)
+                error_message = None if success else "Step function returned False"
+            except Exception as e:
+                success, error_message = False, str(e)
+            return StepResult(
+                step_name=step.name,
+                success=success,
+                duration=time.monotonic() - host_start,
+                error_message=error_message,
+                host=host
+            )
+        
+        pending = list(step.hosts)
+        for attempt in range(step.max_retries + 1):
+            if self.cancelled:
+                return False
+            
+            if attempt > 0:
+                self.logger.warning(f"⚠️  Retry {attempt}/{step.max_retries} for: {step.name} on {', '.join(pending)}")
+                time.sleep(settings.k8s.retry_delay * attempt)  # Progressive delay
+            
+            results = self._map_nodes(run_on_host, pending)
+            self.progress.step_results.extend(results)
+            self._publish_progress()
+            pending = [result.host for result in results if not result.success]
+            
+            if not pending:
+                self.logger.step_success(step.name, time.monotonic() - start_time)
+                return True
+        
+        errors = "; ".join(f"{result.host}: {result.error_message}" for result in results if not result.success)
+        self.logger.step_error(step.name, errors, time.monotonic() - start_time)
+        return not step.required
+    
     def execute_command(self, command: str, host: str = "localhost", timeout: int = 300) -> Tuple[bool, str]:
         """Execute command on specified host"""
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
             if host == "localhost":
@@ -452,16 +614,87 @@ class BaseInstaller(ABC):
                 success = result.success
                 output = result.stdout if success else result.stderr
             
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             self.logger.command_executed(command, success, output, duration)
             
             return success, output
             
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             self.logger.command_executed(command, False, str(e), duration)
             return False, str(e)
     
+    def execute_script(
+        self,
+        steps: Sequence[Tuple[str, str]],
+        host: str = "localhost",
+        timeout: int = 300
+    ) -> Tuple[bool, str]:
+        """Execute (description, command) steps as one bash script on host
+        
+        Output is streamed to the debug log as it arrives and each step is
+        logged when it starts. The script stops at the first failing step;
+        on failure the returned string names that step.
+        """
+        # Step markers go to stdout, the stream on_line reads them from
+        script = "\n".join(
+            f"echo {shlex.quote(SCRIPT_STEP_MARKER + description)}\n{command}"
+            for description, command in steps
+        )
+        current_step = [steps[0][0] if steps else ""]
+        
+        def on_line(line: str):
+            if line.startswith(SCRIPT_STEP_MARKER):
+                current_step[0] = line[len(SCRIPT_STEP_MARKER):]
+                self.logger.info(f"  → {current_step[0]}")
+            else:
+                self.logger.debug(f"    {line}")
+        
+        success, output = self.execute_command_streaming(
+            f"bash -euo pipefail -c {shlex.quote(script)}", on_line, host=host, timeout=timeout
+        )
+        return (True, output) if success else (False, current_step[0])
+    
+    def execute_command_streaming(
+        self,
+        command: str,
+        on_line: Callable[[str], Optional[bool]],
+        host: str = "localhost",
+        timeout: int = 300
+    ) -> Tuple[bool, str]:
+        """Execute command on specified host, handing output to on_line line by line
+        
+        Output is not buffered; the returned string holds only the last lines.
+        Returning True from on_line stops the command early and counts as success.
+        """
+        start_time = time.monotonic()
+        
+        try:
+            if host == "localhost":
+                success, output = stream_command(command, on_line, timeout=timeout)
+            else:
+                result = ssh_manager.stream_command(host, command, on_line, timeout=timeout)
+                success = result.success
+                output = result.stdout if success else (result.stderr or result.stdout)
+            
+            duration = time.monotonic() - start_time
+            self.logger.command_executed(command, success, output, duration)
+            
+            return success, output
+            
+        except Exception as e:
+            duration = time.monotonic() - start_time
+            self.logger.command_executed(command, False, str(e), duration)
+            return False, str(e)
+    
+    def api_server_ready(self, kubectl: str = "kubectl", timeout: int = 10) -> bool:
+        """Whether the API server reports ready
+        
+        A single /readyz request; `kubectl cluster-info` makes several.
+        """
+        success, output = self.execute_command(f"{kubectl} --request-timeout=5s get --raw=/readyz", timeout=timeout)
+        return success and output.strip() == "ok"
+    
     def wait_for_condition(
         self,
         condition_func: Callable[[], bool],
@@ -469,25 +702,33 @@ class BaseInstaller(ABC):
         timeout: int = 300,
         check_interval: int = 5
     ) -> bool:
-        """Wait for a condition to be met"""
+        """Wait for a condition to be met, backing off exponentially up to check_interval"""
         self.logger.info(f"⏳ Waiting for: {description}")
         
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        start = time.monotonic()
+        deadline = start + timeout
+        attempt = 0
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
             if self.cancelled:
                 return False
             
             try:
                 if condition_func():
-                    elapsed = time.time() - start_time
-                    self.logger.info(f"✅ Condition met: {description} (after {elapsed:.1f}s)")
+                    self.logger.info(f"✅ Condition met: {description} (after {time.monotonic() - start:.1f}s)")
                     return True
             except Exception as e:
                 self.logger.debug(f"Condition check failed: {e}")
             
-            remaining = timeout - (time.time() - start_time)
+            remaining = deadline - now
             self.logger.debug(f"  → Still waiting... ({remaining:.0f}s remaining)")
-            time.sleep(check_interval)
+            
+            # Start near 100ms so fast conditions return quickly; jitter avoids lockstep polling
+            delay = min(check_interval, 0.1 * (2 ** attempt) + random.uniform(0, 0.1))
+            time.sleep(min(delay, remaining))
+            attempt += 1
         
         self.logger.error(f"❌ Timeout waiting for: {description} ({timeout}s)")
         return False
@@ -507,6 +748,7 @@ class BaseInstaller(ABC):
             self.progress.start_time = time.time()
             self.steps = self.define_installation_steps()
             self.progress.total_steps = len(self.steps)
+            self._publish_progress()
             
             # Save configuration
             config_file = Path(settings.storage.logs_directory) / f"config_{self.config.installation_id}.json"
@@ -520,24 +762,13 @@ class BaseInstaller(ABC):
             
             # Execute installation steps
             self.progress.status = InstallationStatus.INSTALLING
-            for i, step in enumerate(self.steps):
-                self.progress.current_step = i
-                
-                if self.cancelled:
-                    self.progress.status = InstallationStatus.CANCELLED
-                    return False
-                
-                if not self.execute_step(step):
-                    if step.required:
-                        self.progress.status = InstallationStatus.FAILED
-                        self.progress.error_message = f"Required step failed: {step.name}"
-                        return False
-                    else:
-                        self.logger.warning(f"⚠️  Optional step failed: {step.name}")
+            if not self._run_steps():
+                return False
             
             # Post-installation verification
             self.progress.status = InstallationStatus.VERIFYING
             self.progress.current_step = len(self.steps)
+            self._publish_progress()
             
             if not self.post_installation_verification():
                 self.progress.status = InstallationStatus.FAILED
@@ -548,6 +779,9 @@ class BaseInstaller(ABC):
             self.progress.status = InstallationStatus.SUCCESS
             self.progress.end_time = time.time()
             
+            # Completion markers only serve to resume failed runs
+            shutil.rmtree(self._step_cache_dir, ignore_errors=True)
+            
             self.logger.info(f"🎉 Installation completed successfully!")
             self.logger.info(f"⏱️  Total duration: {format_duration(self.progress.duration)}")
             self.logger.info(f"📁 Kubeconfig: {self.kubeconfig_path}")
@@ -567,8 +801,57 @@ class BaseInstaller(ABC):
             
         finally:
             self.progress.end_time = time.time()
+            self._publish_progress()
+            dropped = self.logger.dropped_messages
+            if dropped:
+                self.logger.warning(f"⚠️  {dropped} log messages were dropped because the log queue was full")
             self._cleanup()
     
+    def _run_steps(self) -> bool:
+        """Run self.steps, starting each as soon as the steps it depends on have finished
+        
+        Steps without depends_on wait for every earlier step, so a step list
+        that declares no dependencies runs strictly in order.
+        """
+        dependencies = {
+            step.name: set(step.depends_on) if step.depends_on is not None
+            else {earlier.name for earlier in self.steps[:i]}
+            for i, step in enumerate(self.steps)
+        }
+        pending = list(self.steps)
+        finished: set = set()
+        running: Dict[Future, InstallationStep] = {}
+        
+        with ThreadPoolExecutor(max_workers=max(1, len(self.steps))) as executor:
+            while pending or running:
+                if self.cancelled:
+                    self.progress.status = InstallationStatus.CANCELLED
+                    return False
+                
+                for step in [step for step in pending if dependencies[step.name] <= finished]:
+                    pending.remove(step)
+                    self.progress.current_step = len(finished)
+                    self._publish_progress()
+                    running[executor.submit(self.execute_step, step)] = step
+                
+                if not running:
+                    raise InstallationError(
+                        f"Unresolvable step dependencies: {', '.join(step.name for step in pending)}"
+                    )
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    if not future.result():
+                        if step.required:
+                            self.progress.status = InstallationStatus.FAILED
+                            self.progress.error_message = f"Required step failed: {step.name}"
+                            return False
+                        self.logger.warning(f"⚠️  Optional step failed: {step.name}")
+                    finished.add(step.name)
+        
+        return True
+    
     def post_installation_verification(self) -> bool:
         """Post-installation verification steps"""
         self.logger.info("🔍 Running post-installation verification...")
@@ -578,18 +861,20 @@ class BaseInstaller(ABC):
             if not self._verify_cluster_access():
                 return False
             
-            # Verify nodes are ready
-            if not self._verify_nodes_ready():
-                return False
+            # Verify nodes, system pods and CNI from one cluster snapshot per poll
+            self.logger.info("  → Verifying nodes, system pods and CNI...")
+            checks = [self._verify_nodes_ready, self._verify_system_pods, self._verify_cni]
             
-            # Verify system pods are running
-            if not self._verify_system_pods():
-                return False
+            def check_cluster():
+                state = self._fetch_cluster_state()
+                return state is not None and all(check(state) for check in checks)
             
-            # Verify CNI is working
-            if not self._verify_cni():
+            if not self.wait_for_condition(check_cluster, "nodes, system pods and CNI to be ready", timeout=600):
                 return False
             
+            self.logger.info("  ✅ All nodes are ready")
+            self.logger.info("  ✅ System pods are running")
+            self.logger.info(f"  ✅ {self.config.cni_provider.value} CNI is working")
             self.logger.info("✅ Post-installation verification passed")
             return True
             
@@ -601,119 +886,101 @@ class BaseInstaller(ABC):
         """Verify cluster is accessible"""
         self.logger.info("  → Verifying cluster access...")
         
-        success, output = self.execute_command(
-            f"kubectl --kubeconfig={self.kubeconfig_path} cluster-info",
-            timeout=30
-        )
-        
-        if not success:
+        if not self.api_server_ready(f"kubectl {self._kubeconfig_arg}", timeout=30):
             self.logger.error("  ❌ Cannot access cluster")
             return False
         
         self.logger.info("  ✅ Cluster is accessible")
         return True
     
-    def _verify_nodes_ready(self) -> bool:
-        """Verify all nodes are ready"""
-        self.logger.info("  → Verifying nodes are ready...")
+    def _fetch_cluster_state(self) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """Fetch all nodes and pods with a single kubectl call"""
+        success, output = self.execute_command(
+            f"kubectl {self._kubeconfig_arg} get nodes,pods -A -o json",
+            timeout=30
+        )
         
-        def check_nodes():
-            success, output = self.execute_command(
-                f"kubectl --kubeconfig={self.kubeconfig_path} get nodes --no-headers",
-                timeout=30
-            )
-            
-            if not success:
-                return False
-            
-            for line in output.strip().split('\n'):
-                if line and 'NotReady' in line:
-                    return False
-            
-            return True
+        if not success:
+            return None
         
-        if not self.wait_for_condition(check_nodes, "nodes to be ready", timeout=300):
+        items = json.loads(output).get('items', [])
+        return {
+            'nodes': [item for item in items if item.get('kind') == 'Node'],
+            'pods': [item for item in items if item.get('kind') == 'Pod']
+        }
+    
+    @staticmethod
+    def _pod_running(pod: Dict[str, Any], allow_completed: bool = False) -> bool:
+        """Whether a pod is running with no waiting containers (or has completed)"""
+        status = pod.get('status', {})
+        phase = status.get('phase')
+        if phase == 'Succeeded':
+            return allow_completed
+        if phase != 'Running':
             return False
-        
-        self.logger.info("  ✅ All nodes are ready")
-        return True
+        return not any('waiting' in container.get('state', {}) for container in status.get('containerStatuses', []))
     
-    def _verify_system_pods(self) -> bool:
+    def _verify_nodes_ready(self, state: Dict[str, List[Dict[str, Any]]]) -> bool:
+        """Verify all nodes are ready"""
+        nodes = state['nodes']
+        return bool(nodes) and all(
+            any(condition.get('type') == 'Ready' and condition.get('status') == 'True'
+                for condition in node.get('status', {}).get('conditions', []))
+            for node in nodes
+        )
+    
+    def _verify_system_pods(self, state: Dict[str, List[Dict[str, Any]]]) -> bool:
         """Verify system pods are running"""
-        self.logger.info("  → Verifying system pods...")
-        
-        def check_system_pods():
-            success, output = self.execute_command(
-                f"kubectl --kubeconfig={self.kubeconfig_path} get pods -n kube-system --no-headers",
-                timeout=30
-            )
-            
-            if not success:
-                return False
-            
-            for line in output.strip().split('\n'):
-                if line and not any(status in line for status in ['Running', 'Completed']):
-                    return False
-            
-            return True
-        
-        if not self.wait_for_condition(check_system_pods, "system pods to be running", timeout=600):
-            return False
-        
-        self.logger.info("  ✅ System pods are running")
-        return True
+        return all(
+            self._pod_running(pod, allow_completed=True)
+            for pod in state['pods']
+            if pod['metadata'].get('namespace') == 'kube-system'
+        )
     
-    def _verify_cni(self) -> bool:
+    def _verify_cni(self, state: Dict[str, List[Dict[str, Any]]]) -> bool:
         """Verify CNI is working"""
-        self.logger.info(f"  → Verifying {self.config.cni_provider.value} CNI...")
-        
         # CNI-specific verification logic would go here
         # For now, just check if CNI pods are running
         
         cni_namespace = "kube-system"
         if self.config.cni_provider == CNIProvider.CILIUM:
-            pod_selector = "k8s-app=cilium"
+            label, value = "k8s-app", "cilium"
         elif self.config.cni_provider == CNIProvider.CALICO:
-            pod_selector = "k8s-app=calico-node"
+            label, value = "k8s-app", "calico-node"
         else:
-            pod_selector = "app=flannel"
+            label, value = "app", "flannel"
         
-        def check_cni_pods():
-            success, output = self.execute_command(
-                f"kubectl --kubeconfig={self.kubeconfig_path} get pods -n {cni_namespace} -l {pod_selector} --no-headers",
-                timeout=30
-            )
-            
-            if not success:
-                return False
-            
-            lines = output.strip().split('\n')
-            if not lines or not lines[0]:
-                return False
-            
-            for line in lines:
-                if line and 'Running' not in line:
-                    return False
-            
-            return True
-        
-        if not self.wait_for_condition(check_cni_pods, f"{self.config.cni_provider.value} pods to be running", timeout=300):
-            return False
-        
-        self.logger.info(f"  ✅ {self.config.cni_provider.value} CNI is working")
-        return True
+        cni_pods = [
+            pod for pod in state['pods']
+            if pod['metadata'].get('namespace') == cni_namespace
+            and pod['metadata'].get('labels', {}).get(label) == value
+        ]
+        return bool(cni_pods) and all(self._pod_running(pod) for pod in cni_pods)
     
     def cancel(self):
         """Cancel installation"""
         with self.lock:
             self.cancelled = True
             self.progress.status = InstallationStatus.CANCELLED
+            self._publish_progress()
             self.logger.warning("❌ Installation cancellation requested")
     
+    def _publish_progress(self):
+        """Replace the progress snapshot read by get_progress"""
+        # A single attribute store, so readers never see a half-built dict
+        self._progress_snapshot = self.progress.to_dict()
+    
     def get_progress(self) -> Dict[str, Any]:
-        """Get current installation progress"""
-        with self.lock:
-            return self.progress.to_dict()
+        """Get current installation progress without blocking the installer"""
+        snapshot = self._progress_snapshot
+        if snapshot['start_time'] and not snapshot['end_time']:
+            # Keep the running duration current between publishes
+            return {**snapshot, 'duration': time.time() - snapshot['start_time']}
+        return snapshot
+    
+    def get_logs(self, min_level: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get recent installation logs at or above min_level"""
+        return self.logger.get_logs(min_level, limit)
     
     def _cleanup(self):
         """Cleanup resources"""
@@ -6,30 +6,111 @@ Handles SSH connections, command execution, and file transfers
 
 import os
 import time
+import shlex
+import shutil
+import tempfile
 import threading
+import subprocess
 import paramiko
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any, Callable
+from collections import deque, defaultdict, OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
 from enum import Enum
+import re
 import socket
+import select
+import ipaddress
 import logging
 
 from ..config.settings import settings
 from ..utils.helpers import (
-    validate_ip_address, validate_hostname, retry, 
-    K8sInstallerError, safe_execute, format_duration
+    validate_ip_address, validate_hostname, retry, stream_command,
+    K8sInstallerError, safe_execute, format_duration, fast_to_dict, LRUCache
 )
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Commands run by SSHManager.get_system_info, batched into one remote session
+SYSTEM_INFO_MARKER = "__k8s_installer_info__:"
+SYSTEM_INFO_COMMANDS: Tuple[Tuple[str, str], ...] = (
+    ('hostname', 'hostname'),
+    ('os', '(. /etc/os-release && echo "$ID")'),
+    ('kernel', 'uname -r'),
+    ('arch', 'uname -m'),
+    ('memory', 'free -h | awk \'/^Mem:/ {print $2}\''),
+    ('cpu_cores', 'nproc'),
+    ('uptime', 'uptime -p'),
+)
+
+# Each command's output follows a marker line so one session can carry them all
+_SYSTEM_INFO_SCRIPT = "; ".join(
+    f"echo '{SYSTEM_INFO_MARKER}{key}'; {command} 2>/dev/null"
+    for key, command in SYSTEM_INFO_COMMANDS
+)
+_SYSTEM_INFO_SECTION = re.compile(
+    rf"^{re.escape(SYSTEM_INFO_MARKER)}(\w+)\n(.*?)(?=^{re.escape(SYSTEM_INFO_MARKER)}|\Z)",
+    re.M | re.S
+)
+
+# Concurrent sessions opened on one connection; matches sshd's default MaxSessions
+MAX_CHANNELS_PER_CONNECTION = 10
+
+# Channel flow control for Paramiko transports. Paramiko's 2 MB window and
+# 32 KB packets leave SFTP transfers waiting on acknowledgements over
+# high-latency links
+TRANSPORT_WINDOW_SIZE = 4 * 1024 * 1024
+TRANSPORT_MAX_PACKET_SIZE = 256 * 1024
+
+# Cipher preference: AES-GCM is fastest with AES-NI, ChaCha20-Poly1305 without it.
+# Ciphers the transport doesn't implement are skipped
+DEFAULT_CIPHERS = ("aes128-gcm@openssh.com", "chacha20-poly1305@openssh.com", "aes128-ctr")
+
+# SSHConfig.compression: "auto" compresses only links to non-private addresses
+COMPRESSION_MODES = ("auto", "on", "off")
+
+# Output kept per stream by execute_command; the rest is drained and dropped
+MAX_OUTPUT_BYTES = 16 * 1024 * 1024
+OUTPUT_CHUNK_SIZE = 65536
+
+# A healthy transport probe is trusted for this many seconds
+LIVENESS_CACHE_SECONDS = 1.0
+
+# Remote paths seen to exist are remembered this long by file_exists
+STAT_CACHE_TTL = 30
+STAT_CACHE_SIZE = 1024
+
+# Commands that may remove or move files invalidate the file_exists cache
+DESTRUCTIVE_COMMAND_PATTERN = re.compile(r'\b(rm|rmdir|mv|unlink|shred)\b|\bkubeadm\s+reset\b')
+
+def _validate_key_file(key_path: str) -> Tuple[bool, Optional[str]]:
+    """Check that key_path is a readable SSH key, returning (ok, error)"""
+    try:
+        stat = os.stat(key_path)
+    except OSError:
+        return False, f"SSH key file not found: {key_path}"
+    return _check_key_file(key_path, stat.st_ino, stat.st_mtime_ns)
+
+@lru_cache(maxsize=256)
+def _check_key_file(key_path: str, inode: int, mtime_ns: int) -> Tuple[bool, Optional[str]]:
+    # Keyed by inode and mtime so a replaced or re-permissioned key is rechecked
+    if not os.access(key_path, os.R_OK):
+        return False, f"SSH key file not readable: {key_path}"
+    return True, None
+
 class SSHAuthMethod(Enum):
     """SSH authentication methods"""
     PASSWORD = "password"
     KEY = "key"
     AGENT = "agent"
 
+class SSHBackend(Enum):
+    """SSH transport implementations"""
+    PARAMIKO = "paramiko"
+    OPENSSH = "openssh"  # ssh/scp binaries sharing a ControlMaster session
+
 class ConnectionStatus(Enum):
     """SSH connection status"""
     DISCONNECTED = "disconnected"
@@ -37,7 +118,8 @@ class ConnectionStatus(Enum):
     CONNECTED = "connected"
     ERROR = "error"
 
-@dataclass
+@fast_to_dict
+@dataclass(slots=True, frozen=True)
 class SSHConfig:
     """SSH connection configuration"""
     host: str
@@ -47,15 +129,34 @@ class SSHConfig:
     key_path: Optional[str] = None
     key_passphrase: Optional[str] = None
     auth_method: SSHAuthMethod = SSHAuthMethod.KEY
+    backend: SSHBackend = SSHBackend.PARAMIKO
     
     # Connection settings
     timeout: int = 30
     keepalive: int = 60
-    compression: bool = True
+    compression: Union[str, bool] = "auto"  # One of COMPRESSION_MODES; bools mean on/off
+    preferred_ciphers: Tuple[str, ...] = DEFAULT_CIPHERS
     
     # Security settings
     allow_host_key_policy: bool = True  # For development, set False in production
     
+    @property
+    def pool_key(self) -> Tuple[str, int, str, SSHAuthMethod, SSHBackend]:
+        """Identity under which a live connection can be reused"""
+        return (self.host, self.port, self.username, self.auth_method, self.backend)
+    
+    @property
+    def use_compression(self) -> bool:
+        """Whether to negotiate transport compression for this host"""
+        mode = {True: "on", False: "off"}.get(self.compression, self.compression)
+        if mode == "auto":
+            # Compression pays off on slow WAN links but only costs CPU on a LAN
+            try:
+                return not ipaddress.ip_address(self.host).is_private
+            except ValueError:
+                return True
+        return mode == "on"
+    
     def validate(self) -> List[str]:
         """Validate SSH configuration"""
         errors = []
@@ -74,21 +175,28 @@ class SSHConfig:
         if not self.username:
             errors.append("Username is required")
         
+        # Validate compression mode
+        if not isinstance(self.compression, bool) and self.compression not in COMPRESSION_MODES:
+            errors.append(f"Invalid compression mode: {self.compression}")
+        
         # Validate authentication
         if self.auth_method == SSHAuthMethod.PASSWORD and not self.password:
             errors.append("Password required for password authentication")
         
+        if self.auth_method == SSHAuthMethod.PASSWORD and self.backend == SSHBackend.OPENSSH:
+            errors.append("Password authentication is not supported by the OpenSSH backend")
+        
         if self.auth_method == SSHAuthMethod.KEY:
             if not self.key_path:
                 errors.append("Key path required for key authentication")
-            elif not os.path.exists(self.key_path):
-                errors.append(f"SSH key file not found: {self.key_path}")
-            elif not os.access(self.key_path, os.R_OK):
-                errors.append(f"SSH key file not readable: {self.key_path}")
+            else:
+                key_ok, key_error = _validate_key_file(self.key_path)
+                if not key_ok:
+                    errors.append(key_error)
         
         return errors
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CommandResult:
     """SSH command execution result"""
     success: bool
@@ -103,16 +211,98 @@ class CommandResult:
         status = "SUCCESS" if self.success else "FAILED"
         return f"[{self.host}] {status} ({self.exit_code}): {self.command}"
 
+def _decode_output(buffer: bytearray) -> str:
+    """Decode command output without surrounding whitespace, copying it once"""
+    start, end = 0, len(buffer)
+    while start < end and buffer[start] in b" \t\r\n":
+        start += 1
+    while end > start and buffer[end - 1] in b" \t\r\n":
+        end -= 1
+    return str(memoryview(buffer)[start:end], 'utf-8', 'replace')
+
+def _drain_channel(
+    channel: paramiko.Channel,
+    buffers: Tuple[bytearray, bytearray],
+    max_output_bytes: int
+) -> Tuple[bool, bool]:
+    """Move whatever stdout/stderr data channel holds into buffers
+    
+    Output beyond max_output_bytes per stream is read and discarded.
+    
+    Returns:
+        Tuple of (anything received, output truncated)
+    """
+    received = truncated = False
+    readers = ((channel.recv_ready, channel.recv), (channel.recv_stderr_ready, channel.recv_stderr))
+    for buffer, (ready, recv) in zip(buffers, readers):
+        if ready():
+            chunk = recv(OUTPUT_CHUNK_SIZE)
+            received = True
+            room = max_output_bytes - len(buffer)
+            if len(chunk) > room:
+                truncated = True
+                chunk = chunk[:max(room, 0)]
+            buffer += chunk
+    return received, truncated
+
+def _channel_finished(channel: paramiko.Channel) -> bool:
+    """Whether the command exited and all its output has been read"""
+    return channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready()
+
+def _read_channel(
+    channel: paramiko.Channel,
+    timeout: float,
+    max_output_bytes: int = MAX_OUTPUT_BYTES
+) -> Tuple[bytearray, bytearray, bool]:
+    """Read stdout and stderr of channel as they arrive until the command exits
+    
+    Both streams are drained together so a chatty stderr cannot stall stdout.
+    
+    Returns:
+        Tuple of (stdout, stderr, truncated)
+    """
+    buffers = (bytearray(), bytearray())
+    truncated = False
+    deadline = time.monotonic() + timeout
+    
+    while True:
+        received, cut = _drain_channel(channel, buffers, max_output_bytes)
+        truncated = truncated or cut
+        if received:
+            continue
+        if _channel_finished(channel):
+            return buffers[0], buffers[1], truncated
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise socket.timeout()
+        # Data and channel close both wake the select; the cap bounds a missed exit status
+        select.select([channel], [], [], min(remaining, 1.0))
+
 class SSHConnection:
     """Individual SSH connection wrapper"""
     
-    def __init__(self, config: SSHConfig):
+    __slots__ = (
+        "config", "client", "sftp", "status", "last_activity", "lock", "channels",
+        "_stat_cache", "_stat_lock", "connect_time", "commands_executed",
+        "bytes_transferred", "last_error", "_probed_at",
+    )
+    
+    def __init__(self, config: SSHConfig, max_channels: int = MAX_CHANNELS_PER_CONNECTION):
         self.config = config
         self.client: Optional[paramiko.SSHClient] = None
         self.sftp: Optional[paramiko.SFTPClient] = None
         self.status = ConnectionStatus.DISCONNECTED
         self.last_activity = time.time()
-        self.lock = threading.Lock()
+        self.lock = threading.Lock()  # Guards connect/disconnect only
+        self._probed_at = float('-inf')  # When is_connected last saw an active transport
+        
+        # Commands from many threads share the transport, each on its own channel
+        self.channels = threading.BoundedSemaphore(max_channels)
+        
+        # remote path -> expiry of a positive file_exists result
+        self._stat_cache = LRUCache(STAT_CACHE_SIZE)
+        self._stat_lock = threading.Lock()
         
         # Connection statistics
         self.connect_time: Optional[float] = None
@@ -122,6 +312,9 @@ class SSHConnection:
     
     def connect(self) -> bool:
         """Establish SSH connection"""
+        if self.status == ConnectionStatus.CONNECTED:
+            return True
+        
         with self.lock:
             if self.status == ConnectionStatus.CONNECTED:
                 return True
@@ -145,7 +338,8 @@ class SSHConnection:
                     'port': self.config.port,
                     'username': self.config.username,
                     'timeout': self.config.timeout,
-                    'compress': self.config.compression,
+                    'compress': self.config.use_compression,
+                    'transport_factory': self._create_transport,
                 }
                 
                 if self.config.auth_method == SSHAuthMethod.PASSWORD:
@@ -159,9 +353,14 @@ class SSHConnection:
                 
                 self.client.connect(**connect_kwargs)
                 
+                # Applies to every channel opened from now on, including SFTP
+                transport = self.client.get_transport()
+                logger.debug(f"[{self.config.host}] Negotiated cipher {transport.local_cipher}")
+                transport.default_window_size = TRANSPORT_WINDOW_SIZE
+                transport.default_max_packet_size = TRANSPORT_MAX_PACKET_SIZE
+                
                 # Setup keepalive
                 if self.config.keepalive > 0:
-                    transport = self.client.get_transport()
                     transport.set_keepalive(self.config.keepalive)
                 
                 self.status = ConnectionStatus.CONNECTED
@@ -187,6 +386,15 @@ class SSHConnection:
                 
                 return False
     
+    def _create_transport(self, *args, **kwargs) -> paramiko.Transport:
+        """Create the client transport with the configured ciphers preferred"""
+        transport = paramiko.Transport(*args, **kwargs)
+        options = transport.get_security_options()
+        supported = options.ciphers
+        preferred = tuple(c for c in self.config.preferred_ciphers if c in supported)
+        options.ciphers = preferred + tuple(c for c in supported if c not in preferred)
+        return transport
+    
     def disconnect(self):
         """Close SSH connection"""
         with self.lock:
@@ -202,6 +410,7 @@ class SSHConnection:
                     self.client.close()
                     self.client = None
                 
+                self._forget_liveness()
                 self.status = ConnectionStatus.DISCONNECTED
                 logger.debug(f"Disconnected from {self.config.host}")
                 
@@ -209,24 +418,36 @@ class SSHConnection:
                 logger.warning(f"Error during disconnect from {self.config.host}: {e}")
     
     def is_connected(self) -> bool:
-        """Check if connection is active"""
+        """Check if connection is active, trusting a recent healthy probe"""
         if self.status != ConnectionStatus.CONNECTED or not self.client:
             return False
         
+        now = time.monotonic()
+        if now - self._probed_at < LIVENESS_CACHE_SECONDS:
+            return True
+        
         try:
             transport = self.client.get_transport()
-            return transport and transport.is_active()
+            active = bool(transport and transport.is_active())
         except:
-            return False
+            active = False
+        
+        self._probed_at = now if active else float('-inf')
+        return active
+    
+    def _forget_liveness(self):
+        """Make the next is_connected call probe the transport"""
+        self._probed_at = float('-inf')
     
     def execute_command(
         self, 
         command: str, 
         timeout: int = 300,
         get_pty: bool = False,
-        environment: Optional[Dict[str, str]] = None
+        environment: Optional[Dict[str, str]] = None,
+        max_output_bytes: int = MAX_OUTPUT_BYTES
     ) -> CommandResult:
-        """Execute command on remote host"""
+        """Execute command on remote host, keeping up to max_output_bytes of each stream"""
         start_time = time.time()
         
         if not self.is_connected():
@@ -244,18 +465,24 @@ class SSHConnection:
         try:
             logger.debug(f"[{self.config.host}] Executing: {command}")
             
-            # Execute command
-            stdin, stdout, stderr = self.client.exec_command(
-                command,
-                timeout=timeout,
-                get_pty=get_pty,
-                environment=environment
-            )
+            with self.channels:
+                stdin, stdout, stderr = self.client.exec_command(
+                    command,
+                    timeout=timeout,
+                    get_pty=get_pty,
+                    environment=environment
+                )
+                
+                # Read output incrementally, capped per stream
+                channel = stdout.channel
+                stdout_buffer, stderr_buffer, truncated = _read_channel(channel, timeout, max_output_bytes)
+                exit_code = channel.recv_exit_status()
+            self._invalidate_for(command)
             
-            # Read output
-            stdout_data = stdout.read().decode('utf-8', errors='replace')
-            stderr_data = stderr.read().decode('utf-8', errors='replace')
-            exit_code = stdout.channel.recv_exit_status()
+            if truncated:
+                logger.warning(f"[{self.config.host}] Output truncated to {max_output_bytes} bytes: {command}")
+            stdout_data = _decode_output(stdout_buffer)
+            stderr_data = _decode_output(stderr_buffer)
             
             # Update statistics
             self.commands_executed += 1
@@ -267,8 +494,8 @@ class SSHConnection:
             result = CommandResult(
                 success=success,
                 exit_code=exit_code,
-                stdout=stdout_data.strip(),
-                stderr=stderr_data.strip(),
+                stdout=stdout_data,
+                stderr=stderr_data,
                 duration=duration,
                 command=command,
                 host=self.config.host
@@ -279,11 +506,12 @@ class SSHConnection:
             else:
                 logger.error(f"[{self.config.host}] ❌ Command failed ({duration:.2f}s): {command}")
                 if stderr_data:
-                    logger.error(f"[{self.config.host}] Error: {stderr_data.strip()}")
+                    logger.error(f"[{self.config.host}] Error: {stderr_data}")
             
             return result
             
         except socket.timeout:
+            self._forget_liveness()
             logger.error(f"[{self.config.host}] Command timed out: {command}")
             return CommandResult(
                 success=False,
@@ -296,6 +524,7 @@ class SSHConnection:
             )
             
         except Exception as e:
+            self._forget_liveness()
             logger.error(f"[{self.config.host}] Command execution error: {e}")
             return CommandResult(
                 success=False,
@@ -307,6 +536,81 @@ class SSHConnection:
                 host=self.config.host
             )
     
+    def stream_command(
+        self,
+        command: str,
+        on_line: Callable[[str], Optional[bool]],
+        timeout: int = 300,
+        tail_lines: int = 20
+    ) -> CommandResult:
+        """Execute command, passing each output line to on_line as it arrives
+        
+        stderr is merged into stdout. If on_line returns True the channel is
+        closed and the command is treated as successful; stdout holds the
+        last tail_lines lines.
+        """
+        start_time = time.time()
+        
+        if not self.is_connected():
+            if not self.connect():
+                return CommandResult(
+                    success=False,
+                    exit_code=-1,
+                    stdout="",
+                    stderr=f"Failed to connect to {self.config.host}",
+                    duration=time.time() - start_time,
+                    command=command,
+                    host=self.config.host
+                )
+        
+        tail: deque = deque(maxlen=tail_lines)
+        try:
+            logger.debug(f"[{self.config.host}] Streaming: {command}")
+            
+            with self.channels:
+                channel = self.client.get_transport().open_session(timeout=timeout)
+                channel.settimeout(timeout)
+                channel.set_combine_stderr(True)
+                channel.exec_command(command)
+                
+                exit_code = 0
+                with channel.makefile('r') as output:
+                    for line in output:
+                        line = line.rstrip('\n')
+                        tail.append(line)
+                        if on_line(line):
+                            break
+                    else:
+                        exit_code = channel.recv_exit_status()
+                channel.close()
+            self._invalidate_for(command)
+            
+            self.commands_executed += 1
+            self.last_activity = time.time()
+            
+            return CommandResult(
+                success=exit_code == 0,
+                exit_code=exit_code,
+                stdout="\n".join(tail),
+                stderr="",
+                duration=time.time() - start_time,
+                command=command,
+                host=self.config.host
+            )
+            
+        except Exception as e:
+            self._forget_liveness()
+            logger.error(f"[{self.config.host}] Command streaming error: {e}")
+            return CommandResult(
+                success=False,
+                exit_code=-3,
+                stdout="\n".join(tail),
+                stderr=str(e),
+                duration=time.time() - start_time,
+                command=command,
+                host=self.config.host
+            )
+    
     def upload_file(self, local_path: str, remote_path: str) -> bool:
         """Upload file to remote host"""
         if not self.is_connected():
@@ -327,13 +631,15 @@ class SSHConnection:
                 except:
                     pass  # Directory might already exist
             
-            self.sftp.put(local_path, remote_path)
+            # put() writes pipelined, without waiting on each chunk's ACK, and
+            # returns the remote attributes it checked the size against
+            attributes = self.sftp.put(local_path, remote_path)
             
             # Update statistics
-            file_size = os.path.getsize(local_path)
-            self.bytes_transferred += file_size
+            self.bytes_transferred += attributes.st_size
             self.last_activity = time.time()
             
+            self._remember_path(remote_path)
             logger.debug(f"[{self.config.host}] ✅ File uploaded successfully")
             return True
             
@@ -358,10 +664,12 @@ class SSHConnection:
             if local_dir:
                 os.makedirs(local_dir, exist_ok=True)
             
-            self.sftp.get(remote_path, local_path)
+            # getfo() prefetches, keeping many reads in flight, and returns the
+            # number of bytes written
+            with open(local_path, 'wb') as local_file:
+                file_size = self.sftp.getfo(remote_path, local_file, prefetch=True)
             
             # Update statistics
-            file_size = os.path.getsize(local_path)
             self.bytes_transferred += file_size
             self.last_activity = time.time()
             
@@ -373,7 +681,40 @@ class SSHConnection:
             return False
     
     def file_exists(self, remote_path: str) -> bool:
-        """Check if file exists on remote host"""
+        """Check if file exists on remote host
+        
+        Positive results are cached for STAT_CACHE_TTL seconds. Negative ones
+        are not, since the next command may well create the file.
+        """
+        with self._stat_lock:
+            expires = self._stat_cache.get(remote_path)
+        if expires is not None and expires > time.monotonic():
+            return True
+        
+        exists = self._stat(remote_path)
+        if exists:
+            self._remember_path(remote_path)
+        return exists
+    
+    def _remember_path(self, remote_path: str):
+        with self._stat_lock:
+            self._stat_cache.set(remote_path, time.monotonic() + STAT_CACHE_TTL)
+    
+    def invalidate_path(self, remote_path: Optional[str] = None):
+        """Forget cached file_exists results for remote_path, or for every path"""
+        with self._stat_lock:
+            if remote_path is None:
+                self._stat_cache.clear()
+            else:
+                self._stat_cache.delete(remote_path)
+    
+    def _invalidate_for(self, command: str):
+        """Drop cached file_exists results if command may remove files"""
+        if DESTRUCTIVE_COMMAND_PATTERN.search(command):
+            self.invalidate_path()
+    
+    def _stat(self, remote_path: str) -> bool:
+        """Check for remote_path on the host"""
         if not self.is_connected():
             if not self.connect():
                 return False
@@ -402,81 +743,415 @@ class SSHConnection:
             'last_error': self.last_error
         }
 
+class OpenSSHConnection(SSHConnection):
+    """SSH connection backed by the OpenSSH client binaries
+    
+    connect() starts a ControlMaster that stays up for CONTROL_PERSIST; every
+    ssh/scp invocation afterwards reuses its socket, so commands skip the TCP
+    handshake, key exchange and authentication.
+    """
+    
+    CONTROL_PERSIST = "10m"
+    
+    __slots__ = ("control_path",)
+    
+    def __init__(self, config: SSHConfig, max_channels: int = MAX_CHANNELS_PER_CONNECTION):
+        super().__init__(config, max_channels)
+        self.control_path: Optional[str] = None  # Set by _control_socket on first use
+    
+    @property
+    def target(self) -> str:
+        return f"{self.config.username}@{self.config.host}"
+    
+    def _control_socket(self) -> str:
+        """ControlMaster socket path, inside a private directory created on first use
+        
+        mkdtemp makes the directory 0700 under an unpredictable name, so other
+        local users cannot pre-create or hijack the socket in the shared temp dir.
+        """
+        if self.control_path is None:
+            self.control_path = os.path.join(tempfile.mkdtemp(prefix="k8sauto-ssh-"), "master")
+        return self.control_path
+    
+    def _options(self, port_flag: str = "-p") -> List[str]:
+        """Options shared by every ssh/scp invocation for this host"""
+        options = [
+            port_flag, str(self.config.port),
+            "-o", "BatchMode=yes",
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self._control_socket()}",
+            "-o", f"ControlPersist={self.CONTROL_PERSIST}",
+            "-o", f"ConnectTimeout={self.config.timeout}",
+            "-o", f"StrictHostKeyChecking={'accept-new' if self.config.allow_host_key_policy else 'yes'}",
+        ]
+        if self.config.keepalive > 0:
+            options += ["-o", f"ServerAliveInterval={self.config.keepalive}"]
+        if self.config.use_compression:
+            options.append("-C")
+        if self.config.preferred_ciphers:
+            options += ["-c", ",".join(self.config.preferred_ciphers)]
+        if self.config.auth_method == SSHAuthMethod.KEY and self.config.key_path:
+            options += ["-i", self.config.key_path]
+        return options
+    
+    def _ssh(self, *args: str) -> List[str]:
+        return ["ssh", *self._options(), *args]
+    
+    def connect(self) -> bool:
+        """Start the ControlMaster for this host"""
+        if self.status == ConnectionStatus.CONNECTED:
+            return True
+        
+        with self.lock:
+            if self.status == ConnectionStatus.CONNECTED:
+                return True
+            
+            self.status = ConnectionStatus.CONNECTING
+            logger.debug(f"Starting SSH control master for {self.config.host}:{self.config.port}")
+            try:
+                # The backgrounded master inherits stderr, so collect it in a
+                # file rather than a pipe that would stay open until it exits
+                with tempfile.TemporaryFile(mode='w+') as errors:
+                    result = subprocess.run(
+                        self._ssh("-M", "-N", "-f", self.target),
+                        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=errors,
+                        timeout=self.config.timeout + 5
+                    )
+                    errors.seek(0)
+                    stderr = errors.read().strip()
+                if result.returncode != 0:
+                    raise K8sInstallerError(stderr or f"ssh exited with {result.returncode}")
+            except Exception as e:
+                self.status = ConnectionStatus.ERROR
+                self.last_error = str(e)
+                logger.error(f"❌ Failed to connect to {self.config.host}: {e}")
+                return False
+            
+            self.status = ConnectionStatus.CONNECTED
+            self.connect_time = time.time()
+            self.last_activity = time.time()
+            self.last_error = None
+            
+            logger.info(f"✅ Connected to {self.config.host}")
+            return True
+    
+    def disconnect(self):
+        """Stop the ControlMaster"""
+        with self.lock:
+            if self.status == ConnectionStatus.DISCONNECTED:
+                return
+            
+            try:
+                subprocess.run(
+                    self._ssh("-O", "exit", self.target),
+                    capture_output=True, timeout=10
+                )
+            except Exception as e:
+                logger.warning(f"Error during disconnect from {self.config.host}: {e}")
+            
+            if self.control_path is not None:
+                shutil.rmtree(os.path.dirname(self.control_path), ignore_errors=True)
+                self.control_path = None
+            
+            self.status = ConnectionStatus.DISCONNECTED
+            logger.debug(f"Disconnected from {self.config.host}")
+    
+    def is_connected(self) -> bool:
+        """Check if the control master socket is up"""
+        return (self.status == ConnectionStatus.CONNECTED and self.control_path is not None
+                and os.path.exists(self.control_path))
+    
+    def _failure(self, command: str, exit_code: int, stderr: str, start_time: float) -> CommandResult:
+        return CommandResult(
+            success=False,
+            exit_code=exit_code,
+            stdout="",
+            stderr=stderr,
+            duration=time.time() - start_time,
+            command=command,
+            host=self.config.host
+        )
+    
+    def execute_command(
+        self, 
+        command: str, 
+        timeout: int = 300,
+        get_pty: bool = False,
+        environment: Optional[Dict[str, str]] = None,
+        max_output_bytes: int = MAX_OUTPUT_BYTES
+    ) -> CommandResult:
+        """Execute command on remote host over the control master"""
+        start_time = time.time()
+        
+        if not self.is_connected() and not self.connect():
+            return self._failure(command, -1, f"Failed to connect to {self.config.host}", start_time)
+        
+        remote_command = command
+        if environment:
+            exports = " ".join(f"{key}={shlex.quote(value)}" for key, value in environment.items())
+            remote_command = f"export {exports}; {command}"
+        
+        args = self._ssh(*(["-tt"] if get_pty else []), self.target, remote_command)
+        try:
+            logger.debug(f"[{self.config.host}] Executing: {command}")
+            with self.channels:
+                completed = subprocess.run(args, capture_output=True, text=True, errors='replace', timeout=timeout)
+            self._invalidate_for(command)
+        except subprocess.TimeoutExpired:
+            logger.error(f"[{self.config.host}] Command timed out: {command}")
+            return self._failure(command, -2, f"Command timed out after {timeout} seconds", start_time)
+        except Exception as e:
+            logger.error(f"[{self.config.host}] Command execution error: {e}")
+            return self._failure(command, -3, str(e), start_time)
+        
+        self.commands_executed += 1
+        self.last_activity = time.time()
+        
+        if len(completed.stdout) > max_output_bytes or len(completed.stderr) > max_output_bytes:
+            logger.warning(f"[{self.config.host}] Output truncated to {max_output_bytes} bytes: {command}")
+        
+        duration = time.time() - start_time
+        result = CommandResult(
+            success=completed.returncode == 0,
+            exit_code=completed.returncode,
+            stdout=completed.stdout[:max_output_bytes].strip(),
+            stderr=completed.stderr[:max_output_bytes].strip(),
+            duration=duration,
+            command=command,
+            host=self.config.host
+        )
+        
+        if result.success:
+            logger.debug(f"[{self.config.host}] ✅ Command succeeded ({duration:.2f}s)")
+        else:
+            logger.error(f"[{self.config.host}] ❌ Command failed ({duration:.2f}s): {command}")
+            if result.stderr:
+                logger.error(f"[{self.config.host}] Error: {result.stderr}")
+        
+        return result
+    
+    def stream_command(
+        self,
+        command: str,
+        on_line: Callable[[str], Optional[bool]],
+        timeout: int = 300,
+        tail_lines: int = 20
+    ) -> CommandResult:
+        """Execute command, passing each output line to on_line as it arrives"""
+        start_time = time.time()
+        
+        if not self.is_connected() and not self.connect():
+            return self._failure(command, -1, f"Failed to connect to {self.config.host}", start_time)
+        
+        with self.channels:
+            success, tail = stream_command(
+                self._ssh(self.target, command), on_line, timeout, shell=False, tail_lines=tail_lines
+            )
+        self._invalidate_for(command)
+        
+        self.commands_executed += 1
+        self.last_activity = time.time()
+        
+        return CommandResult(
+            success=success,
+            exit_code=0 if success else 1,
+            stdout=tail,
+            stderr="",
+            duration=time.time() - start_time,
+            command=command,
+            host=self.config.host
+        )
+    
+    def _scp(self, source: str, destination: str) -> bool:
+        """Copy a file with scp over the control master"""
+        args = ["scp", "-q", *self._options(port_flag="-P"), source, destination]
+        try:
+            completed = subprocess.run(args, capture_output=True, text=True, timeout=self.config.timeout + 300)
+        except Exception as e:
+            logger.error(f"[{self.config.host}] scp failed: {e}")
+            return False
+        
+        if completed.returncode != 0:
+            logger.error(f"[{self.config.host}] scp failed: {completed.stderr.strip()}")
+            return False
+        return True
+    
+    def upload_file(self, local_path: str, remote_path: str) -> bool:
+        """Upload file to remote host"""
+        if not self.is_connected() and not self.connect():
+            return False
+        
+        logger.debug(f"[{self.config.host}] Uploading {local_path} -> {remote_path}")
+        
+        # Ensure remote directory exists
+        remote_dir = os.path.dirname(remote_path)
+        if remote_dir:
+            self.execute_command(f"mkdir -p {shlex.quote(remote_dir)}", timeout=30)
+        
+        if not self._scp(local_path, f"{self.target}:{remote_path}"):
+            return False
+        
+        self.bytes_transferred += os.path.getsize(local_path)
+        self.last_activity = time.time()
+        
+        self._remember_path(remote_path)
+        logger.debug(f"[{self.config.host}] ✅ File uploaded successfully")
+        return True
+    
+    def download_file(self, remote_path: str, local_path: str) -> bool:
+        """Download file from remote host"""
+        if not self.is_connected() and not self.connect():
+            return False
+        
+        logger.debug(f"[{self.config.host}] Downloading {remote_path} -> {local_path}")
+        
+        # Ensure local directory exists
+        local_dir = os.path.dirname(local_path)
+        if local_dir:
+            os.makedirs(local_dir, exist_ok=True)
+        
+        if not self._scp(f"{self.target}:{remote_path}", local_path):
+            return False
+        
+        self.bytes_transferred += os.path.getsize(local_path)
+        self.last_activity = time.time()
+        
+        logger.debug(f"[{self.config.host}] ✅ File downloaded successfully")
+        return True
+    
+    def _stat(self, remote_path: str) -> bool:
+        """Check for remote_path on the host"""
+        return self.execute_command(f"test -e {shlex.quote(remote_path)}", timeout=30).success
+
+def create_connection(config: SSHConfig) -> SSHConnection:
+    """Create a connection for config, falling back to Paramiko when OpenSSH is unavailable"""
+    if config.backend == SSHBackend.OPENSSH:
+        if os.name != 'nt' and shutil.which("ssh"):
+            return OpenSSHConnection(config)
+        logger.warning(f"OpenSSH client not available, using Paramiko for {config.host}")
+    return SSHConnection(config)
+
 class SSHManager:
     """SSH connection manager with pooling and retry logic"""
     
     def __init__(self):
-        self.connections: Dict[str, SSHConnection] = {}
+        self.connections: "OrderedDict[str, SSHConnection]" = OrderedDict()  # Least recently used first
         self.connection_configs: Dict[str, SSHConfig] = {}
-        self.lock = threading.Lock()
+        self.persistent_hosts: set = set()  # Hosts whose idle connections are kept open
+        # Guards the dicts above only; never held across network I/O
+        self._meta_lock = threading.Lock()
+        
+        # Serializes handshakes per host; different hosts connect concurrently
+        self._host_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
         
         # Connection limits
         self.max_connections = settings.ssh.max_connections
-        self.cleanup_interval = 300  # 5 minutes
-        
-        # Start cleanup thread
-        self.cleanup_thread = threading.Thread(target=self._cleanup_worker, daemon=True)
-        self.cleanup_thread.start()
+        self.cleanup_interval = 300  # Idle connections older than twice this are stale
+        self._last_cleanup = time.monotonic()
     
-    def add_host(self, host: str, config: SSHConfig) -> bool:
-        """Add host configuration"""
+    def add_host(self, host: str, config: SSHConfig, persistent: bool = False) -> bool:
+        """Add host configuration; persistent connections are not closed when idle"""
         errors = config.validate()
         if errors:
             logger.error(f"Invalid SSH config for {host}: {'; '.join(errors)}")
             return False
         
-        with self.lock:
+        replaced = None
+        with self._meta_lock:
+            # Keep a live connection only if it was opened with the same identity
+            previous = self.connection_configs.get(host)
+            if previous is not None and previous.pool_key != config.pool_key:
+                replaced = self.connections.pop(host, None)
+            
             self.connection_configs[host] = config
-            logger.info(f"Added SSH config for {host}")
-            return True
+            if persistent:
+                self.persistent_hosts.add(host)
+        
+        if replaced is not None:
+            replaced.disconnect()
+        logger.info(f"Added SSH config for {host}")
+        return True
     
     def remove_host(self, host: str):
         """Remove host and close connection"""
-        with self.lock:
-            if host in self.connections:
-                self.connections[host].disconnect()
-                del self.connections[host]
-            
-            if host in self.connection_configs:
-                del self.connection_configs[host]
-            
-            logger.info(f"Removed SSH config for {host}")
+        with self._meta_lock:
+            connection = self.connections.pop(host, None)
+            self.connection_configs.pop(host, None)
+            self.persistent_hosts.discard(host)
+            self._host_locks.pop(host, None)
+        
+        if connection is not None:
+            connection.disconnect()
+        logger.info(f"Removed SSH config for {host}")
     
     def get_connection(self, host: str) -> Optional[SSHConnection]:
         """Get or create SSH connection for host"""
-        with self.lock:
-            if host not in self.connection_configs:
+        with self._meta_lock:
+            config = self.connection_configs.get(host)
+            if config is None:
                 logger.error(f"No SSH config found for host: {host}")
                 return None
             
-            # Check existing connection
-            if host in self.connections:
-                connection = self.connections[host]
-                if connection.is_connected():
-                    return connection
-                else:
-                    # Remove stale connection
-                    connection.disconnect()
-                    del self.connections[host]
+            connection = self.connections.get(host)
+            if connection is not None:
+                self.connections.move_to_end(host)
+            host_lock = self._host_locks[host]
+            
+            # Reap stale connections at most once per interval; there is no cleanup thread
+            now = time.monotonic()
+            sweep = now - self._last_cleanup >= self.cleanup_interval
+            if sweep:
+                self._last_cleanup = now
+        
+        if sweep:
+            self._cleanup_stale_connections()
+        
+        if connection is not None and connection.is_connected():
+            return connection
+        
+        # Handshake under the host lock only so other hosts can connect concurrently
+        with host_lock:
+            # Another thread may have connected to the same host meanwhile
+            with self._meta_lock:
+                existing = self.connections.get(host)
+            if existing is not None:
+                if existing.is_connected():
+                    return existing
+                self._discard_connection(host, existing)
             
             # Check connection limit
             if len(self.connections) >= self.max_connections:
                 logger.warning("Maximum SSH connections reached")
                 self._cleanup_stale_connections()
                 
-                if len(self.connections) >= self.max_connections:
+                if len(self.connections) >= self.max_connections and not self._evict_least_recent():
                     logger.error("Cannot create new connection: limit reached")
                     return None
             
-            # Create new connection
-            config = self.connection_configs[host]
-            connection = SSHConnection(config)
+            connection = create_connection(config)
+            if not connection.connect():
+                return None
             
-            if connection.connect():
+            with self._meta_lock:
                 self.connections[host] = connection
-                return connection
-            else:
-                return None
+                self.connections.move_to_end(host)
+            return connection
+    
+    def prewarm(self, hosts: List[str], max_workers: int = 32) -> Dict[str, bool]:
+        """Open connections to all hosts concurrently, returning which succeeded
+        
+        Prefer this over calling test_connectivity host by host before bulk
+        operations: handshakes overlap, so the cost is that of the slowest host.
+        """
+        unique_hosts = list(dict.fromkeys(hosts))
+        if not unique_hosts:
+            return {}
+        
+        import concurrent.futures
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(unique_hosts))) as executor:
+            connections = executor.map(self.get_connection, unique_hosts)
+            return {host: connection is not None for host, connection in zip(unique_hosts, connections)}
     
     @retry(max_attempts=3, delay=2.0)
     def execute_command(
@@ -502,6 +1177,28 @@ class SSHManager:
         
         return connection.execute_command(command, timeout, get_pty, environment)
     
+    def stream_command(
+        self,
+        host: str,
+        command: str,
+        on_line: Callable[[str], Optional[bool]],
+        timeout: int = 300
+    ) -> CommandResult:
+        """Execute command on remote host, streaming output lines to on_line"""
+        connection = self.get_connection(host)
+        if not connection:
+            return CommandResult(
+                success=False,
+                exit_code=-1,
+                stdout="",
+                stderr=f"Failed to establish connection to {host}",
+                duration=0,
+                command=command,
+                host=host
+            )
+        
+        return connection.stream_command(command, on_line, timeout)
+    
     def execute_parallel(
         self,
         hosts: List[str],
@@ -514,6 +1211,9 @@ class SSHManager:
         
         results = {}
         
+        # Open every connection first so commands don't queue behind handshakes
+        self.prewarm(hosts)
+        
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit tasks
             future_to_host = {
@@ -564,6 +1264,12 @@ class SSHManager:
         
         return connection.file_exists(remote_path)
     
+    def invalidate_path(self, host: str, remote_path: Optional[str] = None):
+        """Forget cached file_exists results on host for remote_path, or all paths"""
+        connection = self.connections.get(host)
+        if connection:
+            connection.invalidate_path(remote_path)
+    
     def test_connectivity(self, host: str, timeout: int = 10) -> bool:
         """Test SSH connectivity to host"""
         try:
@@ -574,81 +1280,79 @@ class SSHManager:
             return False
     
     def get_system_info(self, host: str) -> Dict[str, str]:
-        """Get system information from remote host"""
-        commands = {
-            'hostname': 'hostname',
-            'os': 'cat /etc/os-release | grep "^ID=" | cut -d= -f2 | tr -d \'"\'',
-            'kernel': 'uname -r',
-            'arch': 'uname -m',
-            'memory': 'free -h | grep "^Mem:" | awk \'{print $2}\'',
-            'cpu_cores': 'nproc',
-            'uptime': 'uptime -p',
-        }
+        """Get system information from remote host in a single round trip"""
+        info = {key: "unknown" for key, _ in SYSTEM_INFO_COMMANDS}
+        result = self.execute_command(host, _SYSTEM_INFO_SCRIPT, timeout=10)
         
-        info = {}
-        for key, command in commands.items():
-            result = self.execute_command(host, command, timeout=10)
-            if result.success:
-                info[key] = result.stdout
-            else:
-                info[key] = "unknown"
+        for key, value in _SYSTEM_INFO_SECTION.findall(result.stdout):
+            value = value.strip()
+            if key in info and value:
+                info[key] = value
         
         return info
     
+    def _discard_connection(self, host: str, connection: SSHConnection):
+        """Drop connection from the pool if it is still the one held for host, then close it"""
+        with self._meta_lock:
+            if self.connections.get(host) is not connection:
+                return
+            del self.connections[host]
+        connection.disconnect()
+    
     def _cleanup_stale_connections(self):
         """Clean up stale connections"""
-        stale_hosts = []
-        current_time = time.time()
+        with self._meta_lock:
+            candidates = list(self.connections.items())
         
-        for host, connection in self.connections.items():
-            # Check if connection is stale
+        # Liveness probes may touch the network, so run them outside the lock
+        current_time = time.time()
+        for host, connection in candidates:
             time_since_activity = current_time - connection.last_activity
             if (not connection.is_connected() or 
-                time_since_activity > self.cleanup_interval * 2):
-                stale_hosts.append(host)
-        
-        for host in stale_hosts:
-            logger.debug(f"Cleaning up stale connection to {host}")
-            self.connections[host].disconnect()
-            del self.connections[host]
+                (host not in self.persistent_hosts and
+                 time_since_activity > self.cleanup_interval * 2)):
+                logger.debug(f"Cleaning up stale connection to {host}")
+                self._discard_connection(host, connection)
     
-    def _cleanup_worker(self):
-        """Background worker for connection cleanup"""
-        while True:
-            try:
-                time.sleep(self.cleanup_interval)
-                with self.lock:
-                    self._cleanup_stale_connections()
-            except Exception as e:
-                logger.error(f"Error in cleanup worker: {e}")
+    def _evict_least_recent(self) -> bool:
+        """Close the least recently used non-persistent connection"""
+        with self._meta_lock:
+            victim = next((host for host in self.connections if host not in self.persistent_hosts), None)
+            if victim is None:
+                return False
+            connection = self.connections.pop(victim)
+        
+        logger.debug(f"Evicting least recently used connection to {victim}")
+        connection.disconnect()
+        return True
     
     def get_stats(self) -> Dict[str, Any]:
         """Get SSH manager statistics"""
-        with self.lock:
-            connection_stats = [
-                conn.get_stats() for conn in self.connections.values()
-            ]
-            
-            return {
-                'total_connections': len(self.connections),
-                'max_connections': self.max_connections,
-                'configured_hosts': len(self.connection_configs),
-                'connections': connection_stats
-            }
+        with self._meta_lock:
+            connections = list(self.connections.values())
+            configured_hosts = len(self.connection_configs)
+        
+        return {
+            'total_connections': len(connections),
+            'max_connections': self.max_connections,
+            'configured_hosts': configured_hosts,
+            'connections': [conn.get_stats() for conn in connections]
+        }
     
     def close_all(self):
         """Close all SSH connections"""
-        with self.lock:
-            for connection in self.connections.values():
-                connection.disconnect()
-            
+        with self._meta_lock:
+            connections = list(self.connections.values())
             self.connections.clear()
-            logger.info("All SSH connections closed")
+        
+        for connection in connections:
+            connection.disconnect()
+        logger.info("All SSH connections closed")
 
 # Global SSH manager instance
 ssh_manager = SSHManager()
 
 __all__ = [
-    'SSHAuthMethod', 'ConnectionStatus', 'SSHConfig', 'CommandResult',
-    'SSHConnection', 'SSHManager', 'ssh_manager'
+    'SSHAuthMethod', 'SSHBackend', 'ConnectionStatus', 'SSHConfig', 'CommandResult',
+    'SSHConnection', 'OpenSSHConnection', 'create_connection', 'SSHManager', 'ssh_manager'
 ]
\ No newline at end of file
@@ -5,11 +5,37 @@ Entry point for the web API server
 """
 
 import os
+import re
 import sys
+import time
 import logging
+from datetime import timedelta
+from functools import lru_cache
 from pathlib import Path
-from flask import Flask, jsonify, render_template, send_from_directory
-from flask_cors import CORS
+from typing import Any, Tuple
+import orjson
+from flask import Flask, Response, jsonify, render_template, request
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    from flask_compress import Compress
+except ImportError:  # Optional: responses are sent uncompressed
+    Compress = None
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:  # Optional: without it only the WSGI entry point is available
+    WsgiToAsgi = None
+
+try:
+    import uvicorn
+except ImportError:  # Optional: the launcher falls back to Gunicorn or Flask's server
+    uvicorn = None
+
+try:
+    from backend.wsgi_runner import StandaloneApplication, gunicorn_options
+except ImportError:  # Optional: Gunicorn is not installed
+    StandaloneApplication = None
 
 from backend.config.settings import settings
 from backend.api.routes.installation import installation_bp
@@ -18,6 +44,60 @@ from backend.utils.helpers import ensure_directory
 
 logger = get_logger(__name__)
 
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson for request parsing and responses"""
+
+    # Keep Flask's handling of dates, UUIDs, dataclasses, etc.
+    default = staticmethod(DefaultJSONProvider.default)
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as JSON to a string"""
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Deserialize data from a JSON string or bytes"""
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize arguments straight to compact response bytes, even in debug mode"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype='application/json'
+        )
+
+# Cache lifetime for static assets
+STATIC_MAX_AGE = timedelta(days=1)
+
+# Assets whose names carry a content hash, e.g. app.3f9a1c2b.js
+HASHED_ASSET = re.compile(r'\.[0-9a-f]{8,}\.\w+$')
+
+def mark_immutable_assets(response: Response) -> Response:
+    """Let clients keep content-hashed static files for a year without revalidating"""
+    if request.endpoint == 'static' and HASHED_ASSET.search(request.path):
+        response.cache_control.public = True
+        response.cache_control.max_age = 365 * 24 * 3600
+        response.cache_control.immutable = True
+    return response
+
+# Browser origins allowed to call the API (the frontend dev server)
+CORS_ORIGINS = frozenset(('http://localhost:3000', 'http://127.0.0.1:3000'))
+CORS_ALLOW_METHODS = 'DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT'
+
+def add_cors_headers(response: Response) -> Response:
+    """Allow the known frontend origins; Flask answers OPTIONS preflights itself"""
+    response.vary.add('Origin')
+    origin = request.headers.get('Origin')
+    if origin in CORS_ORIGINS:
+        response.headers['Access-Control-Allow-Origin'] = origin
+        if request.method == 'OPTIONS':
+            response.headers['Access-Control-Allow-Methods'] = CORS_ALLOW_METHODS
+            requested_headers = request.headers.get('Access-Control-Request-Headers')
+            if requested_headers:
+                response.headers['Access-Control-Allow-Headers'] = requested_headers
+    return response
+
 def create_app(config_name: str = None) -> Flask:
     """Create and configure Flask application"""
     
@@ -25,7 +105,8 @@ def create_app(config_name: str = None) -> Flask:
     app = Flask(
         __name__,
         template_folder='../frontend/templates',
-        static_folder='../frontend/public'
+        static_folder='../frontend/public',
+        static_url_path='/static'  # Flask's own static route; templates link to /static/...
     )
     
     # Configuration
@@ -34,12 +115,26 @@ def create_app(config_name: str = None) -> Flask:
     app.config['TESTING'] = settings.flask.testing
     app.config['MAX_CONTENT_LENGTH'] = settings.flask.max_content_length
     
-    # Additional Flask config
-    app.config['JSON_SORT_KEYS'] = False
-    app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+    # Let browsers cache static assets; content-hashed ones never change
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = STATIC_MAX_AGE
+    app.after_request(mark_immutable_assets)
+    app.before_request(validate_on_first_request)
+    
+    # Use orjson for request parsing and jsonify responses; output is compact and
+    # unsorted, so Flask's JSON_* settings don't apply
+    app.json = OrjsonProvider(app)
     
-    # Enable CORS for API endpoints
-    CORS(app, origins=['http://localhost:3000', 'http://127.0.0.1:3000'])
+    # Compress HTML and JSON responses; the logs endpoint already gzips its own
+    # and flask-compress leaves responses with a Content-Encoding alone. Streamed
+    # responses are skipped, since compressing them buffers the whole body
+    if Compress is not None:
+        app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+        app.config['COMPRESS_MIN_SIZE'] = 512
+        app.config['COMPRESS_STREAMS'] = False
+        Compress(app)
+    
+    # Enable CORS for the frontend dev server
+    app.after_request(add_cors_headers)
     
     # Register blueprints
     register_blueprints(app)
@@ -57,8 +152,56 @@ def create_app(config_name: str = None) -> Flask:
     initialize_extensions(app)
     
     logger.info(f"Flask app created in {settings.environment.value} mode")
+    
+    # Servers import the module-level app (uvicorn backend.main:asgi_app), so a
+    # broken production configuration has to stop the process here
+    if settings.environment.value == 'production':
+        exit_on_startup_errors()
+    
     return app
 
+@lru_cache(maxsize=1)
+def validate_startup() -> Tuple[str, ...]:
+    """Check the runtime environment once per process, returning any errors
+
+    Runs lazily on the first request (or from the launcher) rather than at
+    import, so importing the module stays cheap for workers and tests.
+    """
+    validation_errors = []
+    
+    # Check if running as root for localhost installations
+    if settings.environment.value != 'testing':
+        # Only warn about root access in non-testing environments
+        if os.geteuid() != 0:
+            logger.warning(
+                "Not running as root - localhost installations will fail. "
+                "Run with sudo for All-in-One installations."
+            )
+    
+    # Check required directories; ensure_directory logs the underlying error
+    for directory in [settings.storage.logs_directory, settings.storage.temp_directory]:
+        if not os.path.exists(directory) and not ensure_directory(directory):
+            validation_errors.append(f"Cannot create directory {directory}")
+    
+    # Log validation results
+    if validation_errors:
+        for error in validation_errors:
+            logger.error(f"Validation error: {error}")
+    else:
+        logger.info("Application validation passed")
+    
+    return tuple(validation_errors)
+
+def validate_on_first_request():
+    """before_request hook; validate_startup only does work the first time"""
+    validate_startup()
+
+def exit_on_startup_errors():
+    """Validate before serving and refuse to start a broken production server"""
+    if validate_startup() and settings.environment.value == 'production':
+        logger.error("Validation errors in production environment - exiting")
+        sys.exit(1)
+
 def register_blueprints(app: Flask):
     """Register Flask blueprints"""
     
@@ -69,82 +212,59 @@ def register_blueprints(app: Flask):
     from flask import Blueprint
     health_bp = Blueprint('health', __name__, url_prefix='/api')
     
+    # Only the timestamp and logger count change between probes
+    health_status = {
+        'status': 'healthy',
+        'version': '1.0.0',
+        'environment': settings.environment.value,
+    }
+    
     @health_bp.route('/health', methods=['GET'])
     def health_check():
         return jsonify({
-            'status': 'healthy',
-            'version': '1.0.0',
-            'environment': settings.environment.value,
-            'timestamp': log_manager.installation_loggers  # Just to test log_manager is working
+            **health_status,
+            'timestamp': int(time.time()),
+            'active_loggers': len(log_manager.installation_loggers)
         })
     
     app.register_blueprint(health_bp)
 
+# Error responses are static, so their bodies are serialized once
+ERROR_RESPONSES = {
+    400: ('Bad Request', 'The request was invalid or cannot be served'),
+    401: ('Unauthorized', 'Authentication is required'),
+    403: ('Forbidden', 'You do not have permission to access this resource'),
+    404: ('Not Found', 'The requested resource was not found'),
+    405: ('Method Not Allowed', 'The method is not allowed for this endpoint'),
+    429: ('Rate Limit Exceeded', 'Too many requests, please try again later'),
+    500: ('Internal Server Error', 'An unexpected error occurred'),
+}
+ERROR_BODIES = {
+    status_code: orjson.dumps({'error': error, 'message': message, 'status_code': status_code})
+    for status_code, (error, message) in ERROR_RESPONSES.items()
+}
+
+def error_response(status_code: int) -> Response:
+    """Response carrying the prebuilt JSON body for status_code"""
+    return Response(ERROR_BODIES[status_code], status=status_code, mimetype='application/json')
+
 def register_error_handlers(app: Flask):
     """Register error handlers"""
     
-    @app.errorhandler(400)
-    def bad_request(error):
-        return jsonify({
-            'error': 'Bad Request',
-            'message': 'The request was invalid or cannot be served',
-            'status_code': 400
-        }), 400
+    def http_error(error):
+        if error.code >= 500:
+            logger.error(f"Internal server error: {error}")
+        return error_response(error.code)
     
-    @app.errorhandler(401)
-    def unauthorized(error):
-        return jsonify({
-            'error': 'Unauthorized',
-            'message': 'Authentication is required',
-            'status_code': 401
-        }), 401
-    
-    @app.errorhandler(403)
-    def forbidden(error):
-        return jsonify({
-            'error': 'Forbidden',
-            'message': 'You do not have permission to access this resource',
-            'status_code': 403
-        }), 403
-    
-    @app.errorhandler(404)
-    def not_found(error):
-        return jsonify({
-            'error': 'Not Found',
-            'message': 'The requested resource was not found',
-            'status_code': 404
-        }), 404
-    
-    @app.errorhandler(405)
-    def method_not_allowed(error):
-        return jsonify({
-            'error': 'Method Not Allowed',
-            'message': 'The method is not allowed for this endpoint',
-            'status_code': 405
-        }), 405
-    
-    @app.errorhandler(429)
-    def rate_limit_exceeded(error):
-        return jsonify({
-            'error': 'Rate Limit Exceeded',
-            'message': 'Too many requests, please try again later',
-            'status_code': 429
-        }), 429
-    
-    @app.errorhandler(500)
-    def internal_error(error):
-        logger.error(f"Internal server error: {error}")
-        return jsonify({
-            'error': 'Internal Server Error',
-            'message': 'An unexpected error occurred',
-            'status_code': 500
-        }), 500
+    for status_code in ERROR_RESPONSES:
+        app.register_error_handler(status_code, http_error)
     
     @app.errorhandler(Exception)
     def handle_exception(error):
         logger.error(f"Unhandled exception: {error}")
         
-        if settings.flask.debug:
+        # app.debug rather than settings so the launcher's --debug override applies
+        if app.debug:
             # In debug mode, return the actual error
             return jsonify({
                 'error': 'Internal Server Error',
@@ -154,11 +274,7 @@ def register_error_handlers(app: Flask):
             }), 500
         else:
             # In production, return generic error
-            return jsonify({
-                'error': 'Internal Server Error',
-                'message': 'An unexpected error occurred',
-                'status_code': 500
-            }), 500
+            return error_response(500)
 
 def register_cli_commands(app: Flask):
     """Register CLI commands"""
@@ -183,18 +299,20 @@ def register_cli_commands(app: Flask):
                 return
             
             # Find old log files (older than retention period)
-            import time
             cutoff_time = time.time() - (settings.monitoring.log_retention_days * 24 * 3600)
             
             cleaned_count = 0
-            for log_file in logs_dir.glob('*.log*'):
-                if log_file.stat().st_mtime < cutoff_time:
-                    try:
-                        log_file.unlink()
-                        cleaned_count += 1
-                        print(f"Removed old log file: {log_file.name}")
-                    except Exception as e:
-                        print(f"Failed to remove {log_file.name}: {e}")
+            with os.scandir(logs_dir) as entries:
+                for entry in entries:
+                    if '.log' not in entry.name or not entry.is_file(follow_symlinks=False):
+                        continue
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff_time:
+                        try:
+                            os.unlink(entry.path)
+                            cleaned_count += 1
+                            print(f"Removed old log file: {entry.name}")
+                        except Exception as e:
+                            print(f"Failed to remove {entry.name}: {e}")
             
             print(f"Cleanup completed. Removed {cleaned_count} old log files.")
             
@@ -253,12 +371,6 @@ def register_frontend_routes(app: Flask):
     def documentation():
         """Documentation page"""
         return render_template('docs.html')
-    
-    # Serve static files
-    @app.route('/static/<path:filename>')
-    def static_files(filename):
-        """Serve static files"""
-        return send_from_directory(app.static_folder, filename)
 
 # Create the Flask application
 app = create_app()
@@ -269,6 +381,40 @@ if template_dir.exists():
     register_frontend_routes(app)
     logger.info("Frontend routes registered")
 
+# ASGI entry point: uvicorn backend.main:asgi_app
+asgi_app = WsgiToAsgi(app) if WsgiToAsgi is not None else None
+
+# WSGI entry point for production deployment
+def application(environ, start_response):
+    """WSGI application entry point"""
+    return app(environ, start_response)
+
+# Gunicorn hooks (if using Gunicorn)
+def on_starting(server):
+    """Called just before the master process is initialized."""
+    logger.info("Gunicorn server starting...")
+    exit_on_startup_errors()
+
+def on_reload(server):
+    """Called to recycle workers during a reload via SIGHUP."""
+    logger.info("Gunicorn server reloading...")
+
+def worker_int(worker):
+    """Called just after a worker has been killed by SIGINT or SIGQUIT."""
+    logger.info(f"Worker {worker.pid} interrupted")
+
+def worker_abort(worker):
+    """Called when a worker receives the SIGABRT signal."""
+    logger.error(f"Worker {worker.pid} aborted")
+
+def on_exit(server):
+    """Called just before exiting."""
+    logger.info("Gunicorn server exiting...")
+    log_manager.shutdown()
+
+# Export for external use
+__all__ = ['app', 'asgi_app', 'create_app']
+
 # Development server configuration
 if __name__ == '__main__':
     import argparse
@@ -297,25 +443,70 @@ if __name__ == '__main__':
         default=False,
         help='Enable auto-reload on code changes'
     )
+    parser.add_argument(
+        '--server',
+        choices=['auto', 'uvicorn', 'gunicorn', 'flask'],
+        default='auto',
+        help='Server to run (default: uvicorn, then gunicorn, then Flask; Flask in debug mode)'
+    )
     
     args = parser.parse_args()
     
+    available_servers = {
+        'uvicorn': asgi_app is not None and uvicorn is not None,
+        'gunicorn': StandaloneApplication is not None,
+        'flask': True,
+    }
+    if args.server != 'auto' and not available_servers[args.server]:
+        parser.error(f"{args.server} is not installed")
+    
     # Override settings with command line arguments
     if args.debug:
         app.config['DEBUG'] = True
         settings.flask.debug = True
     
-    logger.info(f"Starting development server on {args.host}:{args.port}")
+    server = args.server
+    if server == 'auto':
+        # The debugger needs Flask's own server
+        server = 'flask' if app.config['DEBUG'] else next(name for name, ok in available_servers.items() if ok)
+    
+    if server != 'gunicorn':
+        exit_on_startup_errors()
+    
+    logger.info(f"Starting {server} server on {args.host}:{args.port}")
     logger.info(f"Debug mode: {app.config['DEBUG']}")
     
     try:
-        app.run(
-            host=args.host,
-            port=args.port,
-            debug=app.config['DEBUG'],
-            use_reloader=args.reload,
-            threaded=True
-        )
+        # One worker either way: installations are tracked in this process's memory
+        if server == 'uvicorn':
+            uvicorn.run(
+                "backend.main:asgi_app" if args.reload else asgi_app,
+                host=args.host,
+                port=args.port,
+                reload=args.reload,
+                workers=1,
+                loop="auto",  # uvloop and httptools are picked up when installed
+                http="auto",
+                timeout_keep_alive=5
+            )
+        elif server == 'gunicorn':
+            StandaloneApplication(app, gunicorn_options(
+                args.host,
+                args.port,
+                on_starting=on_starting,
+                on_reload=on_reload,
+                worker_int=worker_int,
+                worker_abort=worker_abort,
+                on_exit=on_exit
+            )).run()
+        else:
+            app.run(
+                host=args.host,
+                port=args.port,
+                debug=app.config['DEBUG'],
+                use_reloader=args.reload,
+                threaded=True
+            )
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
@@ -326,64 +517,3 @@ if __name__ == '__main__':
         logger.info("Shutting down...")
         log_manager.shutdown()
         logger.info("Shutdown complete")
-
-# WSGI entry point for production deployment
-def application(environ, start_response):
-    """WSGI application entry point"""
-    return app(environ, start_response)
-
-# Gunicorn hooks (if using Gunicorn)
-def on_starting(server):
-    """Called just before the master process is initialized."""
-    logger.info("Gunicorn server starting...")
-
-def on_reload(server):
-    """Called to recycle workers during a reload via SIGHUP."""
-    logger.info("Gunicorn server reloading...")
-
-def worker_int(worker):
-    """Called just after a worker has been killed by SIGINT or SIGQUIT."""
-    logger.info(f"Worker {worker.pid} interrupted")
-
-def worker_abort(worker):
-    """Called when a worker receives the SIGABRT signal."""
-    logger.error(f"Worker {worker.pid} aborted")
-
-def on_exit(server):
-    """Called just before exiting."""
-    logger.info("Gunicorn server exiting...")
-    log_manager.shutdown()
-
-# Configuration validation on startup
-validation_errors = []
-
-# Check if running as root for localhost installations
-if settings.environment.value != 'testing':
-    # Only warn about root access in non-testing environments
-    if os.geteuid() != 0:
-        logger.warning(
-            "Not running as root - localhost installations will fail. "
-            "Run with sudo for All-in-One installations."
-        )
-
-# Check required directories
-for directory in [settings.storage.logs_directory, settings.storage.temp_directory]:
-    if not os.path.exists(directory):
-        try:
-            ensure_directory(directory)
-        except Exception as e:
-            validation_errors.append(f"Cannot create directory {directory}: {e}")
-
-# Log validation results
-if validation_errors:
-    for error in validation_errors:
-        logger.error(f"Validation error: {error}")
-    
-    if settings.environment.value == 'production':
-        logger.error("Validation errors in production environment - exiting")
-        sys.exit(1)
-else:
-    logger.info("Application validation passed")
-
-# Export for external use
-__all__ = ['app', 'create_app']
\ No newline at end of file
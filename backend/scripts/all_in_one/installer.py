@@ -5,20 +5,119 @@ Installs single-node Kubernetes cluster with containerd and CNI
 """
 
 import os
+import re
+import json
 import time
+import shutil
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
+
+try:
+    from kubernetes import client as kube_client, config as kube_config, watch as kube_watch
+except ImportError:  # Optional: kubectl is used for every cluster call
+    kube_client = None
 
 from ...core.installer import (
     BaseInstaller, InstallationStep, InstallationConfig, 
     InstallationMode, NodeConfig, CNIProvider
 )
-from ...utils.helpers import run_command, ensure_directory, format_duration
+from ...utils.helpers import run_command, ensure_directory, format_duration, read_file, write_file
 from ...config.settings import settings
+from ..manifest_cache import KUBERNETES_APT_KEY, cached_file, manifest_source
+
+# Active swap entries in /etc/fstab
+FSTAB_SWAP_ENTRY = re.compile(r'^(?!#)(.* swap .*)$', re.M)
+
+# The runc cgroup driver setting in containerd's config.toml
+SYSTEMD_CGROUP_DISABLED = re.compile(r'^(\s*SystemdCgroup\s*=\s*)false\b', re.M)
+SYSTEMD_CGROUP_ENABLED = re.compile(r'^\s*SystemdCgroup\s*=\s*true\b', re.M)
 
 class AllInOneInstaller(BaseInstaller):
     """All-in-One Kubernetes installer implementation"""
     
+    # Kernel parameters Kubernetes networking needs, persisted to sysctl.d and
+    # set in the running kernel through /proc/sys
+    SYSCTL_PARAMS = (
+        ("net.bridge.bridge-nf-call-iptables", "1"),
+        ("net.bridge.bridge-nf-call-ip6tables", "1"),
+        ("net.ipv4.ip_forward", "1"),
+    )
+    PROC_SYS = "/proc/sys"
+    
+    # (description, path, content) written by configure_system
+    SYSTEM_CONFIG_FILES = (
+        ("Add kernel modules configuration", "/etc/modules-load.d/k8s.conf",
+         "overlay\nbr_netfilter\n"),
+        ("Configure sysctl parameters", "/etc/sysctl.d/k8s.conf",
+         "".join(f"{key} = {value}\n" for key, value in SYSCTL_PARAMS)),
+    )
+    
+    # (description, command) run by configure_system as one script; the bridge
+    # parameters only exist once br_netfilter is loaded
+    SYSTEM_STEPS = (
+        ("Disable swap", "swapoff -a"),
+        ("Load kernel modules", "modprobe -a overlay br_netfilter"),
+    )
+    
+    CRI_SOCKET = "unix:///var/run/containerd/containerd.sock"
+    
+    # Prints the kubeadm images containerd does not have yet; fails if kubeadm cannot list them
+    MISSING_IMAGES_COMMAND = (
+        "images=$(kubeadm config images list) && "
+        "for image in $images; do "
+        f"crictl -r {CRI_SOCKET} inspecti \"$image\" >/dev/null 2>&1 || echo \"$image\"; "
+        "done"
+    )
+    
+    CONTROL_PLANE_TAINT = "node-role.kubernetes.io/control-plane"
+    DEFAULT_STORAGE_CLASS_PATCH = {
+        "metadata": {"annotations": {"storageclass.kubernetes.io/is-default-class": "true"}}
+    }
+    
+    # Server-side apply: the API server computes the diff, and large CRDs such as
+    # Calico's don't hit the last-applied annotation size limit
+    KUBECTL_APPLY = "kubectl apply --server-side --force-conflicts --field-manager=toolsauto -f"
+    
+    # Image archive imported before falling back to a registry pull, e.g. built with
+    #   ctr -n k8s.io images export /var/cache/k8s-images.tar $(kubeadm config images list)
+    IMAGE_ARCHIVE = "/var/cache/k8s-images.tar"
+    
+    # One non-interactive apt transaction per package set; skipping the pty and
+    # recommended packages keeps dpkg's work to what the cluster needs
+    APT_INSTALL = "DEBIAN_FRONTEND=noninteractive apt-get -o Dpkg::Use-Pty=0 install -y --no-install-recommends"
+    # Index refresh without translation files or incremental diffs, which an
+    # unattended install never uses and which cost extra round-trips
+    APT_UPDATE = "apt-get update -o Acquire::Languages=none -o Acquire::PDiffs=false"
+    
+    # Packages install_kubernetes_components installs; ones already present are skipped
+    KUBERNETES_DEPENDENCIES = ("apt-transport-https", "ca-certificates", "curl", "gpg")
+    CONTAINER_RUNTIME_PACKAGES = ("containerd",)
+    # Docker's containerd build; Debian's containerd conflicts with it and would remove Docker
+    DOCKER_RUNTIME_PACKAGES = ("containerd.io",)
+    KUBERNETES_PACKAGES = ("kubelet", "kubeadm", "kubectl")
+    KUBERNETES_KEYRING = f"/etc/apt/keyrings/{KUBERNETES_APT_KEY}"
+    KUBERNETES_APT_SOURCE = "/etc/apt/sources.list.d/kubernetes.list"
+    # APT_UPDATE options that refresh only the Kubernetes repository, keeping other lists
+    KUBERNETES_ONLY_UPDATE = (
+        f"-o Dir::Etc::sourcelist={KUBERNETES_APT_SOURCE} "
+        "-o Dir::Etc::sourceparts=- -o APT::Get::List-Cleanup=0"
+    )
+    
+    # (description, command) run after the packages are in place
+    KUBERNETES_SERVICE_STEPS = (
+        # Not critical: a failed hold must not abort the script
+        ("Hold Kubernetes packages", "apt-mark hold kubelet kubeadm kubectl || true"),
+        ("Enable kubelet service", "systemctl enable --now kubelet"),
+    )
+    
+    CONTAINERD_CONFIG = "/etc/containerd/config.toml"
+    
+    # (description, command, critical) run by install_containerd once its config is written
+    CONTAINERD_STEPS = (
+        ("Restart containerd service", "systemctl restart containerd.service", True),
+        ("Restart kubelet service", "systemctl restart kubelet.service", False),
+    )
+    
     def __init__(self, config: InstallationConfig):
         # Validate config for All-in-One mode
         if config.mode != InstallationMode.ALL_IN_ONE:
@@ -32,6 +131,13 @@ class AllInOneInstaller(BaseInstaller):
         
         super().__init__(config)
         self.node = config.nodes[0]
+        
+        # Only the Kubernetes version varies, so the repository source is built once
+        k8s_version = config.k8s_version
+        self._kubernetes_repo_source = f"deb [signed-by={self.KUBERNETES_KEYRING}] https://pkgs.k8s.io/core:/stable:/v{k8s_version}/deb/ /\n"
+        
+        # Kubernetes API client, created once the cluster has a kubeconfig
+        self._api_client = None
     
     def define_installation_steps(self) -> List[InstallationStep]:
         """Define All-in-One installation steps"""
@@ -41,21 +147,27 @@ class AllInOneInstaller(BaseInstaller):
                 description="Configure system for Kubernetes (swap, kernel modules, sysctl)",
                 function=self.configure_system,
                 timeout=180,
-                max_retries=2
+                max_retries=2,
+                resumable=True,
+                depends_on=[]
             ),
             InstallationStep(
                 name="Install Kubernetes Components",
                 description="Install kubeadm, kubelet, kubectl",
                 function=self.install_kubernetes_components,
                 timeout=600,  # apt operations can be slow
-                max_retries=3
+                max_retries=3,
+                resumable=True,
+                depends_on=[]  # apt work does not need swap or modules configured
             ),
             InstallationStep(
                 name="Install Container Runtime",
                 description="Install and configure containerd",
                 function=self.install_containerd,
                 timeout=300,
-                max_retries=2
+                max_retries=2,
+                resumable=True,
+                depends_on=["System Configuration", "Install Kubernetes Components"]
             ),
             InstallationStep(
                 name="Initialize Cluster",
@@ -76,14 +188,16 @@ class AllInOneInstaller(BaseInstaller):
                 description="Remove taint from control plane to allow pod scheduling",
                 function=self.remove_master_taint,
                 timeout=60,
-                max_retries=2
+                max_retries=2,
+                depends_on=["Configure kubectl"]
             ),
             InstallationStep(
                 name="Install CNI",
                 description=f"Install {self.config.cni_provider.value} Container Network Interface",
                 function=self.install_cni,
                 timeout=300,
-                max_retries=3
+                max_retries=3,
+                depends_on=["Configure kubectl"]  # Runs alongside taint removal
             ),
             InstallationStep(
                 name="Configure Storage",
@@ -105,134 +219,109 @@ class AllInOneInstaller(BaseInstaller):
         """Configure system for Kubernetes"""
         self.logger.info("🔧 Configuring system for Kubernetes...")
         
-        # Define system configuration commands
-        commands = [
-            # Disable swap
-            {
-                "description": "Disable swap",
-                "command": "swapoff -a",
-                "critical": True
-            },
-            {
-                "description": "Disable swap in fstab",
-                "command": "sed -i '/ swap / s/^/#/' /etc/fstab",
-                "critical": True
-            },
-            
-            # Configure kernel modules
-            {
-                "description": "Add kernel modules configuration",
-                "command": """cat <<EOF | tee /etc/modules-load.d/k8s.conf
-overlay
-br_netfilter
-EOF""",
-                "critical": True
-            },
-            {
-                "description": "Load overlay module",
-                "command": "modprobe overlay",
-                "critical": True
-            },
-            {
-                "description": "Load br_netfilter module", 
-                "command": "modprobe br_netfilter",
-                "critical": True
-            },
-            
-            # Configure sysctl parameters
-            {
-                "description": "Configure sysctl parameters",
-                "command": """cat <<EOF | tee /etc/sysctl.d/k8s.conf
-net.bridge.bridge-nf-call-iptables  = 1
-net.bridge.bridge-nf-call-ip6tables = 1
-net.ipv4.ip_forward                 = 1
-EOF""",
-                "critical": True
-            },
-            {
-                "description": "Apply sysctl parameters",
-                "command": "sysctl --system",
-                "critical": True
-            }
-        ]
+        # Config files are written directly so they apply on the next boot
+        for description, path, content in self.SYSTEM_CONFIG_FILES:
+            self.logger.info(f"  → {description}")
+            if not write_file(path, content):
+                self.logger.error(f"Critical command failed: {description}")
+                return False
         
-        # Execute commands
-        for cmd in commands:
-            self.logger.info(f"  → {cmd['description']}")
-            success, output = self.execute_command(cmd['command'])
-            
-            if not success:
-                if cmd['critical']:
-                    self.logger.error(f"Critical command failed: {cmd['description']}")
-                    return False
-                else:
-                    self.logger.warning(f"Non-critical command failed: {cmd['description']}")
+        self.logger.info("  → Disable swap in fstab")
+        fstab = read_file("/etc/fstab")
+        if fstab is not None and FSTAB_SWAP_ENTRY.search(fstab):
+            if not write_file("/etc/fstab", FSTAB_SWAP_ENTRY.sub(r'#\1', fstab)):
+                self.logger.error("Critical command failed: Disable swap in fstab")
+                return False
+        
+        # The remaining steps run as one script that stops at the first failure
+        success, failed_step = self.execute_script(self.SYSTEM_STEPS, timeout=180)
+        if not success:
+            self.logger.error(f"Critical command failed: {failed_step}")
+            return False
+        
+        self.logger.info("  → Apply sysctl parameters")
+        if not self._apply_sysctl_params():
+            self.logger.error("Critical command failed: Apply sysctl parameters")
+            return False
         
         self.logger.info("✅ System configuration completed")
         return True
     
+    def _apply_sysctl_params(self) -> bool:
+        """Set SYSCTL_PARAMS in the running kernel
+        
+        Only these keys are written, where sysctl --system would re-apply every
+        file under /etc/sysctl.d.
+        """
+        for key, value in self.SYSCTL_PARAMS:
+            try:
+                with open(os.path.join(self.PROC_SYS, *key.split(".")), "w") as f:
+                    f.write(f"{value}\n")
+            except OSError as e:
+                self.logger.error(f"Failed to set {key}: {e}")
+                return False
+        return True
+    
     def install_kubernetes_components(self) -> bool:
         """Install Kubernetes components"""
         self.logger.info("📦 Installing Kubernetes components...")
         
-        # Check if already installed
-        success, output = self.execute_command("which kubeadm", timeout=10)
-        if success:
+        # Retries and restarts skip whatever apt already installed; containerd
+        # rides along with the dependencies so apt runs once for both, unless a
+        # containerd is already installed or running
+        runtime_packages = self.CONTAINER_RUNTIME_PACKAGES + self.DOCKER_RUNTIME_PACKAGES
+        missing = self._missing_packages(
+            self.KUBERNETES_DEPENDENCIES + runtime_packages + self.KUBERNETES_PACKAGES
+        )
+        runtime_missing = all(p in missing for p in runtime_packages)
+        missing = [p for p in missing if p not in runtime_packages]
+        if runtime_missing and not self._containerd_active():
+            missing += self.CONTAINER_RUNTIME_PACKAGES
+        
+        if not missing:
             self.logger.info("  → Kubernetes components already installed")
             return True
         
-        k8s_version = self.config.k8s_version
-        
-        commands = [
-            {
-                "description": "Update package index",
-                "command": "apt-get update",
-                "critical": True
-            },
-            {
-                "description": "Install dependencies",
-                "command": "apt-get install -y apt-transport-https ca-certificates curl gpg",
-                "critical": True
-            },
-            {
-                "description": "Add Kubernetes GPG key",
-                "command": f"curl -fsSL https://pkgs.k8s.io/core:/stable:/v{k8s_version}/deb/Release.key | gpg --dearmor -o /etc/apt/keyrings/kubernetes-apt-keyring.gpg",
-                "critical": True
-            },
-            {
-                "description": "Add Kubernetes repository",
-                "command": f"echo 'deb [signed-by=/etc/apt/keyrings/kubernetes-apt-keyring.gpg] https://pkgs.k8s.io/core:/stable:/v{k8s_version}/deb/ /' | tee /etc/apt/sources.list.d/kubernetes.list",
-                "critical": True
-            },
-            {
-                "description": "Update package index",
-                "command": "apt-get update",
-                "critical": True
-            },
-            {
-                "description": "Install Kubernetes packages",
-                "command": "apt-get install -y kubelet kubeadm kubectl",
-                "critical": True
-            },
-            {
-                "description": "Hold Kubernetes packages",
-                "command": "apt-mark hold kubelet kubeadm kubectl",
-                "critical": False
-            },
-            {
-                "description": "Enable kubelet service",
-                "command": "systemctl enable --now kubelet",
-                "critical": True
-            }
-        ]
+        missing_dependencies = [p for p in missing if p not in self.KUBERNETES_PACKAGES]
+        missing_kubernetes = [p for p in missing if p in self.KUBERNETES_PACKAGES]
         
-        for cmd in commands:
-            self.logger.info(f"  → {cmd['description']}")
-            success, output = self.execute_command(cmd['command'], timeout=300)
+        steps = []
+        if missing_dependencies:
+            steps += [
+                ("Update package index", self.APT_UPDATE),
+                ("Install dependencies", f"{self.APT_INSTALL} {' '.join(missing_dependencies)}"),
+            ]
+        if missing_kubernetes:
+            # The https repository needs ca-certificates first, so the key and
+            # source list go in between the two scripts
+            if steps:
+                success, failed_step = self.execute_script(steps, timeout=600)
+                if not success:
+                    self.logger.error(f"Failed to {failed_step.lower()}")
+                    return False
             
-            if not success and cmd['critical']:
-                self.logger.error(f"Failed to {cmd['description'].lower()}")
+            self.logger.info("  → Add Kubernetes GPG key")
+            if not self._install_kubernetes_apt_key():
+                self.logger.error("Failed to add kubernetes gpg key")
                 return False
+            
+            self.logger.info("  → Add Kubernetes repository")
+            if not write_file(self.KUBERNETES_APT_SOURCE, self._kubernetes_repo_source):
+                self.logger.error("Failed to add kubernetes repository")
+                return False
+            
+            # After the full update above only the new repository needs indexing
+            update = f"{self.APT_UPDATE} {self.KUBERNETES_ONLY_UPDATE}" if missing_dependencies else self.APT_UPDATE
+            steps = [
+                ("Update package index", update),
+                ("Install Kubernetes packages", f"{self.APT_INSTALL} {' '.join(missing_kubernetes)}"),
+            ]
+        steps += self.KUBERNETES_SERVICE_STEPS
+        
+        success, failed_step = self.execute_script(steps, timeout=600)
+        if not success:
+            self.logger.error(f"Failed to {failed_step.lower()}")
+            return False
         
         # Verify installation
         success, version = self.execute_command("kubeadm version --output=short")
@@ -244,55 +333,82 @@ EOF""",
         
         return True
     
+    def _install_kubernetes_apt_key(self) -> bool:
+        """Copy the cached repository key into apt's keyrings"""
+        key = cached_file(KUBERNETES_APT_KEY)
+        if key is None:
+            return False
+        
+        try:
+            ensure_directory(os.path.dirname(self.KUBERNETES_KEYRING))
+            shutil.copyfile(key, self.KUBERNETES_KEYRING)
+            os.chmod(self.KUBERNETES_KEYRING, 0o644)
+            return True
+        except OSError as e:
+            self.logger.error(f"Failed to install {self.KUBERNETES_KEYRING}: {e}")
+            return False
+    
+    def _containerd_active(self) -> bool:
+        """Whether the containerd service is running"""
+        success, output = self.execute_command("systemctl is-active containerd", timeout=10)
+        return success and output.strip() == "active"
+    
+    def _missing_packages(self, packages: Sequence[str]) -> List[str]:
+        """Those of packages that dpkg does not report as installed"""
+        # dpkg-query exits non-zero when any package is unknown, but still lists the rest;
+        # held packages report "hold ok installed", so only the install state matters
+        success, output = self.execute_command(
+            f"dpkg-query -W -f='${{Package}} ${{Status}}\\n' {' '.join(packages)} 2>/dev/null || true",
+            timeout=30
+        )
+        installed = {
+            line.split(" ", 1)[0] for line in output.splitlines()
+            if success and line.endswith(" ok installed")
+        }
+        return [package for package in packages if package not in installed]
+    
     def install_containerd(self) -> bool:
         """Install and configure containerd"""
         self.logger.info("🐳 Installing and configuring containerd...")
         
-        # Check if containerd is already running
-        success, output = self.execute_command("systemctl is-active containerd", timeout=10)
-        if success and "active" in output:
+        # The package starts containerd with its own defaults on install, so a
+        # running containerd only counts once it uses the systemd cgroup driver
+        active = self._containerd_active()
+        existing = read_file(self.CONTAINERD_CONFIG) if os.path.isfile(self.CONTAINERD_CONFIG) else None
+        configured = existing is not None and SYSTEMD_CGROUP_ENABLED.search(existing) is not None
+        if active and configured:
             self.logger.info("  → containerd is already running")
             return True
         
-        commands = [
-            {
-                "description": "Install containerd",
-                "command": "apt install containerd -y",
-                "critical": True
-            },
-            {
-                "description": "Create containerd config directory", 
-                "command": "mkdir -p /etc/containerd",
-                "critical": True
-            },
-            {
-                "description": "Generate default containerd config",
-                "command": "containerd config default > /etc/containerd/config.toml",
-                "critical": True
-            },
-            {
-                "description": "Enable SystemdCgroup",
-                "command": "sed -i 's/SystemdCgroup = false/SystemdCgroup = true/' /etc/containerd/config.toml",
-                "critical": True
-            },
-            {
-                "description": "Restart containerd service",
-                "command": "systemctl restart containerd.service",
-                "critical": True
-            },
-            {
-                "description": "Restart kubelet service",
-                "command": "systemctl restart kubelet.service",
-                "critical": False
-            }
-        ]
+        # Normally installed alongside the Kubernetes dependencies already
+        runtime_packages = self.CONTAINER_RUNTIME_PACKAGES + self.DOCKER_RUNTIME_PACKAGES
+        if not active and len(self._missing_packages(runtime_packages)) == len(runtime_packages):
+            self.logger.info("  → Install containerd")
+            success, output = self.execute_command(f"{self.APT_INSTALL} {' '.join(self.CONTAINER_RUNTIME_PACKAGES)}")
+            if not success:
+                self.logger.error("Failed to install containerd")
+                return False
         
-        for cmd in commands:
-            self.logger.info(f"  → {cmd['description']}")
-            success, output = self.execute_command(cmd['command'])
+        # Default config with the systemd cgroup driver kubelet expects; one written
+        # by an earlier run is kept rather than starting containerd to regenerate it
+        if configured:
+            self.logger.info("  → containerd config already uses the systemd cgroup driver")
+        else:
+            self.logger.info("  → Generate containerd config")
+            success, config = self.execute_command("containerd config default")
+            if not success or not write_file(
+                self.CONTAINERD_CONFIG,
+                SYSTEMD_CGROUP_DISABLED.sub(r"\1true", config) + "\n"
+            ):
+                self.logger.error("Failed to generate containerd config")
+                return False
+        
+        for description, command, critical in self.CONTAINERD_STEPS:
+            self.logger.info(f"  → {description}")
+            success, output = self.execute_command(command)
             
-            if not success and cmd['critical']:
-                self.logger.error(f"Failed to {cmd['description'].lower()}")
+            if not success and critical:
+                self.logger.error(f"Failed to {description.lower()}")
                 return False
         
         # Verify containerd is running
@@ -309,28 +425,44 @@ EOF""",
         self.logger.info("🚀 Initializing Kubernetes cluster...")
         
         # Check if cluster is already initialized
-        success, output = self.execute_command("kubectl cluster-info", timeout=10)
-        if success and "running" in output.lower():
+        if self.api_server_ready():
             self.logger.info("  → Cluster already initialized")
             return True
         
-        # Pull images first
-        self.logger.info("  → Pulling container images...")
-        success, output = self.execute_command("kubeadm config images pull", timeout=300)
-        if not success:
-            self.logger.warning("Failed to pre-pull images, continuing anyway...")
+        # Pull images first, unless containerd already has all of them
+        success, missing_images = self.execute_command(self.MISSING_IMAGES_COMMAND, timeout=60)
+        if success and missing_images.strip() and os.path.isfile(self.IMAGE_ARCHIVE):
+            self.logger.info("  → Importing cached container images...")
+            imported, _ = self.execute_command(f"ctr -n k8s.io images import {self.IMAGE_ARCHIVE}", timeout=300)
+            if imported:
+                success, missing_images = self.execute_command(self.MISSING_IMAGES_COMMAND, timeout=60)
+        if success and not missing_images.strip():
+            self.logger.info("  → Container images already present")
+        else:
+            self.logger.info("  → Pulling container images...")
+            success, output = self.execute_command_streaming(
+                "kubeadm config images pull",
+                lambda line: self.logger.debug(f"    {line}"),
+                timeout=300
+            )
+            if not success:
+                self.logger.warning("Failed to pre-pull images, continuing anyway...")
         
         # Initialize cluster
         init_command = (
             f"kubeadm init "
             f"--pod-network-cidr={self.config.pod_cidr} "
             f"--service-cidr={self.config.service_cidr} "
-            f"--cri-socket=unix:///var/run/containerd/containerd.sock "
+            f"--cri-socket={self.CRI_SOCKET} "
             f"--skip-phases=addon/kube-proxy"
         )
         
         self.logger.info("  → Running kubeadm init...")
-        success, output = self.execute_command(init_command, timeout=600)
+        success, output = self.execute_command_streaming(
+            init_command,
+            lambda line: self.logger.debug(f"    {line}"),
+            timeout=600
+        )
         
         if not success:
             self.logger.error("Cluster initialization failed")
@@ -380,8 +512,7 @@ EOF""",
             self.logger.warning(f"Failed to copy config to {self.kubeconfig_path}")
         
         # Test kubectl access
-        success, output = self.execute_command("kubectl cluster-info", timeout=30)
-        if success:
+        if self.api_server_ready(timeout=30):
             self.logger.info("✅ kubectl configured successfully")
             return True
         else:
@@ -392,9 +523,23 @@ EOF""",
         """Remove taint from master node to allow pod scheduling"""
         self.logger.info("🏷️  Removing master taint...")
         
+        api = self._kube_api()
+        if api is not None:
+            try:
+                core = kube_client.CoreV1Api(api)
+                for node in core.list_node().items:
+                    taints = node.spec.taints or []
+                    kept = [t for t in taints if t.key != self.CONTROL_PLANE_TAINT]
+                    if len(kept) != len(taints):
+                        core.patch_node(node.metadata.name, {"spec": {"taints": api.sanitize_for_serialization(kept)}})
+                self.logger.info("✅ Master taint removed")
+                return True
+            except Exception as e:
+                self.logger.debug(f"Kubernetes API call failed, using kubectl: {e}")
+        
         # Remove control-plane taint
         success, output = self.execute_command(
-            "kubectl taint nodes --all node-role.kubernetes.io/control-plane- || true",
+            f"kubectl taint nodes --all {self.CONTROL_PLANE_TAINT}- || true",
             timeout=60
         )
         
@@ -424,18 +569,14 @@ EOF""",
         self.logger.info("  → Installing Cilium...")
         
         # Check if already installed
-        success, output = self.execute_command(
-            "kubectl get pods -n kube-system -l k8s-app=cilium --no-headers",
-            timeout=30
-        )
-        if success and output.strip():
+        if self._pods_exist("kube-system", selector="k8s-app=cilium"):
             self.logger.info("  → Cilium already installed")
             return True
         
         # Install Cilium
-        cilium_manifest = "https://raw.githubusercontent.com/cilium/cilium/v1.14.5/install/kubernetes/quick-install.yaml"
+        cilium_manifest = manifest_source("cilium.yaml")
         success, output = self.execute_command(
-            f"kubectl apply -f {cilium_manifest}",
+            f"{self.KUBECTL_APPLY} {cilium_manifest}",
             timeout=180
         )
         
@@ -444,20 +585,7 @@ EOF""",
             return False
         
         # Wait for Cilium pods to be ready
-        def check_cilium_ready():
-            success, output = self.execute_command(
-                "kubectl get pods -n kube-system -l k8s-app=cilium --no-headers",
-                timeout=30
-            )
-            if not success:
-                return False
-            
-            for line in output.strip().split('\n'):
-                if line and 'Running' not in line:
-                    return False
-            return True
-        
-        if self.wait_for_condition(check_cilium_ready, "Cilium pods to be ready", timeout=300):
+        if self._wait_for_pods_ready("kube-system", "Cilium pods to be ready", selector="k8s-app=cilium", timeout=300):
             self.logger.info("✅ Cilium CNI installed and ready")
             return True
         else:
@@ -469,18 +597,14 @@ EOF""",
         self.logger.info("  → Installing Calico...")
         
         # Check if already installed
-        success, output = self.execute_command(
-            "kubectl get pods -n kube-system -l k8s-app=calico-node --no-headers",
-            timeout=30
-        )
-        if success and output.strip():
+        if self._pods_exist("kube-system", selector="k8s-app=calico-node"):
             self.logger.info("  → Calico already installed")
             return True
         
         # Install Calico
-        calico_manifest = "https://docs.projectcalico.org/manifests/calico.yaml"
+        calico_manifest = manifest_source("calico.yaml")
         success, output = self.execute_command(
-            f"kubectl apply -f {calico_manifest}",
+            f"{self.KUBECTL_APPLY} {calico_manifest}",
             timeout=180
         )
         
@@ -489,20 +613,7 @@ EOF""",
             return False
         
         # Wait for Calico pods to be ready
-        def check_calico_ready():
-            success, output = self.execute_command(
-                "kubectl get pods -n kube-system -l k8s-app=calico-node --no-headers",
-                timeout=30
-            )
-            if not success:
-                return False
-            
-            for line in output.strip().split('\n'):
-                if line and 'Running' not in line:
-                    return False
-            return True
-        
-        if self.wait_for_condition(check_calico_ready, "Calico pods to be ready", timeout=300):
+        if self._wait_for_pods_ready("kube-system", "Calico pods to be ready", selector="k8s-app=calico-node", timeout=300):
             self.logger.info("✅ Calico CNI installed and ready")
             return True
         else:
@@ -514,18 +625,14 @@ EOF""",
         self.logger.info("  → Installing Flannel...")
         
         # Check if already installed
-        success, output = self.execute_command(
-            "kubectl get pods -n kube-flannel --no-headers",
-            timeout=30
-        )
-        if success and output.strip():
+        if self._pods_exist("kube-flannel"):
             self.logger.info("  → Flannel already installed")
             return True
         
         # Install Flannel
-        flannel_manifest = "https://github.com/flannel-io/flannel/releases/latest/download/kube-flannel.yml"
+        flannel_manifest = manifest_source("kube-flannel.yml")
         success, output = self.execute_command(
-            f"kubectl apply -f {flannel_manifest}",
+            f"{self.KUBECTL_APPLY} {flannel_manifest}",
             timeout=180
         )
         
@@ -534,20 +641,7 @@ EOF""",
             return False
         
         # Wait for Flannel pods to be ready
-        def check_flannel_ready():
-            success, output = self.execute_command(
-                "kubectl get pods -n kube-flannel --no-headers",
-                timeout=30
-            )
-            if not success:
-                return False
-            
-            for line in output.strip().split('\n'):
-                if line and 'Running' not in line:
-                    return False
-            return True
-        
-        if self.wait_for_condition(check_flannel_ready, "Flannel pods to be ready", timeout=300):
+        if self._wait_for_pods_ready("kube-flannel", "Flannel pods to be ready", timeout=300):
             self.logger.info("✅ Flannel CNI installed and ready")
             return True
         else:
@@ -559,20 +653,16 @@ EOF""",
         self.logger.info("💾 Configuring storage class...")
         
         # Check if local-path storage class already exists
-        success, output = self.execute_command(
-            "kubectl get storageclass local-path --no-headers",
-            timeout=30
-        )
-        if success and "local-path" in output:
+        if self._storage_class_exists("local-path"):
             self.logger.info("  → local-path StorageClass already exists")
             return True
         
         # Install local-path-provisioner
         self.logger.info("  → Installing local-path-provisioner...")
-        provisioner_manifest = "https://raw.githubusercontent.com/rancher/local-path-provisioner/master/deploy/local-path-storage.yaml"
+        provisioner_manifest = manifest_source("local-path-storage.yaml")
         
         success, output = self.execute_command(
-            f"kubectl apply -f {provisioner_manifest}",
+            f"{self.KUBECTL_APPLY} {provisioner_manifest}",
             timeout=120
         )
         
@@ -581,30 +671,12 @@ EOF""",
             return False
         
         # Wait for provisioner to be ready
-        def check_provisioner_ready():
-            success, output = self.execute_command(
-                "kubectl get pods -n local-path-storage --no-headers",
-                timeout=30
-            )
-            if not success:
-                return False
-            
-            for line in output.strip().split('\n'):
-                if line and 'Running' not in line:
-                    return False
-            return True
-        
-        if not self.wait_for_condition(check_provisioner_ready, "local-path-provisioner to be ready", timeout=180):
+        if not self._wait_for_pods_ready("local-path-storage", "local-path-provisioner to be ready", timeout=180):
             self.logger.warning("local-path-provisioner may not be ready, continuing...")
         
         # Set as default storage class
         self.logger.info("  → Setting as default StorageClass...")
-        success, output = self.execute_command(
-            'kubectl patch storageclass local-path -p \'{"metadata": {"annotations":{"storageclass.kubernetes.io/is-default-class":"true"}}}\'',
-            timeout=30
-        )
-        
-        if success:
+        if self._set_default_storage_class("local-path"):
             self.logger.info("✅ Storage class configured successfully")
             return True
         else:
@@ -615,61 +687,182 @@ EOF""",
         """Wait for all system components to be ready"""
         self.logger.info("⏳ Waiting for system to be ready...")
         
-        # Wait for all nodes to be ready
+        # kubectl wait watches for the condition over one connection instead of
+        # re-listing every few seconds; an attempt fails fast if nothing is registered yet
         def check_nodes_ready():
-            success, output = self.execute_command(
-                "kubectl get nodes --no-headers",
-                timeout=30
+            success, _ = self.execute_command(
+                "kubectl wait --for=condition=Ready nodes --all --timeout=60s", timeout=70
             )
-            if not success:
-                return False
-            
-            for line in output.strip().split('\n'):
-                if line and 'Ready' not in line:
-                    return False
-            return True
+            return success
         
         if not self.wait_for_condition(check_nodes_ready, "nodes to be ready", timeout=180):
             return False
         
-        # Wait for core system pods
-        critical_pods = [
-            ("kube-system", "kube-apiserver"),
-            ("kube-system", "kube-controller-manager"),
-            ("kube-system", "kube-scheduler"),
-            ("kube-system", "etcd"),
-        ]
+        # Wait for core system pods (kube-apiserver, controller-manager, scheduler, etcd)
+        def check_control_plane_ready():
+            success, _ = self.execute_command(
+                "kubectl wait --for=condition=Ready pods -l tier=control-plane -n kube-system --timeout=60s",
+                timeout=70
+            )
+            return success
         
-        for namespace, pod_prefix in critical_pods:
-            def check_pod_ready():
-                success, output = self.execute_command(
-                    f"kubectl get pods -n {namespace} --no-headers | grep {pod_prefix}",
-                    timeout=30
-                )
-                if not success:
-                    return False
-                
-                for line in output.strip().split('\n'):
-                    if line and 'Running' not in line:
-                        return False
-                return True
-            
-            if not self.wait_for_condition(
-                check_pod_ready, 
-                f"{pod_prefix} pod to be ready", 
-                timeout=120
-            ):
-                self.logger.warning(f"{pod_prefix} pod may not be ready")
+        if not self.wait_for_condition(check_control_plane_ready, "control plane pods to be ready", timeout=120):
+            self.logger.warning("Control plane pods may not be ready")
         
         # Final cluster health check
-        success, output = self.execute_command("kubectl cluster-info", timeout=30)
-        if success and "running" in output.lower():
+        if self.api_server_ready(timeout=30):
             self.logger.info("✅ System is ready!")
             return True
         else:
             self.logger.error("System readiness check failed")
             return False
     
+    def _wait_for_pods_ready(
+        self,
+        namespace: str,
+        description: str,
+        selector: Optional[str] = None,
+        timeout: int = 300
+    ) -> bool:
+        """Wait for the matching pods to report Ready
+        
+        With the Kubernetes client the pods are watched directly. Otherwise kubectl
+        wait does the watching; it fails straight away while no pods exist yet,
+        which wait_for_condition retries.
+        """
+        api = self._kube_api()
+        if api is not None:
+            self.logger.info(f"⏳ Waiting for: {description}")
+            try:
+                ready = self._watch_pods_ready(api, namespace, selector, timeout)
+            except Exception as e:
+                self.logger.debug(f"Kubernetes API call failed, using kubectl: {e}")
+            else:
+                if ready:
+                    self.logger.info(f"✅ Condition met: {description}")
+                else:
+                    self.logger.error(f"❌ Timeout waiting for: {description} ({timeout}s)")
+                return ready
+        
+        target = f"-l {selector}" if selector else "--all"
+        
+        def check_pods_ready():
+            success, _ = self.execute_command(
+                f"kubectl wait --for=condition=Ready pods {target} -n {namespace} --timeout=60s",
+                timeout=70
+            )
+            return success
+        
+        return self.wait_for_condition(check_pods_ready, description, timeout=timeout)
+    
+    @staticmethod
+    def _pod_is_ready(pod: Any) -> bool:
+        """Whether a V1Pod has its Ready condition set"""
+        conditions = pod.status.conditions if pod.status else None
+        return any(c.type == "Ready" and c.status == "True" for c in conditions or ())
+    
+    def _watch_pods_ready(
+        self,
+        api: "kube_client.ApiClient",
+        namespace: str,
+        selector: Optional[str],
+        timeout: int
+    ) -> bool:
+        """Watch the matching pods until at least one exists and all are Ready; raises on API errors"""
+        core = kube_client.CoreV1Api(api)
+        label_selector = selector or ""
+        deadline = time.monotonic() + timeout
+        
+        pods = core.list_namespaced_pod(namespace, label_selector=label_selector)
+        ready = {pod.metadata.name: self._pod_is_ready(pod) for pod in pods.items}
+        resource_version = pods.metadata.resource_version
+        
+        watcher = kube_watch.Watch()
+        while not (ready and all(ready.values())):
+            remaining = int(deadline - time.monotonic())
+            if remaining <= 0 or self.cancelled:
+                return False
+            
+            # Each stream ends after timeout_seconds; resume from the last seen version
+            for event in watcher.stream(core.list_namespaced_pod, namespace, label_selector=label_selector,
+                                        resource_version=resource_version, timeout_seconds=remaining):
+                if event['type'] == 'ERROR':
+                    raise RuntimeError(f"Pod watch failed: {event['raw_object']}")
+                pod = event['object']
+                resource_version = pod.metadata.resource_version
+                if event['type'] == 'DELETED':
+                    ready.pop(pod.metadata.name, None)
+                else:
+                    ready[pod.metadata.name] = self._pod_is_ready(pod)
+                if ready and all(ready.values()):
+                    watcher.stop()
+                    break
+        return True
+    
+    def _kube_api(self) -> Optional["kube_client.ApiClient"]:
+        """Kubernetes API client reused across calls, or None to fall back to kubectl"""
+        if kube_client is None:
+            return None
+        if self._api_client is None:
+            config_file = str(self.kubeconfig_path) if os.path.isfile(self.kubeconfig_path) else None
+            try:
+                self._api_client = kube_config.new_client_from_config(config_file=config_file)
+            except Exception as e:
+                self.logger.debug(f"Kubernetes client unavailable, using kubectl: {e}")
+                return None
+        return self._api_client
+    
+    def _pods_exist(self, namespace: str, selector: Optional[str] = None) -> bool:
+        """Whether any pod matches selector in namespace"""
+        api = self._kube_api()
+        if api is not None:
+            try:
+                pods = kube_client.CoreV1Api(api).list_namespaced_pod(
+                    namespace, label_selector=selector or "", limit=1
+                )
+                return bool(pods.items)
+            except Exception as e:
+                self.logger.debug(f"Kubernetes API call failed, using kubectl: {e}")
+        
+        command = f"kubectl get pods -n {namespace} --no-headers"
+        if selector:
+            command += f" -l {selector}"
+        success, output = self.execute_command(command, timeout=30)
+        return success and bool(output.strip())
+    
+    def _storage_class_exists(self, name: str) -> bool:
+        """Whether StorageClass name exists"""
+        api = self._kube_api()
+        if api is not None:
+            try:
+                kube_client.StorageV1Api(api).read_storage_class(name)
+                return True
+            except kube_client.ApiException as e:
+                if e.status == 404:
+                    return False
+                self.logger.debug(f"Kubernetes API call failed, using kubectl: {e}")
+            except Exception as e:
+                self.logger.debug(f"Kubernetes API call failed, using kubectl: {e}")
+        
+        success, output = self.execute_command(f"kubectl get storageclass {name} --no-headers", timeout=30)
+        return success and name in output
+    
+    def _set_default_storage_class(self, name: str) -> bool:
+        """Mark StorageClass name as the cluster default"""
+        api = self._kube_api()
+        if api is not None:
+            try:
+                kube_client.StorageV1Api(api).patch_storage_class(name, self.DEFAULT_STORAGE_CLASS_PATCH)
+                return True
+            except Exception as e:
+                self.logger.debug(f"Kubernetes API call failed, using kubectl: {e}")
+        
+        success, _ = self.execute_command(
+            f"kubectl patch storageclass {name} -p '{json.dumps(self.DEFAULT_STORAGE_CLASS_PATCH)}'",
+            timeout=30
+        )
+        return success
+    
     def get_cluster_info(self) -> Dict[str, Any]:
         """Get cluster information"""
         info = {
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Local cache of the Kubernetes manifests the installers apply, and the apt key
+for the Kubernetes package repository
+Run as a module to vendor them ahead of time: python -m backend.scripts.manifest_cache
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+
+from ..config.settings import settings
+from ..utils.helpers import ensure_directory
+
+logger = logging.getLogger(__name__)
+
+# Vendored copies, e.g. fetched while building the container image
+MANIFEST_DIR = Path(__file__).resolve().parent / "manifests"
+
+# Signing key of the Kubernetes apt repository, kept ASCII-armored since apt reads
+# .asc keyrings directly; every minor-version repository is signed with it
+KUBERNETES_APT_KEY = "kubernetes-apt-keyring.asc"
+
+# Upstream sources, pinned so a cached copy never goes stale
+MANIFEST_URLS: Dict[str, str] = {
+    KUBERNETES_APT_KEY: f"https://pkgs.k8s.io/core:/stable:/v{settings.k8s.default_version}/deb/Release.key",
+    "cilium.yaml": "https://raw.githubusercontent.com/cilium/cilium/v1.14.5/install/kubernetes/quick-install.yaml",
+    "calico.yaml": "https://raw.githubusercontent.com/projectcalico/calico/v3.27.0/manifests/calico.yaml",
+    "kube-flannel.yml": "https://github.com/flannel-io/flannel/releases/download/v0.24.0/kube-flannel.yml",
+    "local-path-storage.yaml": "https://raw.githubusercontent.com/rancher/local-path-provisioner/v0.0.26/deploy/local-path-storage.yaml",
+}
+
+# Image references in a manifest, with whatever precedes them on the line
+IMAGE_REF = re.compile(r'^(\s*-?\s*image:\s*["\']?)([^\s"\']+)', re.M)
+
+def _runtime_cache_dir() -> Path:
+    """Where manifests downloaded at install time are kept"""
+    return Path(settings.storage.temp_directory) / "manifests"
+
+def download_manifest(name: str, directory: Path, timeout: int = 60) -> Optional[Path]:
+    """Download manifest name into directory, returning its path or None on failure"""
+    try:
+        response = requests.get(MANIFEST_URLS[name], timeout=timeout)
+        response.raise_for_status()
+        ensure_directory(directory)
+        path = directory / name
+        path.write_bytes(response.content)
+        return path
+    except (requests.RequestException, OSError) as e:
+        logger.warning(f"Failed to download manifest {name}: {e}")
+        return None
+
+def _docker_hub_path(image: str) -> Optional[str]:
+    """Repository path of image on Docker Hub, or None if it lives elsewhere"""
+    first, _, rest = image.partition('/')
+    if not rest:
+        return f"library/{image}"
+    if first == "docker.io":
+        return rest if '/' in rest else f"library/{rest}"
+    if '.' in first or ':' in first or first == "localhost":
+        return None
+    return image
+
+def mirror_images(manifest: str, mirror: str) -> str:
+    """Point Docker Hub image references in manifest at a pull-through mirror"""
+    mirror = mirror.rstrip('/')
+
+    def replace(match: re.Match) -> str:
+        path = _docker_hub_path(match.group(2))
+        return match.group(0) if path is None else f"{match.group(1)}{mirror}/{path}"
+
+    return IMAGE_REF.sub(replace, manifest)
+
+def cached_file(name: str) -> Optional[Path]:
+    """Local copy of name, downloading it once if needed; None if unavailable"""
+    for directory in (MANIFEST_DIR, _runtime_cache_dir()):
+        path = directory / name
+        if path.is_file():
+            return path
+
+    return download_manifest(name, _runtime_cache_dir())
+
+def manifest_source(name: str) -> str:
+    """Local path to manifest name, downloading it once if needed
+
+    With a registry mirror configured, the returned copy pulls its Docker Hub
+    images through the mirror. Falls back to the upstream URL so kubectl can
+    still fetch it itself.
+    """
+    path = cached_file(name)
+    if path is None:
+        return MANIFEST_URLS[name]
+
+    mirror = settings.k8s.registry_mirror
+    if not mirror:
+        return str(path)
+
+    mirrored = _runtime_cache_dir() / "mirrored" / name
+    try:
+        ensure_directory(mirrored.parent)
+        mirrored.write_text(mirror_images(path.read_text(), mirror))
+        return str(mirrored)
+    except OSError as e:
+        logger.warning(f"Failed to rewrite images in manifest {name}: {e}")
+        return str(path)
+
+def vendor_manifests(directory: Path = MANIFEST_DIR) -> bool:
+    """Download every manifest into directory"""
+    return all([download_manifest(name, directory) is not None for name in MANIFEST_URLS])
+
+__all__ = [
+    'KUBERNETES_APT_KEY', 'MANIFEST_DIR', 'MANIFEST_URLS', 'cached_file', 'manifest_source',
+    'mirror_images', 'vendor_manifests'
+]
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(0 if vendor_manifests() else 1)
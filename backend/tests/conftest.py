@@ -0,0 +1,22 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from backend.config.settings import settings
+
+def pytest_configure(config):
+    """Point log and scratch directories at a temp dir before the logger is imported
+
+    backend.utils.logger opens app.log and error.log at import time, so this
+    has to run before test modules are collected rather than in a fixture.
+    """
+    scratch = Path(tempfile.mkdtemp(prefix="k8sauto-tests-"))
+    config._storage_scratch = scratch
+    settings.storage.logs_directory = str(scratch / "logs")
+    settings.storage.temp_directory = str(scratch / "temp")
+    settings.storage.backup_directory = str(scratch / "backups")
+
+def pytest_unconfigure(config):
+    scratch = getattr(config, "_storage_scratch", None)
+    if scratch is not None:
+        shutil.rmtree(scratch, ignore_errors=True)
@@ -1,3 +1,4 @@
+import json
 
 import pytest
 from unittest.mock import patch, MagicMock, call
@@ -12,13 +13,14 @@ def valid_config():
     )
 
 @pytest.fixture
-def installer(valid_config):
+def installer(valid_config, tmp_path):
     with patch('backend.core.installer.BaseInstaller.__init__'):
         installer = AllInOneInstaller(valid_config)
         installer.config = valid_config
         installer.node = valid_config.nodes[0]
         installer.logger = MagicMock()
         installer.kubeconfig_path = "/dummy/path"
+        installer.CONTAINERD_CONFIG = str(tmp_path / "containerd" / "config.toml")
         return installer
 
 def test_init_success(installer, valid_config):
@@ -46,78 +48,264 @@ def test_define_installation_steps(installer):
     assert "Initialize Cluster" in step_names
     assert "Install CNI" in step_names
 
-def test_configure_system_success(installer):
-    with patch.object(installer, 'execute_command', return_value=(True, "")) as mock_execute:
+@pytest.fixture
+def proc_sys(installer, tmp_path):
+    """Stand-in /proc/sys tree for the installer's sysctl writes"""
+    for key, _ in AllInOneInstaller.SYSCTL_PARAMS:
+        path = tmp_path.joinpath(*key.split("."))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("0\n")
+    installer.PROC_SYS = str(tmp_path)
+    return tmp_path
+
+def test_configure_system_success(installer, proc_sys):
+    fstab = "UUID=abc / ext4 defaults 0 1\n/swap.img none swap sw 0 0\n#/old.img none swap sw 0 0\n"
+    with patch.object(installer, 'execute_command_streaming', return_value=(True, "")) as mock_stream, \
+         patch('backend.scripts.all_in_one.installer.read_file', return_value=fstab), \
+         patch('backend.scripts.all_in_one.installer.write_file', return_value=True) as mock_write:
         result = installer.configure_system()
         assert result is True
-        assert mock_execute.call_count > 0
-
-def test_configure_system_critical_command_fails(installer):
-    with patch.object(installer, 'execute_command', return_value=(False, "Error")) as mock_execute:
+        mock_write.assert_any_call("/etc/modules-load.d/k8s.conf", "overlay\nbr_netfilter\n")
+        mock_write.assert_any_call(
+            "/etc/fstab",
+            "UUID=abc / ext4 defaults 0 1\n#/swap.img none swap sw 0 0\n#/old.img none swap sw 0 0\n"
+        )
+        mock_stream.assert_called_once()
+        assert "<<EOF" not in mock_stream.call_args.args[0]
+        assert "modprobe -a overlay br_netfilter" in mock_stream.call_args.args[0]
+        assert "sysctl --system" not in mock_stream.call_args.args[0]
+    assert (proc_sys / "net" / "ipv4" / "ip_forward").read_text() == "1\n"
+    assert (proc_sys / "net" / "bridge" / "bridge-nf-call-iptables").read_text() == "1\n"
+
+def test_configure_system_fails_without_bridge_sysctls(installer, tmp_path):
+    installer.PROC_SYS = str(tmp_path)
+    with patch.object(installer, 'execute_command_streaming', return_value=(True, "")), \
+         patch('backend.scripts.all_in_one.installer.read_file', return_value=""), \
+         patch('backend.scripts.all_in_one.installer.write_file', return_value=True):
+        assert installer.configure_system() is False
+
+def test_configure_system_critical_command_fails(installer, proc_sys):
+    with patch.object(installer, 'execute_command_streaming', return_value=(False, "Error")) as mock_stream, \
+         patch('backend.scripts.all_in_one.installer.read_file', return_value=""), \
+         patch('backend.scripts.all_in_one.installer.write_file', return_value=True):
         result = installer.configure_system()
         assert result is False
-        mock_execute.assert_called_once()
+        mock_stream.assert_called_once()
 
 def test_install_kubernetes_components_success(installer):
-    with patch.object(installer, 'execute_command') as mock_execute:
-        # Simulate kubeadm not installed, then successful installation
-        mock_execute.side_effect = [(False, ""), (True, ""), (True, ""), (True, ""), (True, ""), (True, ""), (True, ""), (True, ""), (True, ""), (True, "v1.28.0")]
+    with patch.object(installer, 'execute_command') as mock_execute, \
+         patch.object(installer, 'execute_command_streaming', return_value=(True, "")) as mock_stream, \
+         patch('backend.scripts.all_in_one.installer.write_file', return_value=True) as mock_write, \
+         patch.object(installer, '_install_kubernetes_apt_key', return_value=True):
+        # Simulate nothing installed or running yet, then successful installation
+        mock_execute.side_effect = [(True, ""), (False, "inactive"), (True, "v1.28.0")]
         result = installer.install_kubernetes_components()
         assert result is True
-        assert mock_execute.call_count > 1
+        assert mock_execute.call_count == 3
+        # The repository is added from Python between the key and package scripts
+        assert mock_stream.call_count == 2
+        assert "| tee" not in mock_stream.call_args_list[0].args[0]
+        assert "gpg --dearmor" not in mock_stream.call_args_list[0].args[0]
+        # The second update only re-indexes the new repository
+        assert "-o Dir::Etc::sourcelist=/etc/apt/sources.list.d/kubernetes.list" in mock_stream.call_args_list[1].args[0]
+        assert "Acquire::Languages=none" in mock_stream.call_args_list[0].args[0]
+        mock_write.assert_called_once()
+        assert mock_write.call_args.args[0] == "/etc/apt/sources.list.d/kubernetes.list"
+        assert "https://pkgs.k8s.io/core:/stable:/v" in mock_write.call_args.args[1]
+
+def test_install_kubernetes_components_skips_installed_packages(installer):
+    installed = "\n".join(f"{p} install ok installed" for p in ("apt-transport-https", "ca-certificates", "curl", "gpg", "kubelet"))
+    installed += "\ncontainerd deinstall ok config-files"
+    with patch.object(installer, 'execute_command') as mock_execute, \
+         patch.object(installer, 'execute_script', return_value=(True, "")) as mock_script, \
+         patch('backend.scripts.all_in_one.installer.write_file', return_value=True), \
+         patch.object(installer, '_install_kubernetes_apt_key', return_value=True):
+        mock_execute.side_effect = [(True, installed), (False, "inactive"), (True, "v1.28.0")]
+        assert installer.install_kubernetes_components() is True
+
+    first_script, second_script = (c.args[0] for c in mock_script.call_args_list)
+    assert (
+        "Install dependencies",
+        f"{AllInOneInstaller.APT_INSTALL} containerd"
+    ) in first_script
+    commands = [command for _, command in second_script]
+    assert f"{AllInOneInstaller.APT_INSTALL} kubeadm kubectl" in commands
+    assert f"{AllInOneInstaller.APT_UPDATE} {AllInOneInstaller.KUBERNETES_ONLY_UPDATE}" in commands
+    assert not any("ca-certificates" in command for command in first_script + second_script)
+
+def test_install_kubernetes_components_skips_held_packages(installer):
+    installed = "\n".join(f"{p} install ok installed" for p in ("apt-transport-https", "ca-certificates", "curl", "gpg", "containerd"))
+    installed += "\n" + "\n".join(f"{p} hold ok installed" for p in ("kubelet", "kubeadm", "kubectl"))
+    with patch.object(installer, 'execute_command') as mock_execute, \
+         patch.object(installer, 'execute_script') as mock_script:
+        mock_execute.side_effect = [(True, installed), (True, "v1.28.0")]
+        assert installer.install_kubernetes_components() is True
+    mock_script.assert_not_called()
+
+def test_install_kubernetes_components_full_update_without_dependency_install(installer):
+    installed = "\n".join(f"{p} install ok installed" for p in ("apt-transport-https", "ca-certificates", "curl", "gpg", "containerd"))
+    with patch.object(installer, 'execute_command') as mock_execute, \
+         patch.object(installer, 'execute_script', return_value=(True, "")) as mock_script, \
+         patch('backend.scripts.all_in_one.installer.write_file', return_value=True), \
+         patch.object(installer, '_install_kubernetes_apt_key', return_value=True):
+        mock_execute.side_effect = [(True, installed), (True, "v1.28.0")]
+        assert installer.install_kubernetes_components() is True
+
+    commands = [command for _, command in mock_script.call_args.args[0]]
+    assert AllInOneInstaller.APT_UPDATE in commands
+
+def test_install_kubernetes_apt_key_copies_cached_key(installer, tmp_path):
+    cached = tmp_path / "kubernetes-apt-keyring.asc"
+    cached.write_text("-----BEGIN PGP PUBLIC KEY BLOCK-----\n")
+    installer.KUBERNETES_KEYRING = str(tmp_path / "keyrings" / "kubernetes-apt-keyring.asc")
+    with patch('backend.scripts.all_in_one.installer.cached_file', return_value=cached):
+        assert installer._install_kubernetes_apt_key() is True
+    assert open(installer.KUBERNETES_KEYRING).read() == cached.read_text()
+
+    with patch('backend.scripts.all_in_one.installer.cached_file', return_value=None):
+        assert installer._install_kubernetes_apt_key() is False
 
 def test_install_kubernetes_components_already_installed(installer):
-    with patch.object(installer, 'execute_command', return_value=(True, "")) as mock_execute:
+    packages = ("apt-transport-https", "ca-certificates", "curl", "gpg", "containerd", "kubelet", "kubeadm", "kubectl")
+    installed = "\n".join(f"{p} install ok installed" for p in packages)
+    with patch.object(installer, 'execute_command', return_value=(True, installed)) as mock_execute:
         result = installer.install_kubernetes_components()
         assert result is True
-        mock_execute.assert_called_once_with("which kubeadm", timeout=10)
+        mock_execute.assert_called_once()
+        assert mock_execute.call_args.args[0].startswith("dpkg-query")
+
+@pytest.mark.parametrize("runtime_installed, probes", [
+    ("containerd.io install ok installed", []),
+    ("", [(True, "active")]),
+])
+def test_install_kubernetes_components_keeps_existing_containerd(installer, runtime_installed, probes):
+    installed = "\n".join(f"{p} install ok installed" for p in ("apt-transport-https", "ca-certificates", "curl", "gpg"))
+    installed += "\n" + runtime_installed
+    with patch.object(installer, 'execute_command') as mock_execute, \
+         patch.object(installer, 'execute_script', return_value=(True, "")) as mock_script, \
+         patch('backend.scripts.all_in_one.installer.write_file', return_value=True), \
+         patch.object(installer, '_install_kubernetes_apt_key', return_value=True):
+        mock_execute.side_effect = [(True, installed), *probes, (True, "v1.28.0")]
+        assert installer.install_kubernetes_components() is True
+
+    commands = [command for c in mock_script.call_args_list for _, command in c.args[0]]
+    assert not any("containerd" in command for command in commands)
 
 def test_install_kubernetes_components_critical_command_fails(installer):
-    with patch.object(installer, 'execute_command') as mock_execute:
-        # Simulate kubeadm not installed, then apt-get update fails
-        mock_execute.side_effect = [(False, ""), (False, "Error")]
+    with patch.object(installer, 'execute_command', return_value=(False, "")) as mock_execute, \
+         patch.object(installer, 'execute_command_streaming', return_value=(False, "Error")):
+        # Simulate nothing installed, then the install script fails
         result = installer.install_kubernetes_components()
         assert result is False
         assert mock_execute.call_count == 2
 
 def test_install_containerd_success(installer):
+    with patch.object(installer, 'execute_command') as mock_execute, \
+         patch('backend.scripts.all_in_one.installer.write_file', return_value=True) as mock_write:
+        # Not running, not installed yet, then apt, the default config and the restarts succeed
+        mock_execute.side_effect = [(False, ""), (True, ""), (True, ""), (True, "SystemdCgroup = false")] + [(True, "")] * 2 + [(True, "active")]
+        result = installer.install_containerd()
+        assert result is True
+        assert mock_execute.call_args_list[2].args[0] == f"{AllInOneInstaller.APT_INSTALL} containerd"
+        mock_write.assert_called_once_with(installer.CONTAINERD_CONFIG, "SystemdCgroup = true\n")
+
+def test_install_containerd_keeps_existing_systemd_config(installer, tmp_path):
+    config = tmp_path / "config.toml"
+    config.write_text("          SystemdCgroup = true\n")
+    installer.CONTAINERD_CONFIG = str(config)
     with patch.object(installer, 'execute_command') as mock_execute:
-        mock_execute.side_effect = [(False, ""), (True, ""), (True, ""), (True, ""), (True, ""), (True, ""), (True, ""), (True, "active")]
+        mock_execute.side_effect = [(False, ""), (True, "containerd install ok installed")] + [(True, "")] * 2 + [(True, "active")]
+        assert installer.install_containerd() is True
+    assert "containerd config default" not in [c.args[0] for c in mock_execute.call_args_list]
+
+def test_install_containerd_skips_installed_package(installer):
+    with patch.object(installer, 'execute_command') as mock_execute, \
+         patch('backend.scripts.all_in_one.installer.write_file', return_value=True):
+        mock_execute.side_effect = [(False, ""), (True, "containerd install ok installed")] + [(True, "")] * 3 + [(True, "active")]
         result = installer.install_containerd()
         assert result is True
+        assert not any("apt-get" in c.args[0] for c in mock_execute.call_args_list)
 
-def test_install_containerd_already_installed(installer):
+def test_install_containerd_already_installed(installer, tmp_path):
+    config = tmp_path / "config.toml"
+    config.write_text("          SystemdCgroup = true\n")
+    installer.CONTAINERD_CONFIG = str(config)
     with patch.object(installer, 'execute_command', return_value=(True, "active")) as mock_execute:
         result = installer.install_containerd()
         assert result is True
         mock_execute.assert_called_once_with("systemctl is-active containerd", timeout=10)
 
+def test_install_containerd_configures_running_package_default(installer):
+    # The package step installed containerd and its postinst started it with cgroupfs
+    with patch.object(installer, 'execute_command') as mock_execute, \
+         patch('backend.scripts.all_in_one.installer.write_file', return_value=True) as mock_write:
+        mock_execute.side_effect = [(True, "active"), (True, "SystemdCgroup = false")] + [(True, "")] * 2 + [(True, "active")]
+        assert installer.install_containerd() is True
+    commands = [c.args[0] for c in mock_execute.call_args_list]
+    assert not any("apt-get" in command or "dpkg-query" in command for command in commands)
+    assert "systemctl restart containerd.service" in commands
+    mock_write.assert_called_once_with(installer.CONTAINERD_CONFIG, "SystemdCgroup = true\n")
+
+def test_install_containerd_keeps_docker_containerd(installer):
+    with patch.object(installer, 'execute_command') as mock_execute, \
+         patch('backend.scripts.all_in_one.installer.write_file', return_value=True):
+        mock_execute.side_effect = [(False, "inactive"), (True, "containerd.io install ok installed"), (True, "SystemdCgroup = false")] + [(True, "")] * 2 + [(True, "active")]
+        assert installer.install_containerd() is True
+    assert not any("apt-get" in c.args[0] for c in mock_execute.call_args_list)
+
 def test_install_containerd_critical_command_fails(installer):
     with patch.object(installer, 'execute_command') as mock_execute:
-        mock_execute.side_effect = [(False, ""), (False, "Error")]
+        mock_execute.side_effect = [(False, ""), (True, ""), (False, "Error")]
         result = installer.install_containerd()
         assert result is False
 
 def test_initialize_cluster_success(installer):
-    with patch.object(installer, 'execute_command') as mock_execute:
-        mock_execute.side_effect = [(False, ""), (True, ""), (True, "")]
+    with patch.object(installer, 'execute_command') as mock_execute, \
+         patch.object(installer, 'execute_command_streaming', return_value=(True, "")) as mock_stream:
+        mock_execute.side_effect = [(False, ""), (True, "")]
+        result = installer.initialize_cluster()
+        assert result is True
+        # Every image is already present, so only kubeadm init streams
+        mock_stream.assert_called_once()
+        assert mock_stream.call_args.args[0].startswith("kubeadm init")
+
+def test_initialize_cluster_pulls_missing_images(installer):
+    with patch.object(installer, 'execute_command') as mock_execute, \
+         patch.object(installer, 'execute_command_streaming', return_value=(True, "")) as mock_stream:
+        mock_execute.side_effect = [(False, ""), (True, "registry.k8s.io/etcd:3.5.9-0\n")]
+        result = installer.initialize_cluster()
+        assert result is True
+        assert mock_execute.call_args_list[1].args[0] == AllInOneInstaller.MISSING_IMAGES_COMMAND
+        assert [c.args[0] for c in mock_stream.call_args_list][0] == "kubeadm config images pull"
+
+def test_initialize_cluster_imports_cached_images(installer):
+    with patch.object(installer, 'execute_command') as mock_execute, \
+         patch.object(installer, 'execute_command_streaming', return_value=(True, "")) as mock_stream, \
+         patch('backend.scripts.all_in_one.installer.os.path.isfile', return_value=True):
+        # Images missing, the archive import succeeds, then nothing is missing
+        mock_execute.side_effect = [(False, ""), (True, "registry.k8s.io/etcd:3.5.9-0"), (True, ""), (True, "")]
         result = installer.initialize_cluster()
         assert result is True
+        assert mock_execute.call_args_list[2].args[0] == "ctr -n k8s.io images import /var/cache/k8s-images.tar"
+        # No registry pull, only kubeadm init
+        mock_stream.assert_called_once()
+        assert mock_stream.call_args.args[0].startswith("kubeadm init")
 
 def test_initialize_cluster_already_initialized(installer):
-    with patch.object(installer, 'execute_command', return_value=(True, "running")) as mock_execute:
+    with patch.object(installer, 'execute_command', return_value=(True, "ok")) as mock_execute:
         result = installer.initialize_cluster()
         assert result is True
-        mock_execute.assert_called_once_with("kubectl cluster-info", timeout=10)
+        mock_execute.assert_called_once_with("kubectl --request-timeout=5s get --raw=/readyz", timeout=10)
 
 def test_initialize_cluster_fails(installer):
-    with patch.object(installer, 'execute_command') as mock_execute:
-        mock_execute.side_effect = [(False, ""), (True, ""), (False, "Error")]
+    with patch.object(installer, 'execute_command') as mock_execute, \
+         patch.object(installer, 'execute_command_streaming', return_value=(False, "Error")):
+        mock_execute.side_effect = [(False, ""), (True, "")]
         result = installer.initialize_cluster()
         assert result is False
 
 def test_configure_kubectl_success(installer):
-    with patch.object(installer, 'execute_command', return_value=(True, "")) as mock_execute:
+    with patch.object(installer, 'execute_command', return_value=(True, "ok")) as mock_execute:
         result = installer.configure_kubectl()
         assert result is True
 
@@ -169,10 +357,13 @@ def test_install_cni_unsupported(installer):
 
 def test_configure_storage_success(installer):
     with patch.object(installer, 'execute_command') as mock_execute, \
-         patch.object(installer, 'wait_for_condition', return_value=True):
+         patch.object(installer, 'wait_for_condition', return_value=True), \
+         patch('backend.scripts.all_in_one.installer.manifest_source', return_value="/cache/local-path-storage.yaml"):
         mock_execute.return_value = (True, "")
         result = installer.configure_storage()
         assert result is True
+    commands = [c.args[0] for c in mock_execute.call_args_list]
+    assert "kubectl apply --server-side --force-conflicts --field-manager=toolsauto -f /cache/local-path-storage.yaml" in commands
 
 def test_configure_storage_already_exists(installer):
     with patch.object(installer, 'execute_command', return_value=(True, "local-path")) as mock_execute:
@@ -185,7 +376,7 @@ def test_configure_storage_fails(installer):
         result = installer.configure_storage()
         assert result is False
 
-@patch.object(AllInOneInstaller, 'execute_command', return_value=(True, "running"))
+@patch.object(AllInOneInstaller, 'execute_command', return_value=(True, "ok"))
 @patch.object(AllInOneInstaller, 'wait_for_condition', return_value=True)
 def test_wait_for_system_ready_success(mock_wait, mock_execute, installer):
     result = installer.wait_for_system_ready()
@@ -196,8 +387,8 @@ def test_wait_for_system_ready_nodes_fail(mock_wait, installer):
     result = installer.wait_for_system_ready()
     assert result is False
 
-@patch.object(AllInOneInstaller, 'execute_command', return_value=(True, "running"))
-@patch.object(AllInOneInstaller, 'wait_for_condition', side_effect=[True, True, True, True, False])
+@patch.object(AllInOneInstaller, 'execute_command', return_value=(True, "ok"))
+@patch.object(AllInOneInstaller, 'wait_for_condition', side_effect=[True, False])
 def test_wait_for_system_ready_pods_fail(mock_wait, mock_execute, installer):
     result = installer.wait_for_system_ready()
     assert result is True # Non-critical
@@ -207,3 +398,72 @@ def test_wait_for_system_ready_pods_fail(mock_wait, mock_execute, installer):
 def test_wait_for_system_ready_cluster_info_fails(mock_execute, mock_wait, installer):
     result = installer.wait_for_system_ready()
     assert result is False
+
+def test_wait_for_pods_ready_uses_kubectl_wait(installer):
+    with patch.object(installer, 'execute_command', side_effect=[(False, "no matching resources found"), (True, "")]) as mock_execute, \
+         patch.object(installer, 'wait_for_condition', side_effect=lambda check, *args, **kwargs: check() or check()):
+        assert installer._wait_for_pods_ready("kube-system", "Calico pods to be ready", selector="k8s-app=calico-node") is True
+    assert mock_execute.call_args.args[0] == "kubectl wait --for=condition=Ready pods -l k8s-app=calico-node -n kube-system --timeout=60s"
+
+    with patch.object(installer, 'execute_command', return_value=(True, "")) as mock_execute, \
+         patch.object(installer, 'wait_for_condition', side_effect=lambda check, *args, **kwargs: check()):
+        assert installer._wait_for_pods_ready("kube-flannel", "Flannel pods to be ready") is True
+    assert "pods --all -n kube-flannel" in mock_execute.call_args.args[0]
+
+def test_wait_for_pods_ready_watches_with_api_client(installer):
+    pytest.importorskip('kubernetes')
+
+    def pod(name, ready):
+        condition = MagicMock(type="Ready", status="True" if ready else "False")
+        return MagicMock(**{'metadata.name': name, 'metadata.resource_version': "2",
+                            'status.conditions': [condition]})
+
+    installer._api_client = MagicMock()
+    installer.cancelled = False
+    with patch('backend.scripts.all_in_one.installer.kube_client.CoreV1Api') as mock_core, \
+         patch('backend.scripts.all_in_one.installer.kube_watch.Watch') as mock_watch, \
+         patch.object(installer, 'execute_command') as mock_execute:
+        listing = mock_core.return_value.list_namespaced_pod.return_value
+        listing.items = [pod("calico-node-a", False)]
+        listing.metadata.resource_version = "1"
+        mock_watch.return_value.stream.return_value = iter([
+            {'type': 'MODIFIED', 'object': pod("calico-node-a", True)},
+        ])
+        assert installer._wait_for_pods_ready("kube-system", "Calico pods to be ready", selector="k8s-app=calico-node") is True
+
+    stream_kwargs = mock_watch.return_value.stream.call_args.kwargs
+    assert stream_kwargs['label_selector'] == "k8s-app=calico-node"
+    assert stream_kwargs['resource_version'] == "1"
+    mock_watch.return_value.stop.assert_called_once()
+    mock_execute.assert_not_called()
+
+def test_wait_for_system_ready_uses_kubectl_wait(installer):
+    with patch.object(installer, 'execute_command', return_value=(True, "ok")) as mock_execute, \
+         patch.object(installer, 'wait_for_condition', side_effect=lambda check, *args, **kwargs: check()):
+        assert installer.wait_for_system_ready() is True
+    commands = [c.args[0] for c in mock_execute.call_args_list]
+    assert commands[0].startswith("kubectl wait --for=condition=Ready nodes --all")
+    assert "-l tier=control-plane" in commands[1]
+
+def test_api_server_ready_requires_ok(installer):
+    with patch.object(installer, 'execute_command', return_value=(True, "ok\n")) as mock_execute:
+        assert installer.api_server_ready() is True
+        assert "get --raw=/readyz" in mock_execute.call_args.args[0]
+    with patch.object(installer, 'execute_command', return_value=(True, "[-]etcd failed")):
+        assert installer.api_server_ready() is False
+
+def test_pods_exist_falls_back_to_kubectl(installer):
+    with patch('backend.scripts.all_in_one.installer.kube_client', None), \
+         patch.object(installer, 'execute_command', return_value=(True, "calico-node-x 1/1 Running")) as mock_execute:
+        assert installer._pods_exist("kube-system", selector="k8s-app=calico-node") is True
+    mock_execute.assert_called_once_with("kubectl get pods -n kube-system --no-headers -l k8s-app=calico-node", timeout=30)
+
+def test_pods_exist_uses_api_client(installer):
+    pytest.importorskip('kubernetes')
+    installer._api_client = MagicMock()
+    with patch('backend.scripts.all_in_one.installer.kube_client.CoreV1Api') as mock_core, \
+         patch.object(installer, 'execute_command') as mock_execute:
+        mock_core.return_value.list_namespaced_pod.return_value.items = [MagicMock()]
+        assert installer._pods_exist("kube-flannel") is True
+    mock_core.return_value.list_namespaced_pod.assert_called_once_with("kube-flannel", label_selector="", limit=1)
+    mock_execute.assert_not_called()
@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import patch, MagicMock
 from backend.core.installer import BaseInstaller, InstallationConfig, InstallationStep, InstallationStatus
@@ -87,3 +88,166 @@ def test_cancel_installation(installer):
     installer.cancel()
     assert installer.cancelled is True
     assert installer.progress.status == InstallationStatus.CANCELLED
+
+def test_check_connectivity_reports_failed_hosts(installer):
+    from backend.core.installer import NodeConfig
+    installer.config.nodes = [NodeConfig(host=f"10.0.0.{i}", role="worker", ssh_config=MagicMock()) for i in range(1, 5)]
+    with patch('backend.core.installer.ssh_manager') as mock_ssh:
+        mock_ssh.test_connectivity.side_effect = lambda host: host != "10.0.0.3"
+        assert installer._check_connectivity() is False
+        assert mock_ssh.test_connectivity.call_count == 4
+    installer.logger.error.assert_called_with("Failed to connect to hosts: 10.0.0.3")
+
+def test_execute_step_across_hosts_retries_failed_hosts(installer):
+    calls = []
+
+    def configure(host):
+        calls.append(host)
+        return host != "10.0.0.2" or calls.count(host) > 1
+
+    step = InstallationStep(name="Per Host", description="", function=configure,
+                            hosts=["10.0.0.1", "10.0.0.2"], parallel_across_hosts=True)
+    with patch('backend.core.installer.time.sleep'):
+        assert installer.execute_step(step) is True
+    assert sorted(calls) == ["10.0.0.1", "10.0.0.2", "10.0.0.2"]
+    assert [r.host for r in installer.progress.step_results if not r.success] == ["10.0.0.2"]
+
+def test_wait_for_condition_backs_off(installer):
+    results = iter([False, False, False, True])
+    with patch('backend.core.installer.time.sleep') as mock_sleep:
+        assert installer.wait_for_condition(lambda: next(results), "condition", check_interval=5) is True
+    delays = [call.args[0] for call in mock_sleep.call_args_list]
+    assert len(delays) == 3
+    assert delays[0] < 0.25
+    assert all(delay <= 5 for delay in delays)
+
+def test_post_installation_verification_uses_one_snapshot(installer):
+    running = {'phase': 'Running', 'containerStatuses': [{'state': {'running': {}}}]}
+    state = {'items': [
+        {'kind': 'Node', 'status': {'conditions': [{'type': 'Ready', 'status': 'True'}]}},
+        {'kind': 'Pod', 'metadata': {'namespace': 'kube-system', 'labels': {'k8s-app': 'cilium'}}, 'status': running},
+        {'kind': 'Pod', 'metadata': {'namespace': 'kube-system'}, 'status': {'phase': 'Succeeded'}},
+    ]}
+    outputs = {'/readyz': (True, 'ok'), 'get nodes,pods': (True, json.dumps(state))}
+
+    def execute(command, **kwargs):
+        return next(result for key, result in outputs.items() if key in command)
+
+    with patch.object(installer, 'execute_command', side_effect=execute) as mock_execute:
+        assert installer.post_installation_verification() is True
+    assert mock_execute.call_count == 2
+
+def test_progress_to_dict_step_results(installer):
+    installer.execute_step(InstallationStep(name="Test Step", description="", function=lambda: True))
+    step_results = installer.get_progress()['step_results']
+    assert step_results[0]['step_name'] == "Test Step"
+    assert step_results[0]['success'] is True
+    assert '_cached_dict' not in step_results[0]
+
+def test_execute_command_streaming_stops_early(installer):
+    lines = []
+
+    def on_line(line):
+        lines.append(line)
+        return line == "ready"
+
+    success, output = installer.execute_command_streaming("echo starting; echo ready; sleep 5; echo late", on_line)
+    assert success is True
+    assert lines == ["starting", "ready"]
+    assert output == "starting\nready"
+
+def test_check_node_prerequisites_localhost_does_not_spawn(installer):
+    from backend.core.installer import NodeConfig
+    with patch('backend.core.installer.run_command') as mock_run:
+        assert installer._check_node_prerequisites(NodeConfig(host="localhost", role="master")) is True
+    mock_run.assert_not_called()
+
+def test_get_progress_reads_published_snapshot(installer):
+    installer.lock.acquire()
+    try:
+        progress = installer.get_progress()
+    finally:
+        installer.lock.release()
+    assert progress['status'] == InstallationStatus.PENDING.value
+
+    installer.cancel()
+    assert installer.get_progress()['status'] == InstallationStatus.CANCELLED.value
+
+def test_resumable_step_skipped_after_previous_success(config, tmp_path, monkeypatch):
+    from backend.config.settings import settings
+    monkeypatch.setattr(settings.storage, 'logs_directory', str(tmp_path))
+    calls = []
+
+    def configure():
+        calls.append(1)
+        return True
+
+    for _ in range(2):
+        with patch('backend.core.installer.ssh_manager'), \
+             patch('backend.core.installer.get_installation_logger'):
+            installer = DummyInstaller(InstallationConfig())
+        step = InstallationStep(name="Resumable", description="", function=configure, resumable=True)
+        assert installer.execute_step(step) is True
+
+    assert len(calls) == 1
+    assert installer.progress.step_results[0].output == "Completed by a previous run"
+
+def test_prerequisites_checked_once_per_host(installer):
+    from backend.core.installer import NodeConfig
+    installer.config.nodes = [
+        NodeConfig(host="10.0.0.1", role="loadbalancer", ssh_config=MagicMock()),
+        NodeConfig(host="10.0.0.1", role="worker", ssh_config=MagicMock()),
+        NodeConfig(host="10.0.0.2", role="master", ssh_config=MagicMock()),
+    ]
+    with patch.object(installer, '_check_node_prerequisites', return_value=True) as mock_check:
+        assert installer._check_prerequisites() is True
+    assert sorted(call.args[0].host for call in mock_check.call_args_list) == ["10.0.0.1", "10.0.0.2"]
+
+def test_execute_script_stops_at_failing_step(installer, tmp_path):
+    marker = tmp_path / "ran"
+    steps = [
+        ("First step", "true"),
+        ("Broken step", "false"),
+        ("Never runs", f"touch {marker}"),
+    ]
+
+    success, failed_step = installer.execute_script(steps, timeout=10)
+
+    assert success is False
+    assert failed_step == "Broken step"
+    assert not marker.exists()
+    assert installer.execute_script(steps[:1], timeout=10)[0] is True
+    logged = [call.args[0] for call in installer.logger.info.call_args_list]
+    assert "  → Broken step" in logged and "  → Never runs" not in logged
+
+def test_run_steps_overlaps_independent_steps(installer):
+    import threading
+    both_running = threading.Barrier(2, timeout=5)
+    order = []
+
+    def independent(name):
+        def run():
+            both_running.wait()
+            order.append(name)
+            return True
+        return run
+
+    installer.steps = [
+        InstallationStep(name="A", description="", function=independent("A"), depends_on=[]),
+        InstallationStep(name="B", description="", function=independent("B"), depends_on=[]),
+        InstallationStep(name="C", description="", function=lambda: order.append("C") or True),
+    ]
+
+    assert installer._run_steps() is True
+    assert sorted(order[:2]) == ["A", "B"]
+    assert order[2] == "C"
+
+def test_run_steps_stops_on_required_failure(installer):
+    later = MagicMock(return_value=True)
+    installer.steps = [
+        InstallationStep(name="Broken", description="", function=lambda: False, max_retries=0),
+        InstallationStep(name="Later", description="", function=later),
+    ]
+    assert installer._run_steps() is False
+    assert installer.progress.error_message == "Required step failed: Broken"
+    later.assert_not_called()
@@ -0,0 +1,22 @@
+from unittest.mock import patch
+from backend.utils.helpers import run_command
+
+def test_run_command_skips_shell_for_simple_commands():
+    with patch('backend.utils.helpers.subprocess.run') as mock_run:
+        mock_run.return_value.returncode = 0
+        mock_run.return_value.stdout = ""
+        mock_run.return_value.stderr = ""
+
+        run_command("kubectl get nodes --kubeconfig=/etc/kubernetes/admin.conf")
+        run_command("ls /tmp | wc -l")
+
+    direct, piped = mock_run.call_args_list
+    assert direct.args[0] == ["kubectl", "get", "nodes", "--kubeconfig=/etc/kubernetes/admin.conf"]
+    assert direct.kwargs['shell'] is False
+    assert piped.args[0] == "ls /tmp | wc -l"
+    assert piped.kwargs['shell'] is True
+
+def test_run_command_reports_missing_binary():
+    success, stdout, stderr = run_command("definitely-not-a-real-binary --version")
+    assert success is False
+    assert "definitely-not-a-real-binary" in stderr
@@ -1,9 +1,15 @@
+import gzip
 import json
+import os
 import pytest
 from unittest.mock import patch, MagicMock
 
+from backend import main
 from backend.main import create_app
-from backend.api.routes.installation import installations
+from backend.config.settings import Environment, settings
+from backend.api.routes import installation as installation_routes
+from backend.api.routes.installation import installations, run_installation
+from backend.utils.logger import log_manager
 
 @pytest.fixture
 def client():
@@ -18,6 +24,7 @@ def cleanup_installations():
     """Clear the installations dictionary after each test."""
     yield
     installations.clear()
+    installation_routes._completed_ids.clear()
 
 def test_get_installation_modes(client):
     """Test GET /api/v1/installation/modes"""
@@ -32,6 +39,15 @@ def test_get_installation_modes(client):
     assert 'supported_cnis' in data
     assert 'default_config' in data
 
+def test_get_installation_modes_not_modified(client):
+    """Test GET /api/v1/installation/modes with a matching ETag"""
+    response = client.get('/api/v1/installation/modes')
+    etag = response.headers['ETag']
+
+    response = client.get('/api/v1/installation/modes', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.get_data() == b''
+
 @patch('backend.api.routes.installation.validate_request_data', return_value=(True, ""))
 @patch('backend.api.routes.installation.create_installation_config')
 @patch('backend.api.routes.installation.create_installer')
@@ -101,6 +117,74 @@ def test_start_installation_validation_error(client):
     assert 'Validation failed' in data['error']
     assert 'Missing required field: masters' in data['error']
 
+@patch('backend.api.routes.installation.validate_request_data', return_value=(True, ""))
+@patch('backend.api.routes.installation.create_installation_config')
+@patch('backend.api.routes.installation.create_installer')
+def test_start_installation_batch(mock_create_installer, mock_create_config, mock_validate_data, client):
+    """Test POST /api/v1/installation/batch/start - partial success"""
+    mock_config = MagicMock()
+    mock_config.validate.return_value = []
+    mock_config.installation_id = 'mock-install-id'
+    mock_create_config.return_value = mock_config
+
+    response = client.post('/api/v1/installation/batch/start', json={
+        'installs': [{'mode': 'all_in_one', 'k8s_version': '1.28.0'}, {'mode': 'invalid_mode'}]
+    })
+    assert response.status_code == 202
+    data = response.get_json()
+    assert data['started'] == 1
+    assert data['results'][0]['installation_id'] == 'mock-install-id'
+    assert data['results'][1]['success'] is False
+    assert 'Invalid installation mode' in data['results'][1]['error']
+
+def test_start_installation_body_too_large(client):
+    """Test starting installation with an oversized body"""
+    payload = json.dumps({'k8s_version': '1.28.0', 'padding': 'x' * (256 * 1024)})
+    response = client.post('/api/v1/installation/all_in_one/start', data=payload, content_type='application/json')
+    assert response.status_code == 413
+    assert response.get_json()['success'] is False
+
+def test_start_installation_body_not_object(client):
+    """Test starting installation with a JSON array body"""
+    response = client.post('/api/v1/installation/all_in_one/start', json=['1.28.0'])
+    assert response.status_code == 400
+    assert 'JSON object' in response.get_json()['error']
+
+@patch('backend.api.routes.installation.validate_request_data', return_value=(True, ""))
+@patch('backend.api.routes.installation.create_installation_config')
+@patch('backend.api.routes.installation.create_installer')
+def test_start_installation_drops_unknown_fields(mock_create_installer, mock_create_config, mock_validate_data, client):
+    """Test that only known request fields reach validation"""
+    mock_config = MagicMock()
+    mock_config.validate.return_value = []
+    mock_config.installation_id = 'mock-install-id'
+    mock_create_config.return_value = mock_config
+
+    response = client.post('/api/v1/installation/all_in_one/start', json={'k8s_version': '1.28.0', 'extra': [1, 2, 3]})
+    assert response.status_code == 202
+    mock_validate_data.assert_called_once_with({'k8s_version': '1.28.0'}, 'all_in_one')
+
+def test_start_installation_invalid_json(client):
+    """Test starting installation with a malformed body"""
+    response = client.post('/api/v1/installation/all_in_one/start', data='{"k8s_version":', content_type='application/json')
+    assert response.status_code == 400
+    assert 'valid JSON' in response.get_json()['error']
+
+def test_start_installation_batch_empty(client):
+    """Test POST /api/v1/installation/batch/start without installs"""
+    response = client.post('/api/v1/installation/batch/start', json={'installs': []})
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+def test_start_installation_batch_non_string_mode(client):
+    """Test POST /api/v1/installation/batch/start with unhashable modes"""
+    response = client.post('/api/v1/installation/batch/start', json={
+        'installs': [{'mode': ['all_in_one']}, {'mode': {'name': 'ha_secure'}}]
+    })
+    assert response.status_code == 400
+    results = response.get_json()['results']
+    assert all('Invalid installation mode' in result['error'] for result in results)
+
 def test_get_installation_status_not_found(client):
     """Test GET /api/v1/installation/<id>/status for a non-existent installation"""
     response = client.get('/api/v1/installation/invalid_id/status')
@@ -132,7 +216,7 @@ def test_get_installation_logs_success(client):
         {'level': 'INFO', 'message': 'Starting... ' },
         {'level': 'DEBUG', 'message': 'details...'}
     ]
-    mock_installer.get_progress.return_value = {'logs': mock_logs}
+    mock_installer.get_logs.return_value = mock_logs
 
     installations['mock_id'] = {'installer': mock_installer}
 
@@ -141,13 +225,16 @@ def test_get_installation_logs_success(client):
     data = response.get_json()
     assert data['success'] is True
     assert len(data['logs']) == 2
+    mock_installer.get_logs.assert_called_with(None, None)
 
     # Test filtering
-    response = client.get('/api/v1/installation/mock_id/logs?level=INFO')
+    mock_installer.get_logs.return_value = mock_logs[:1]
+    response = client.get('/api/v1/installation/mock_id/logs?level=info&limit=10')
     assert response.status_code == 200
     data = response.get_json()
     assert len(data['logs']) == 1
     assert data['logs'][0]['level'] == 'INFO'
+    mock_installer.get_logs.assert_called_with(20, 10)
 
 def test_cancel_installation_success(client):
     """Test POST /api/v1/installation/<id>/cancel for a running installation"""
@@ -162,9 +249,38 @@ def test_cancel_installation_success(client):
     data = response.get_json()
     assert data['success'] is True
     mock_installer.cancel.assert_called_once()
+    mock_installer._cleanup.assert_not_called()
     assert installations['mock_id']['completed'] is True
     assert installations['mock_id']['error'] == 'Cancelled by user'
 
+def test_cancel_installation_not_started(client):
+    """Test POST /api/v1/installation/<id>/cancel for a queued installation"""
+    mock_installer = MagicMock()
+    mock_future = MagicMock()
+    mock_future.cancel.return_value = True
+    installations['mock_id'] = {
+        'installer': mock_installer,
+        'future': mock_future,
+        'completed': False
+    }
+
+    response = client.post('/api/v1/installation/mock_id/cancel')
+    assert response.status_code == 200
+    mock_future.cancel.assert_called_once()
+    mock_installer.cancel.assert_not_called()
+    mock_installer._cleanup.assert_called_once()
+    assert installations['mock_id']['completed'] is True
+
+def test_get_installation_logs_negative_limit(client):
+    """Test GET /api/v1/installation/<id>/logs with a negative limit"""
+    mock_installer = MagicMock()
+    installations['mock_id'] = {'installer': mock_installer}
+
+    response = client.get('/api/v1/installation/mock_id/logs?limit=-1')
+    assert response.status_code == 400
+    assert 'limit' in response.get_json()['error']
+    mock_installer.get_logs.assert_not_called()
+
 def test_cancel_installation_already_completed(client):
     """Test POST /api/v1/installation/<id>/cancel for a completed installation"""
     installations['mock_id'] = {'completed': True}
@@ -173,4 +289,210 @@ def test_cancel_installation_already_completed(client):
     assert response.status_code == 400
     data = response.get_json()
     assert data['success'] is False
-    assert 'already completed' in data['error']
\ No newline at end of file
+    assert 'already completed' in data['error']
+def test_get_installation_logs_ndjson_stream(client):
+    """Test GET /api/v1/installation/<id>/logs?format=ndjson"""
+    mock_installer = MagicMock()
+    mock_logs = [
+        {'level': 'INFO', 'message': 'first'},
+        {'level': 'INFO', 'message': 'second'},
+        {'level': 'INFO', 'message': 'third'}
+    ]
+    mock_installer.get_logs.return_value = mock_logs[-2:]
+
+    installations['mock_id'] = {'installer': mock_installer}
+
+    response = client.get('/api/v1/installation/mock_id/logs?format=ndjson&limit=2')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)['message'] for line in lines] == ['second', 'third']
+
+def test_get_installation_logs_gzip(client):
+    """Test that large log responses are gzipped when the client accepts it"""
+    mock_installer = MagicMock()
+    mock_installer.get_logs.return_value = [{'level': 'INFO', 'message': f'line {i}'} for i in range(100)]
+    installations['mock_id'] = {'installer': mock_installer}
+
+    response = client.get('/api/v1/installation/mock_id/logs', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(response.get_data()))['total_logs'] == 100
+
+    response = client.get('/api/v1/installation/mock_id/logs?format=ndjson', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert len(gzip.decompress(response.get_data()).splitlines()) == 100
+
+def test_run_installation_keeps_cancelled_state():
+    """A worker finishing after cancellation must not overwrite the cancelled state"""
+    mock_installer = MagicMock()
+    mock_installer.install.return_value = True
+    installations['mock_id'] = {
+        'installer': mock_installer,
+        'completed': True,
+        'success': False,
+        'error': 'Cancelled by user'
+    }
+
+    run_installation('mock_id')
+    assert installations['mock_id']['success'] is False
+    assert installations['mock_id']['error'] == 'Cancelled by user'
+
+def test_completed_installations_are_evicted(monkeypatch):
+    """Test that the oldest completed installations are dropped past the limit"""
+    monkeypatch.setattr(installation_routes, 'MAX_COMPLETED_INSTALLATIONS', 2)
+    for installation_id in ('a', 'b', 'c'):
+        installations[installation_id] = {'installer': MagicMock(), 'completed': False, 'success': False, 'error': None}
+    installations['running'] = {'installer': MagicMock(), 'completed': False, 'success': False, 'error': None}
+
+    for installation_id in ('a', 'b', 'c'):
+        installation_routes._mark_completed(installation_id, True)
+
+    assert set(installations) == {'b', 'c', 'running'}
+
+def test_evicted_installation_logger_is_released(monkeypatch, tmp_path):
+    """Test that eviction drops the installer's logger and its handlers"""
+    monkeypatch.setattr(installation_routes, 'MAX_COMPLETED_INSTALLATIONS', 0)
+    monkeypatch.setattr(settings.storage, 'logs_directory', str(tmp_path))
+    installer = MagicMock()
+    installer.logger = log_manager.get_installation_logger('evicted', 'AllInOneInstaller')
+    installations['evicted'] = {'installer': installer, 'completed': False, 'success': False, 'error': None}
+
+    installation_routes._mark_completed('evicted', True)
+
+    assert 'evicted' not in installations
+    assert 'AllInOneInstaller.evicted' not in log_manager.installation_loggers
+    assert not installer.logger.logger.handlers
+
+def test_health_check(client):
+    """Test GET /api/health"""
+    response = client.get('/api/health')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['status'] == 'healthy'
+    assert data['environment'] == settings.environment.value
+    assert isinstance(data['timestamp'], int)
+    assert isinstance(data['active_loggers'], int)
+
+def test_unknown_route_returns_json_404(client):
+    """Test that error handlers return the prebuilt JSON bodies"""
+    response = client.get('/api/does-not-exist')
+    assert response.status_code == 404
+    assert response.mimetype == 'application/json'
+    assert response.get_json() == {
+        'error': 'Not Found',
+        'message': 'The requested resource was not found',
+        'status_code': 404
+    }
+
+def test_json_responses_are_compact(client):
+    """Test that responses are not pretty-printed, even in debug mode"""
+    client.application.debug = True
+    response = client.get('/api/health')
+    assert b"\n" not in response.data
+    assert response.data.startswith(b'{"status":"healthy"')
+
+def test_static_assets_are_cacheable(client, tmp_path):
+    """Test that static files are served with cache headers"""
+    (tmp_path / "app.js").write_text("console.log('app')")
+    (tmp_path / "app.3f9a1c2b.js").write_text("console.log('app')")
+    client.application.static_folder = str(tmp_path)
+
+    response = client.get('/static/app.js')
+    assert response.status_code == 200
+    assert response.cache_control.max_age == 86400
+    assert not response.cache_control.immutable
+    response.close()
+
+    response = client.get('/static/app.3f9a1c2b.js')
+    assert response.cache_control.immutable
+    assert response.cache_control.max_age == 365 * 24 * 3600
+    response.close()
+
+def test_cleanup_logs_removes_only_old_log_files(client, tmp_path, monkeypatch):
+    """Test that cleanup-logs removes expired log files and nothing else"""
+    old_time = 0
+    for name in ("old.log", "old.log.1", "notes.txt"):
+        path = tmp_path / name
+        path.write_text("x")
+        os.utime(path, (old_time, old_time))
+    (tmp_path / "recent.log").write_text("x")
+    (tmp_path / "archive.log.d").mkdir()
+    monkeypatch.setattr(settings.storage, "logs_directory", str(tmp_path))
+
+    result = client.application.test_cli_runner().invoke(args=["cleanup-logs"])
+    assert "Removed 2 old log files" in result.output
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["archive.log.d", "notes.txt", "recent.log"]
+
+def test_startup_validation_runs_once_on_first_request(client):
+    """Test that startup validation is deferred to the first request and cached"""
+    main.validate_startup.cache_clear()
+    with patch('backend.main.ensure_directory') as mock_ensure, \
+         patch('backend.main.os.path.exists', return_value=False):
+        client.get('/api/health')
+        client.get('/api/health')
+    assert mock_ensure.call_count == 2
+    assert main.validate_startup.cache_info().currsize == 1
+
+def test_production_app_exits_on_startup_errors(monkeypatch, tmp_path):
+    """Test that building the app served by uvicorn refuses a broken production config"""
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    monkeypatch.setattr(settings, "environment", Environment.PRODUCTION)
+    monkeypatch.setattr(settings.storage, "logs_directory", str(blocker / "logs"))
+    main.validate_startup.cache_clear()
+    try:
+        with pytest.raises(SystemExit):
+            create_app()
+    finally:
+        main.validate_startup.cache_clear()
+
+def test_http_errors_use_prebuilt_bodies(client):
+    """Test that every mapped HTTP error returns the shared JSON shape"""
+    response = client.delete('/api/health')
+    assert response.status_code == 405
+    assert response.get_json() == {
+        'error': 'Method Not Allowed',
+        'message': 'The method is not allowed for this endpoint',
+        'status_code': 405
+    }
+
+def test_html_and_json_responses_are_compressed(client):
+    """Test that large responses are compressed when flask-compress is installed"""
+    pytest.importorskip('flask_compress')
+    response = client.get('/api/v1/installation/modes', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers.get('Content-Encoding') == 'gzip'
+    assert json.loads(gzip.decompress(response.data))['success'] is True
+
+def test_ndjson_log_stream_is_not_compressed_by_flask_compress(client):
+    """Test that flask-compress does not buffer the streamed NDJSON logs"""
+    pytest.importorskip('flask_compress')
+    mock_installer = MagicMock()
+    mock_installer.get_logs.return_value = [{'level': 'INFO', 'message': 'x' * 600}] * 3
+    installations['mock_id'] = {'installer': mock_installer}
+
+    response = client.get('/api/v1/installation/mock_id/logs?format=ndjson',
+                          headers={'Accept-Encoding': 'br'})
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert len(response.get_data(as_text=True).splitlines()) == 3
+
+def test_cors_headers_only_for_allowed_origins(client):
+    """Test that CORS headers are added for the frontend origins only"""
+    response = client.get('/api/health', headers={'Origin': 'http://localhost:3000'})
+    assert response.headers['Access-Control-Allow-Origin'] == 'http://localhost:3000'
+    assert 'Origin' in response.vary
+
+    response = client.get('/api/health', headers={'Origin': 'http://evil.example'})
+    assert 'Access-Control-Allow-Origin' not in response.headers
+
+def test_cors_preflight(client):
+    """Test that an OPTIONS preflight from the frontend is allowed"""
+    response = client.options('/api/v1/installation/all_in_one/start', headers={
+        'Origin': 'http://127.0.0.1:3000',
+        'Access-Control-Request-Method': 'POST',
+        'Access-Control-Request-Headers': 'content-type'
+    })
+    assert response.status_code == 200
+    assert response.headers['Access-Control-Allow-Origin'] == 'http://127.0.0.1:3000'
+    assert 'POST' in response.headers['Access-Control-Allow-Methods']
+    assert response.headers['Access-Control-Allow-Headers'] == 'content-type'
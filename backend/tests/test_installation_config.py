@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import patch
 from backend.core.installer import InstallationConfig, InstallationMode, NodeConfig, CNIProvider
@@ -28,9 +29,8 @@ def test_valid_all_in_one_config(valid_all_in_one_config):
     errors = valid_all_in_one_config.validate()
     assert not errors
 
-@patch('os.path.exists', return_value=True)
-@patch('os.access', return_value=True)
-def test_valid_ha_secure_config(mock_access, mock_exists, valid_ha_secure_config):
+@patch('backend.core.ssh_manager._validate_key_file', return_value=(True, None))
+def test_valid_ha_secure_config(mock_validate_key, valid_ha_secure_config):
     errors = valid_ha_secure_config.validate()
     assert not errors
 
@@ -74,4 +74,39 @@ def test_ha_secure_no_load_balancer(valid_ha_secure_config):
 def test_invalid_node_host(valid_all_in_one_config):
     valid_all_in_one_config.nodes[0].host = "invalid-host"
     errors = valid_all_in_one_config.validate()
-    assert "Invalid host address" in errors[0]
\ No newline at end of file
+    assert "Invalid host address" in errors[0]
+def test_save_to_file_skips_unchanged(valid_all_in_one_config, tmp_path):
+    file_path = tmp_path / "config.json"
+    assert valid_all_in_one_config.save_to_file(str(file_path)) is True
+    assert json.loads(file_path.read_text())['k8s_version'] == valid_all_in_one_config.k8s_version
+
+    with patch('backend.core.installer.os.replace') as mock_replace:
+        assert valid_all_in_one_config.save_to_file(str(file_path)) is True
+    mock_replace.assert_not_called()
+    assert not (tmp_path / "config.json.tmp").exists()
+
+def test_save_to_file_writes_enum_values(valid_ha_secure_config, tmp_path):
+    file_path = tmp_path / "config.json"
+    assert valid_ha_secure_config.save_to_file(str(file_path)) is True
+
+    saved = json.loads(file_path.read_text())
+    assert saved['mode'] == "ha_secure"
+    assert saved['cni_provider'] == valid_ha_secure_config.cni_provider.value
+    assert saved['nodes'][0]['ssh_config']['auth_method'] == valid_ha_secure_config.nodes[0].ssh_config.auth_method.value
+
+def test_save_to_file_omits_ssh_secrets(valid_ha_secure_config, tmp_path):
+    fingerprint = valid_ha_secure_config.fingerprint()
+    ssh_config = SSHConfig(host="dummy", username="dummy", password="secret", key_path="/dummy/path", key_passphrase="phrase")
+    for node in valid_ha_secure_config.nodes:
+        node.ssh_config = ssh_config
+
+    file_path = tmp_path / "config.json"
+    assert valid_ha_secure_config.save_to_file(str(file_path)) is True
+    saved = file_path.read_text()
+    assert "secret" not in saved and "phrase" not in saved
+    assert valid_ha_secure_config.fingerprint() == fingerprint
+
+def test_to_dict_matches_asdict(valid_ha_secure_config):
+    from dataclasses import asdict
+
+    assert valid_ha_secure_config.to_dict() == asdict(valid_ha_secure_config)
@@ -1,6 +1,6 @@
 
 import pytest
-from backend.api.routes.installation import validate_request_data
+from backend.api.routes.installation import validate_request_data, create_installation_config
 from backend.core.installer import CNIProvider
 from backend.config.settings import settings
 
@@ -108,3 +108,26 @@ def test_ha_secure_missing_ssh_key_path(base_ha_config):
     is_valid, errors = validate_request_data(base_ha_config, 'ha_secure')
     assert not is_valid
     assert "SSH key path is required" in errors
+
+def test_ha_secure_workers_not_a_list(base_ha_config):
+    base_ha_config["workers"] = "1.1.1.4"
+    is_valid, errors = validate_request_data(base_ha_config, 'ha_secure')
+    assert not is_valid
+    assert "Workers must be a list of IP addresses" in errors
+
+def test_ha_secure_reports_each_missing_field_once():
+    is_valid, errors = validate_request_data({}, 'ha_secure')
+    assert not is_valid
+    assert errors.count("Missing required field: masters") == 1
+    assert "SSH configuration required for HA mode" in errors
+
+def test_ha_secure_config_nodes(base_ha_config):
+    base_ha_config["workers"] = ["1.1.1.4"]
+    config = create_installation_config(base_ha_config, 'ha_secure')
+    assert [(node.role, node.host) for node in config.nodes] == [
+        ("loadbalancer", "2.2.2.2"),
+        ("master", "1.1.1.1"), ("master", "1.1.1.2"), ("master", "1.1.1.3"),
+        ("worker", "1.1.1.4"),
+    ]
+    assert all(node.ssh_config.host == node.host for node in config.nodes)
+    assert all(node.ssh_config.key_path == "/path/to/key" for node in config.nodes)
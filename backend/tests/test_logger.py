@@ -0,0 +1,108 @@
+import logging
+import pytest
+from backend.utils.logger import MemoryLogHandler
+
+@pytest.fixture
+def memory_logger():
+    handler = MemoryLogHandler(max_entries_per_level=3)
+    test_logger = logging.getLogger("test_memory_logger")
+    test_logger.propagate = False
+    test_logger.setLevel(logging.DEBUG)
+    test_logger.addHandler(handler)
+    yield test_logger, handler
+    test_logger.removeHandler(handler)
+
+def test_get_logs_preserves_order(memory_logger):
+    test_logger, handler = memory_logger
+    test_logger.info("one")
+    test_logger.error("two")
+    test_logger.debug("three")
+
+    logs = handler.get_logs()
+    assert [log['message'] for log in logs] == ["one", "two", "three"]
+
+def test_get_logs_min_level(memory_logger):
+    test_logger, handler = memory_logger
+    test_logger.debug("debug")
+    test_logger.info("info")
+    test_logger.warning("warning")
+    test_logger.error("error")
+
+    logs = handler.get_logs(min_level=logging.WARNING)
+    assert [log['level'] for log in logs] == ["WARNING", "ERROR"]
+
+def test_get_logs_limit_returns_most_recent(memory_logger):
+    test_logger, handler = memory_logger
+    for i in range(5):
+        test_logger.info(f"message {i}")
+        test_logger.error(f"error {i}")
+
+    logs = handler.get_logs(limit=2)
+    assert [log['message'] for log in logs] == ["message 4", "error 4"]
+
+    # Each level keeps only the configured number of entries
+    assert len(handler.get_logs(min_level=logging.INFO)) == 6
+
+def test_background_handler_delivers_off_thread():
+    import threading
+    from backend.utils.logger import BackgroundLogHandler
+
+    delivered = []
+
+    class RecordingHandler(logging.Handler):
+        def emit(self, record):
+            delivered.append((record.getMessage(), threading.current_thread().name))
+
+    target = RecordingHandler(level=logging.INFO)
+    handler = BackgroundLogHandler(target)
+    test_logger = logging.getLogger("test_background_logger")
+    test_logger.propagate = False
+    test_logger.setLevel(logging.DEBUG)
+    test_logger.addHandler(handler)
+    try:
+        test_logger.debug("filtered")
+        test_logger.info("hello %s", "world")
+        handler.flush()
+    finally:
+        test_logger.removeHandler(handler)
+        handler.close()
+
+    assert delivered == [("hello world", "log-writer")]
+    assert handler.dropped == 0
+
+def test_websocket_streaming_reuses_one_event_loop():
+    import asyncio
+    import time
+    from backend.utils.logger import WebSocketHandler
+
+    loops = []
+
+    class Client:
+        async def send(self, message):
+            loops.append(asyncio.get_running_loop())
+
+    handler = WebSocketHandler()
+    handler.add_client(Client())
+    handler.start_streaming()
+    try:
+        for message in ("one", "two"):
+            handler.emit(logging.LogRecord("ws", logging.INFO, __file__, 1, message, None, None))
+        deadline = time.time() + 5
+        while len(loops) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        handler.stop_streaming()
+
+    assert len(loops) == 2
+    assert loops[0] is loops[1]
+
+def test_root_logger_writes_through_background_handler():
+    import logging.handlers
+    from backend.utils.logger import BackgroundLogHandler, log_manager
+
+    root_handlers = logging.getLogger().handlers
+    assert log_manager.background_handler in root_handlers
+    assert not any(isinstance(h, logging.handlers.RotatingFileHandler) for h in root_handlers)
+    assert all(isinstance(h, (logging.StreamHandler, logging.handlers.RotatingFileHandler))
+               for h in log_manager.background_handler.handlers)
+    assert isinstance(log_manager.background_handler, BackgroundLogHandler)
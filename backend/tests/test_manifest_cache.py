@@ -0,0 +1,54 @@
+from unittest.mock import patch, MagicMock
+import requests
+from backend.scripts import manifest_cache
+
+def test_manifest_source_prefers_vendored_copy(tmp_path):
+    (tmp_path / "calico.yaml").write_text("kind: DaemonSet\n")
+    with patch.object(manifest_cache, 'MANIFEST_DIR', tmp_path), \
+         patch('backend.scripts.manifest_cache.requests.get') as mock_get:
+        assert manifest_cache.manifest_source("calico.yaml") == str(tmp_path / "calico.yaml")
+    mock_get.assert_not_called()
+
+def test_manifest_source_downloads_once(tmp_path):
+    response = MagicMock(content=b"kind: Deployment\n")
+    with patch.object(manifest_cache, 'MANIFEST_DIR', tmp_path / "vendored"), \
+         patch.object(manifest_cache, '_runtime_cache_dir', return_value=tmp_path / "cache"), \
+         patch('backend.scripts.manifest_cache.requests.get', return_value=response) as mock_get:
+        first = manifest_cache.manifest_source("local-path-storage.yaml")
+        second = manifest_cache.manifest_source("local-path-storage.yaml")
+
+    assert first == second == str(tmp_path / "cache" / "local-path-storage.yaml")
+    mock_get.assert_called_once()
+
+def test_manifest_source_falls_back_to_url(tmp_path):
+    with patch.object(manifest_cache, 'MANIFEST_DIR', tmp_path / "vendored"), \
+         patch.object(manifest_cache, '_runtime_cache_dir', return_value=tmp_path / "cache"), \
+         patch('backend.scripts.manifest_cache.requests.get', side_effect=requests.ConnectionError("offline")):
+        assert manifest_cache.manifest_source("calico.yaml") == manifest_cache.MANIFEST_URLS["calico.yaml"]
+
+def test_mirror_images_rewrites_docker_hub_references():
+    manifest = (
+        "        image: docker.io/calico/cni:v3.27.0\n"
+        "        - image: rancher/local-path-provisioner:v0.0.26\n"
+        "          image: \"busybox\"\n"
+        "        image: quay.io/cilium/cilium:v1.14.5\n"
+        "        imagePullPolicy: IfNotPresent\n"
+    )
+    assert manifest_cache.mirror_images(manifest, "mirror.example/hub/") == (
+        "        image: mirror.example/hub/calico/cni:v3.27.0\n"
+        "        - image: mirror.example/hub/rancher/local-path-provisioner:v0.0.26\n"
+        "          image: \"mirror.example/hub/library/busybox\"\n"
+        "        image: quay.io/cilium/cilium:v1.14.5\n"
+        "        imagePullPolicy: IfNotPresent\n"
+    )
+
+def test_manifest_source_uses_registry_mirror(tmp_path, monkeypatch):
+    (tmp_path / "calico.yaml").write_text("image: docker.io/calico/node:v3.27.0\n")
+    monkeypatch.setattr(manifest_cache.settings.k8s, 'registry_mirror', "mirror.example")
+    with patch.object(manifest_cache, 'MANIFEST_DIR', tmp_path), \
+         patch.object(manifest_cache, '_runtime_cache_dir', return_value=tmp_path / "cache"):
+        source = manifest_cache.manifest_source("calico.yaml")
+
+    assert source == str(tmp_path / "cache" / "mirrored" / "calico.yaml")
+    assert open(source).read() == "image: mirror.example/calico/node:v3.27.0\n"
+    assert (tmp_path / "calico.yaml").read_text() == "image: docker.io/calico/node:v3.27.0\n"
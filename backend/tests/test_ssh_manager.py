@@ -0,0 +1,387 @@
+import os
+import subprocess
+from unittest.mock import patch, MagicMock
+from backend.core.ssh_manager import (
+    SSHConfig, SSHAuthMethod, SSHBackend, SSHConnection, OpenSSHConnection,
+    ConnectionStatus, create_connection
+)
+
+class FakeChannel:
+    """Paramiko channel whose command has already finished"""
+
+    def __init__(self, stdout=b"", stderr=b"", exit_status=0, chunk=4):
+        self.stdout = bytearray(stdout)
+        self.stderr = bytearray(stderr)
+        self.exit_status = exit_status
+        self.chunk = chunk
+
+    def _take(self, buffer, size):
+        data = bytes(buffer[:min(size, self.chunk)])
+        del buffer[:len(data)]
+        return data
+
+    def recv_ready(self):
+        return bool(self.stdout)
+
+    def recv(self, size):
+        return self._take(self.stdout, size)
+
+    def recv_stderr_ready(self):
+        return bool(self.stderr)
+
+    def recv_stderr(self, size):
+        return self._take(self.stderr, size)
+
+    def exit_status_ready(self):
+        return True
+
+    def recv_exit_status(self):
+        return self.exit_status
+
+def openssh_config(**kwargs):
+    return SSHConfig(host="192.168.1.10", auth_method=SSHAuthMethod.AGENT,
+                     backend=SSHBackend.OPENSSH, **kwargs)
+
+def test_openssh_rejects_password_auth():
+    config = SSHConfig(host="192.168.1.10", auth_method=SSHAuthMethod.PASSWORD,
+                       password="secret", backend=SSHBackend.OPENSSH)
+    assert "Password authentication is not supported by the OpenSSH backend" in config.validate()
+
+def test_create_connection_falls_back_without_ssh_binary():
+    with patch('backend.core.ssh_manager.shutil.which', return_value=None):
+        assert type(create_connection(openssh_config())) is SSHConnection
+    with patch('backend.core.ssh_manager.shutil.which', return_value="/usr/bin/ssh"):
+        assert isinstance(create_connection(openssh_config()), OpenSSHConnection)
+
+def test_openssh_commands_share_control_path():
+    connection = OpenSSHConnection(openssh_config())
+    connection.status = ConnectionStatus.CONNECTED
+    completed = subprocess.CompletedProcess(args=[], returncode=0, stdout="ok\n", stderr="")
+
+    with patch.object(type(connection), 'is_connected', return_value=True), \
+         patch('backend.core.ssh_manager.subprocess.run', return_value=completed) as mock_run:
+        result = connection.execute_command("uname -r", environment={"LANG": "C"})
+        assert connection.file_exists("/etc/kubernetes/admin.conf")
+
+    assert result.success and result.stdout == "ok"
+    for call in mock_run.call_args_list:
+        args = call.args[0]
+        assert args[0] == "ssh"
+        assert f"ControlPath={connection.control_path}" in args
+        assert args[-2] == "ubuntu@192.168.1.10"
+    assert mock_run.call_args_list[0].args[0][-1] == "export LANG=C; uname -r"
+    assert mock_run.call_args_list[1].args[0][-1] == "test -e /etc/kubernetes/admin.conf"
+
+def test_openssh_control_socket_in_private_directory():
+    connection = OpenSSHConnection(openssh_config())
+    connection.status = ConnectionStatus.CONNECTED
+    with patch('backend.core.ssh_manager.subprocess.run'):
+        connection._options()
+        control_dir = os.path.dirname(connection.control_path)
+        assert os.stat(control_dir).st_mode & 0o777 == 0o700
+        assert "192.168.1.10" not in control_dir
+
+        connection.disconnect()
+    assert not os.path.exists(control_dir)
+    assert connection.control_path is None
+
+def test_openssh_command_timeout():
+    connection = OpenSSHConnection(openssh_config())
+    with patch.object(type(connection), 'is_connected', return_value=True), \
+         patch('backend.core.ssh_manager.subprocess.run',
+               side_effect=subprocess.TimeoutExpired(cmd="ssh", timeout=1)):
+        result = connection.execute_command("sleep 10", timeout=1)
+
+    assert not result.success
+    assert result.exit_code == -2
+
+def test_concurrent_commands_bounded_by_channels():
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    connection = SSHConnection(SSHConfig(host="192.168.1.10", auth_method=SSHAuthMethod.AGENT), max_channels=2)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def exec_command(command, **kwargs):
+        with lock:
+            active.append(command)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(command)
+        stdout = MagicMock()
+        stdout.channel = FakeChannel(stdout=b"ok")
+        return MagicMock(), stdout, MagicMock()
+
+    connection.client = MagicMock()
+    connection.client.exec_command.side_effect = exec_command
+    with patch.object(type(connection), 'is_connected', return_value=True), \
+         ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(connection.execute_command, [f"echo {i}" for i in range(6)]))
+
+    assert all(result.success for result in results)
+    assert max(peak) == 2
+
+def test_prewarm_connects_each_host_once():
+    import threading
+    import time
+    from backend.core.ssh_manager import SSHManager
+
+    manager = SSHManager()
+    for host in ("192.168.1.10", "192.168.1.11"):
+        manager.add_host(host, SSHConfig(host=host, auth_method=SSHAuthMethod.AGENT))
+
+    connects = []
+
+    def fake_create(config):
+        connection = MagicMock()
+        connection.is_connected.return_value = True
+
+        def connect():
+            connects.append(config.host)
+            time.sleep(0.05)
+            return config.host != "192.168.1.11"
+
+        connection.connect.side_effect = connect
+        return connection
+
+    with patch('backend.core.ssh_manager.create_connection', side_effect=fake_create):
+        warmed = manager.prewarm(["192.168.1.10", "192.168.1.10", "192.168.1.11", "192.168.1.12"])
+
+    assert warmed == {"192.168.1.10": True, "192.168.1.11": False, "192.168.1.12": False}
+    assert sorted(connects) == ["192.168.1.10", "192.168.1.11"]
+
+def test_connect_enlarges_transport_window():
+    from backend.core.ssh_manager import TRANSPORT_WINDOW_SIZE, TRANSPORT_MAX_PACKET_SIZE
+
+    connection = SSHConnection(SSHConfig(host="192.168.1.10", auth_method=SSHAuthMethod.AGENT))
+    with patch('backend.core.ssh_manager.paramiko.SSHClient') as mock_client:
+        assert connection.connect()
+
+    transport = mock_client.return_value.get_transport.return_value
+    assert transport.default_window_size == TRANSPORT_WINDOW_SIZE
+    assert transport.default_max_packet_size == TRANSPORT_MAX_PACKET_SIZE
+    transport.set_keepalive.assert_called_once_with(60)
+
+def test_auto_compression_only_for_public_hosts():
+    assert not SSHConfig(host="192.168.1.10").use_compression
+    assert SSHConfig(host="8.8.8.8").use_compression
+    assert SSHConfig(host="192.168.1.10", compression="on").use_compression
+    assert not SSHConfig(host="8.8.8.8", compression=False).use_compression
+    assert "Invalid compression mode: fast" in SSHConfig(host="192.168.1.10", compression="fast").validate()
+
+def test_transport_prefers_configured_ciphers():
+    import socket
+
+    config = SSHConfig(host="192.168.1.10", preferred_ciphers=("chacha20-poly1305@openssh.com", "aes256-ctr"))
+    left, right = socket.socketpair()
+    try:
+        transport = SSHConnection(config)._create_transport(left)
+        ciphers = transport.get_security_options().ciphers
+    finally:
+        left.close()
+        right.close()
+
+    assert ciphers[0] == "aes256-ctr"
+    assert "chacha20-poly1305@openssh.com" not in ciphers
+    assert "aes128-ctr" in ciphers
+
+def test_file_exists_caches_hits_until_destructive_command():
+    connection = OpenSSHConnection(openssh_config())
+    exists = subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")
+
+    with patch.object(type(connection), 'is_connected', return_value=True), \
+         patch('backend.core.ssh_manager.subprocess.run', return_value=exists) as mock_run:
+        assert connection.file_exists("/usr/bin/kubeadm")
+        assert connection.file_exists("/usr/bin/kubeadm")
+        assert mock_run.call_count == 1
+
+        connection.execute_command("systemctl restart kubelet")
+        assert connection.file_exists("/usr/bin/kubeadm")
+        assert mock_run.call_count == 2
+
+        connection.execute_command("rm -f /usr/bin/kubeadm")
+        assert connection.file_exists("/usr/bin/kubeadm")
+        assert mock_run.call_count == 4
+
+        connection.invalidate_path("/usr/bin/kubeadm")
+        assert connection.file_exists("/usr/bin/kubeadm")
+        assert mock_run.call_count == 5
+
+def test_file_exists_does_not_cache_misses():
+    connection = OpenSSHConnection(openssh_config())
+    missing = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="")
+
+    with patch.object(type(connection), 'is_connected', return_value=True), \
+         patch('backend.core.ssh_manager.subprocess.run', return_value=missing) as mock_run:
+        assert not connection.file_exists("/etc/kubernetes/admin.conf")
+        assert not connection.file_exists("/etc/kubernetes/admin.conf")
+
+    assert mock_run.call_count == 2
+
+def test_read_channel_caps_output_and_trims():
+    from backend.core.ssh_manager import _read_channel, _decode_output
+
+    channel = FakeChannel(stdout=b"  line one\nline two\n\n", stderr=b"warning: " + b"x" * 40)
+    stdout, stderr, truncated = _read_channel(channel, timeout=5, max_output_bytes=20)
+
+    assert truncated
+    assert _decode_output(stdout) == "line one\nline two"
+    assert _decode_output(stderr) == "warning: xxxxxxxxxxx"
+    assert not channel.stderr
+
+def test_connection_limit_evicts_least_recently_used():
+    import threading
+    import time
+    from backend.core.ssh_manager import SSHManager
+
+    threads_before = threading.active_count()
+    manager = SSHManager()
+    assert threading.active_count() == threads_before
+
+    manager.max_connections = 2
+    hosts = ["192.168.1.10", "192.168.1.11", "192.168.1.12"]
+    for host in hosts:
+        manager.add_host(host, SSHConfig(host=host, auth_method=SSHAuthMethod.AGENT),
+                         persistent=host == "192.168.1.10")
+
+    def fake_create(config):
+        connection = MagicMock()
+        connection.is_connected.return_value = True
+        connection.connect.return_value = True
+        connection.last_activity = time.time()
+        return connection
+
+    with patch('backend.core.ssh_manager.create_connection', side_effect=fake_create):
+        first = manager.get_connection("192.168.1.10")
+        second = manager.get_connection("192.168.1.11")
+        manager.get_connection("192.168.1.10")
+        manager.get_connection("192.168.1.12")
+
+    assert list(manager.connections) == ["192.168.1.10", "192.168.1.12"]
+    second.disconnect.assert_called_once()
+    first.disconnect.assert_not_called()
+
+def test_stale_connection_sweep_runs_once_per_interval():
+    from backend.core.ssh_manager import SSHManager
+
+    manager = SSHManager()
+    manager.add_host("192.168.1.10", SSHConfig(host="192.168.1.10", auth_method=SSHAuthMethod.AGENT))
+    connection = MagicMock()
+    connection.is_connected.return_value = True
+    manager.connections["192.168.1.10"] = connection
+
+    with patch.object(manager, '_cleanup_stale_connections') as mock_cleanup:
+        manager.get_connection("192.168.1.10")
+        mock_cleanup.assert_not_called()
+
+        manager._last_cleanup -= manager.cleanup_interval
+        manager.get_connection("192.168.1.10")
+        manager.get_connection("192.168.1.10")
+    mock_cleanup.assert_called_once()
+
+def test_config_and_result_are_frozen_slotted():
+    import dataclasses
+    import pytest
+    from backend.core.ssh_manager import CommandResult
+
+    config = SSHConfig(host="192.168.1.10")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.port = 2222
+    assert {config: True}[SSHConfig(host="192.168.1.10")]
+
+    result = CommandResult(success=True, exit_code=0, stdout="", stderr="", duration=0.1,
+                           command="true", host="192.168.1.10")
+    assert not hasattr(result, '__dict__')
+    assert not hasattr(SSHConnection(config), '__dict__')
+
+def test_is_connected_caches_healthy_probe():
+    connection = SSHConnection(SSHConfig(host="192.168.1.10", auth_method=SSHAuthMethod.AGENT))
+    connection.status = ConnectionStatus.CONNECTED
+    connection.client = MagicMock()
+    transport = connection.client.get_transport.return_value
+    transport.is_active.return_value = True
+
+    assert connection.is_connected()
+    assert connection.is_connected()
+    assert transport.is_active.call_count == 1
+
+    connection.client.exec_command.side_effect = OSError("channel closed")
+    assert connection.execute_command("true").exit_code == -3
+
+    transport.is_active.return_value = False
+    assert not connection.is_connected()
+    assert transport.is_active.call_count == 2
+
+def test_transfers_count_bytes_without_local_stat(tmp_path):
+    connection = SSHConnection(SSHConfig(host="192.168.1.10", auth_method=SSHAuthMethod.AGENT))
+    connection.sftp = MagicMock()
+    connection.sftp.put.return_value = MagicMock(st_size=120)
+    connection.sftp.getfo.return_value = 80
+
+    with patch.object(SSHConnection, 'is_connected', return_value=True), \
+         patch('backend.core.ssh_manager.os.path.getsize') as mock_getsize:
+        assert connection.upload_file(str(tmp_path / "manifest.yaml"), "/tmp/manifest.yaml")
+        assert connection.download_file("/etc/kubernetes/admin.conf", str(tmp_path / "admin.conf"))
+
+    mock_getsize.assert_not_called()
+    assert connection.bytes_transferred == 200
+
+def test_key_file_check_is_shared_across_hosts(tmp_path):
+    key = tmp_path / "id_rsa"
+    key.write_text("key")
+    configs = [SSHConfig(host=f"10.0.0.{i}", key_path=str(key)) for i in range(1, 50)]
+
+    with patch('backend.core.ssh_manager.os.access', return_value=True) as mock_access:
+        assert all(not config.validate() for config in configs)
+    assert mock_access.call_count == 1
+
+    key.unlink()
+    assert "SSH key file not found" in configs[0].validate()[0]
+
+def test_slow_handshake_does_not_block_other_hosts():
+    import threading
+    from backend.core.ssh_manager import SSHManager
+
+    manager = SSHManager()
+    for host in ("192.168.1.10", "192.168.1.11"):
+        manager.add_host(host, SSHConfig(host=host, auth_method=SSHAuthMethod.AGENT))
+
+    release = threading.Event()
+
+    def fake_create(config):
+        connection = MagicMock()
+        connection.is_connected.return_value = True
+        connection.connect.side_effect = lambda: release.wait(5) if config.host == "192.168.1.10" else True
+        return connection
+
+    with patch('backend.core.ssh_manager.create_connection', side_effect=fake_create):
+        slow = threading.Thread(target=manager.get_connection, args=("192.168.1.10",))
+        slow.start()
+        try:
+            assert manager.get_connection("192.168.1.11") is not None
+            assert slow.is_alive()
+        finally:
+            release.set()
+            slow.join()
+
+def test_get_system_info_parses_batched_output():
+    from backend.core.ssh_manager import SSHManager, CommandResult, SYSTEM_INFO_MARKER
+
+    stdout = (f"{SYSTEM_INFO_MARKER}hostname\nnode-1\n{SYSTEM_INFO_MARKER}os\nubuntu\n"
+              f"{SYSTEM_INFO_MARKER}memory\n\n{SYSTEM_INFO_MARKER}uptime\nup 3 days")
+    result = CommandResult(success=True, exit_code=0, stdout=stdout, stderr="", duration=0.1,
+                           command="", host="192.168.1.10")
+
+    manager = SSHManager()
+    with patch.object(SSHManager, 'execute_command', return_value=result) as mock_execute:
+        info = manager.get_system_info("192.168.1.10")
+        manager.get_system_info("192.168.1.10")
+
+    assert info == {'hostname': 'node-1', 'os': 'ubuntu', 'kernel': 'unknown', 'arch': 'unknown',
+                    'memory': 'unknown', 'cpu_cores': 'unknown', 'uptime': 'up 3 days'}
+    first, second = (call.args[1] for call in mock_execute.call_args_list)
+    assert first is second
@@ -11,12 +11,18 @@ import json
 import yaml
 import hashlib
 import secrets
+import shlex
+import signal
 import subprocess
+import threading
 import ipaddress
 import re
+import dataclasses
+from collections import deque
+from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union, Tuple, Callable
-from functools import wraps
+from typing import Dict, List, Optional, Any, Union, Tuple, Callable, get_args, get_origin
+from functools import wraps, lru_cache
 from datetime import datetime, timedelta
 import logging
 
@@ -67,8 +73,32 @@ def check_command_exists(command: str) -> bool:
     except subprocess.CalledProcessError:
         return False
 
+# Syntax only a shell understands; commands without any of it are run directly
+_SHELL_SYNTAX = re.compile(r'[|&;<>()$`\\*?\[\]{}~#\n]')
+_SHELL_BUILTINS = frozenset({
+    'cd', 'export', 'source', '.', 'set', 'unset', 'ulimit', 'umask',
+    'alias', 'exec', 'eval', 'exit', 'type', 'command',
+})
+
+def _command_args(command: Union[str, List[str]], shell: bool) -> Tuple[Union[str, List[str]], bool]:
+    """Split command into argv when a shell would add nothing but a fork"""
+    if not isinstance(command, str):
+        return list(command), False
+    if not shell or _SHELL_SYNTAX.search(command):
+        return command, shell
+    
+    try:
+        args = shlex.split(command)
+    except ValueError:
+        return command, shell
+    
+    # Builtins and VAR=value prefixes still need the shell
+    if not args or args[0] in _SHELL_BUILTINS or '=' in args[0]:
+        return command, shell
+    return args, False
+
 def run_command(
-    command: str, 
+    command: Union[str, List[str]], 
     timeout: int = 300, 
     capture_output: bool = True,
     shell: bool = True,
@@ -80,10 +110,10 @@ def run_command(
     Run system command with comprehensive error handling
     
     Args:
-        command: Command to execute
+        command: Command to execute, as a string or argument list
         timeout: Command timeout in seconds
         capture_output: Whether to capture stdout/stderr
-        shell: Whether to use shell
+        shell: Whether to use shell; simple command strings run without one
         check: Whether to raise exception on non-zero exit
         cwd: Working directory
         env: Environment variables
@@ -94,8 +124,9 @@ def run_command(
     try:
         logger.debug(f"Executing command: {command}")
         
+        args, shell = _command_args(command, shell)
         result = subprocess.run(
-            command,
+            args,
             shell=shell,
             capture_output=capture_output,
             text=True,
@@ -126,22 +157,110 @@ def run_command(
         logger.error(f"Command failed with exit code {e.returncode}: {command}")
         return False, e.stdout or "", e.stderr or ""
         
+    except FileNotFoundError as e:
+        # Raised instead of exit status 127 when no shell is involved
+        logger.error(f"Command not found: {command}")
+        return False, "", str(e)
+        
     except Exception as e:
         logger.error(f"Unexpected error running command '{command}': {e}")
         return False, "", str(e)
 
+def stream_command(
+    command: Union[str, List[str]],
+    on_line: Callable[[str], Optional[bool]],
+    timeout: int = 300,
+    shell: bool = True,
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    tail_lines: int = 20
+) -> Tuple[bool, str]:
+    """
+    Run system command, passing each output line to on_line as it is produced
+    
+    stderr is merged into stdout. If on_line returns True the command is
+    stopped and treated as successful.
+    
+    Returns:
+        Tuple of (success, last tail_lines lines of output)
+    """
+    tail: deque = deque(maxlen=tail_lines)
+    try:
+        logger.debug(f"Streaming command: {command}")
+        
+        args, shell = _command_args(command, shell)
+        process = subprocess.Popen(
+            args,
+            shell=shell,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            cwd=cwd,
+            env=env,
+            start_new_session=True
+        )
+        timed_out = threading.Event()
+        
+        def kill():
+            # Kill the whole process group so shell children release the pipe
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        
+        def kill_on_timeout():
+            timed_out.set()
+            kill()
+        
+        timer = threading.Timer(timeout, kill_on_timeout)
+        timer.start()
+        try:
+            for line in process.stdout:
+                line = line.rstrip('\n')
+                tail.append(line)
+                if on_line(line):
+                    kill()
+                    process.wait()
+                    return True, "\n".join(tail)
+            returncode = process.wait()
+        finally:
+            timer.cancel()
+            process.stdout.close()
+        
+        if timed_out.is_set():
+            logger.error(f"Command timed out after {timeout}s: {command}")
+            return False, f"Command timed out after {timeout} seconds"
+        
+        if returncode != 0:
+            logger.error(f"Command failed (exit {returncode}): {command}")
+        return returncode == 0, "\n".join(tail)
+        
+    except Exception as e:
+        logger.error(f"Unexpected error running command '{command}': {e}")
+        return False, str(e)
+
 # ===============================
 # Network & Validation Utilities
 # ===============================
 
+_IPV4_OCTET = r'(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)'
+_IPV4_PATTERN = re.compile(rf'{_IPV4_OCTET}(?:\.{_IPV4_OCTET}){{3}}')
+_HOSTNAME_LABEL_PATTERN = re.compile(r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?$')
+
+@lru_cache(maxsize=4096)
 def validate_ip_address(ip: str) -> bool:
     """Validate IP address format"""
+    # Dotted IPv4 is the common case; anything else goes through ipaddress
+    if isinstance(ip, str) and _IPV4_PATTERN.fullmatch(ip):
+        return True
     try:
         ipaddress.ip_address(ip)
         return True
     except ValueError:
         return False
 
+@lru_cache(maxsize=1024)
 def validate_cidr(cidr: str) -> bool:
     """Validate CIDR notation"""
     try:
@@ -158,6 +277,7 @@ def validate_port(port: Union[str, int]) -> bool:
     except (ValueError, TypeError):
         return False
 
+@lru_cache(maxsize=4096)
 def validate_hostname(hostname: str) -> bool:
     """Validate hostname format"""
     if len(hostname) > 255:
@@ -168,8 +288,7 @@ def validate_hostname(hostname: str) -> bool:
         hostname = hostname[:-1]
     
     # Check each label
-    allowed = re.compile(r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?$')
-    return all(allowed.match(label) for label in hostname.split('.'))
+    return all(_HOSTNAME_LABEL_PATTERN.match(label) for label in hostname.split('.'))
 
 def is_port_open(host: str, port: int, timeout: int = 5) -> bool:
     """Check if port is open on host"""
@@ -344,19 +463,22 @@ def truncate_string(text: str, max_length: int = 100, suffix: str = "...") -> st
 # Kubernetes Utilities
 # ===============================
 
+_K8S_NAME_PATTERN = re.compile(r'^[a-z0-9]([-a-z0-9]*[a-z0-9])?$')
+
 def validate_k8s_name(name: str) -> bool:
     """Validate Kubernetes resource name"""
     # DNS-1123 subdomain format
     if not name or len(name) > 63:
         return False
     
-    pattern = re.compile(r'^[a-z0-9]([-a-z0-9]*[a-z0-9])?$')
-    return pattern.match(name) is not None
+    return _K8S_NAME_PATTERN.match(name) is not None
+
+_K8S_VERSION_PATTERN = re.compile(r'^\d+\.\d+(\.\d+)?$')
 
+@lru_cache(maxsize=64)
 def validate_k8s_version(version: str) -> bool:
     """Validate Kubernetes version format"""
-    pattern = re.compile(r'^\d+\.\d+(\.\d+)?$')
-    return pattern.match(version) is not None
+    return _K8S_VERSION_PATTERN.match(version) is not None
 
 def parse_k8s_version(version: str) -> Optional[Tuple[int, int, int]]:
     """Parse Kubernetes version string to tuple"""
@@ -451,6 +573,52 @@ def timeout(seconds: int):
         return wrapper
     return decorator
 
+# Field types whose values to_dict() can return as-is
+_ATOMIC_TYPES = (str, int, float, bool, type(None), Enum)
+
+def _is_atomic_type(field_type: Any) -> bool:
+    """Whether values of field_type need no conversion in to_dict()"""
+    if isinstance(field_type, type):
+        return issubclass(field_type, _ATOMIC_TYPES)
+    if get_origin(field_type) is Union:
+        return all(_is_atomic_type(arg) for arg in get_args(field_type))
+    return False
+
+def _to_plain(value: Any) -> Any:
+    """Convert nested dataclasses and containers the way dataclasses.asdict does"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        to_dict = getattr(value, 'to_dict', None)
+        return to_dict() if to_dict else dataclasses.asdict(value)
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items()}
+    return value
+
+def fast_to_dict(cls: type) -> type:
+    """
+    Class decorator giving a dataclass a to_dict() generated for its fields
+    
+    Equivalent to dataclasses.asdict, but the field walk happens once at
+    decoration time instead of on every call. Fields with atomic types are
+    copied directly; the rest are converted recursively.
+    """
+    items = []
+    for f in dataclasses.fields(cls):
+        if _is_atomic_type(f.type):
+            items.append(f"{f.name!r}: self.{f.name}")
+        else:
+            items.append(f"{f.name!r}: _to_plain(self.{f.name})")
+    
+    namespace = {'_to_plain': _to_plain}
+    exec(f"def to_dict(self):\n    return {{{', '.join(items)}}}\n", namespace)
+    
+    to_dict = namespace['to_dict']
+    to_dict.__qualname__ = f"{cls.__qualname__}.to_dict"
+    to_dict.__doc__ = "Convert to dictionary"
+    cls.to_dict = to_dict
+    return cls
+
 class temp_directory:
     """Context manager for temporary directory"""
     
@@ -720,6 +888,9 @@ class LRUCache:
         
         self.cache[key] = value
     
+    def delete(self, key: str) -> None:
+        self.cache.pop(key, None)
+    
     def clear(self) -> None:
         self.cache.clear()
     
@@ -732,7 +903,7 @@ class LRUCache:
 
 __all__ = [
     # System utilities
-    'is_root', 'get_system_info', 'check_command_exists', 'run_command',
+    'is_root', 'get_system_info', 'check_command_exists', 'run_command', 'stream_command',
     
     # Network utilities
     'validate_ip_address', 'validate_cidr', 'validate_port', 'validate_hostname',
@@ -751,7 +922,7 @@ __all__ = [
     'compare_k8s_versions',
     
     # Decorators
-    'retry', 'timeout', 'measure_time', 'profile_memory',
+    'retry', 'timeout', 'fast_to_dict', 'measure_time', 'profile_memory',
     
     # Context managers
     'temp_directory', 'timer', 'LogContext',
@@ -11,17 +11,29 @@ import json
 import time
 import threading
 import queue
+import heapq
+import itertools
+from collections import deque
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Callable, Union
 from datetime import datetime
-from enum import Enum
-from dataclasses import dataclass, asdict
+from enum import Enum, IntEnum
+from dataclasses import dataclass
 import asyncio
 import websockets
 
+try:
+    # Optional: faster event loop for WebSocket log streaming
+    import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
 from ..config.settings import settings
+from .helpers import fast_to_dict
 
-class LogLevel(Enum):
+class LogLevel(IntEnum):
     """Log levels with numeric values"""
     DEBUG = 10
     INFO = 20
@@ -39,6 +51,7 @@ class LogCategory(Enum):
     DATABASE = "database"
     WEBSOCKET = "websocket"
 
+@fast_to_dict
 @dataclass
 class LogEntry:
     """Structured log entry"""
@@ -52,9 +65,20 @@ class LogEntry:
     host: Optional[str] = None
     extra: Optional[Dict[str, Any]] = None
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return asdict(self)
+    @classmethod
+    def from_record(cls, record: logging.LogRecord, include_extra: bool = True) -> 'LogEntry':
+        """Build entry from a log record"""
+        return cls(
+            timestamp=record.created,
+            level=record.levelname,
+            category=getattr(record, 'category', LogCategory.SYSTEM.value),
+            component=record.name,
+            message=record.getMessage(),
+            step=getattr(record, 'step', None),
+            installation_id=getattr(record, 'installation_id', None),
+            host=getattr(record, 'host', None),
+            extra=getattr(record, 'extra', {}) if include_extra else None
+        )
     
     def to_json(self) -> str:
         """Convert to JSON string"""
@@ -189,6 +213,15 @@ class WebSocketHandler(logging.Handler):
     
     def _stream_worker(self):
         """Worker thread for streaming logs"""
+        # One event loop for the thread's lifetime instead of one per send
+        loop = _new_event_loop()
+        try:
+            self._stream_loop(loop)
+        finally:
+            loop.close()
+    
+    def _stream_loop(self, loop: asyncio.AbstractEventLoop):
+        """Send queued log entries to clients until streaming stops"""
         while self.running:
             try:
                 # Get log entry with timeout
@@ -201,7 +234,7 @@ class WebSocketHandler(logging.Handler):
                 disconnected_clients = set()
                 for client in self.clients.copy():
                     try:
-                        asyncio.run(client.send(log_json))
+                        loop.run_until_complete(client.send(log_json))
                     except Exception:
                         disconnected_clients.add(client)
                 
@@ -214,6 +247,118 @@ class WebSocketHandler(logging.Handler):
                 file_logger = logging.getLogger('websocket_handler')
                 file_logger.error(f"Error in log streaming: {e}")
 
+class MemoryLogHandler(logging.Handler):
+    """Log handler that keeps recent entries in memory, bucketed by level"""
+    
+    def __init__(self, max_entries_per_level: int = 10000):
+        super().__init__()
+        self.buffers: Dict[int, deque] = {
+            level.value: deque(maxlen=max_entries_per_level) for level in LogLevel
+        }
+        self._sequence = itertools.count()
+    
+    def emit(self, record: logging.LogRecord):
+        """Store log record as a dictionary"""
+        buffer = self.buffers.get(record.levelno)
+        if buffer is None:
+            return
+        
+        try:
+            buffer.append((next(self._sequence), LogEntry.from_record(record).to_dict()))
+        except Exception:
+            self.handleError(record)
+    
+    def get_logs(self, min_level: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the most recent entries at or above min_level, oldest first"""
+        min_level = min_level or 0
+        
+        with self.lock:
+            # Walk each level's buffer newest-first and merge by sequence number,
+            # so only the last `limit` entries are visited
+            merged = heapq.merge(
+                *(reversed(buffer) for level, buffer in self.buffers.items()
+                  if level >= min_level),
+                key=itemgetter(0),
+                reverse=True
+            )
+            if limit:
+                merged = itertools.islice(merged, limit)
+            
+            entries = [entry for _, entry in merged]
+        
+        entries.reverse()
+        return entries
+
+class BackgroundLogHandler(logging.Handler):
+    """Log handler that hands records to a shared I/O thread for delivery
+    
+    Formatting and writing to the wrapped handlers happens off the calling
+    thread. The queue is bounded; records that don't fit are dropped and
+    counted rather than blocking the caller.
+    """
+    
+    QUEUE_SIZE = 10000
+    
+    _queue: "queue.Queue" = queue.Queue(maxsize=QUEUE_SIZE)
+    _worker: Optional[threading.Thread] = None
+    _worker_lock = threading.Lock()
+    
+    def __init__(self, *handlers: logging.Handler):
+        super().__init__()
+        self.handlers = handlers
+        self.dropped = 0
+        self._ensure_worker()
+    
+    @classmethod
+    def _ensure_worker(cls):
+        """Start the shared delivery thread on first use"""
+        with cls._worker_lock:
+            if cls._worker is None or not cls._worker.is_alive():
+                cls._worker = threading.Thread(
+                    target=cls._drain, name="log-writer", daemon=True
+                )
+                cls._worker.start()
+    
+    @classmethod
+    def _drain(cls):
+        """Deliver queued records to their handlers"""
+        while True:
+            owner, record = cls._queue.get()
+            try:
+                for handler in owner.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            except Exception:
+                owner.handleError(record)
+            finally:
+                cls._queue.task_done()
+    
+    def emit(self, record: logging.LogRecord):
+        """Queue record for delivery, dropping it if the queue is full"""
+        try:
+            # Resolve the message now so the record no longer depends on
+            # arguments the caller may mutate afterwards
+            record.msg = record.getMessage()
+            record.args = None
+            self._queue.put_nowait((self, record))
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        """Wait until every queued record has been delivered"""
+        self._queue.join()
+        for handler in self.handlers:
+            handler.flush()
+    
+    def close(self):
+        """Deliver pending records, then close the wrapped handlers"""
+        self.flush()
+        for handler in self.handlers:
+            handler.close()
+        super().close()
+
 class InstallationLogger:
     """Enhanced logger for installation processes"""
     
@@ -236,6 +381,11 @@ class InstallationLogger:
         # Setup handlers if not already configured
         if not self.logger.handlers:
             self._setup_handlers()
+        
+        # In-memory buffer backing the logs API
+        self.memory_handler = next(
+            (h for h in self.logger.handlers if isinstance(h, MemoryLogHandler)), None
+        )
     
     def _setup_handlers(self):
         """Setup log handlers for this installation"""
@@ -243,20 +393,32 @@ class InstallationLogger:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(ColoredFormatter())
         console_handler.setLevel(logging.INFO)
-        self.logger.addHandler(console_handler)
         
         # File handler for this installation
+        settings.storage.ensure_directories()
         log_file = Path(settings.storage.logs_directory) / f"installation_{self.installation_id}.log"
-        file_handler = logging.FileHandler(log_file)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=settings.monitoring.max_log_size_mb * 1024 * 1024,
+            backupCount=settings.monitoring.max_log_files
+        )
         file_handler.setFormatter(JSONFormatter())
         file_handler.setLevel(logging.DEBUG)
-        self.logger.addHandler(file_handler)
+        
+        # Console and file writes happen on the background log thread
+        self.logger.addHandler(BackgroundLogHandler(console_handler, file_handler))
         
         # WebSocket handler if provided
         if self.websocket_handler:
             self.websocket_handler.setLevel(logging.INFO)
             self.logger.addHandler(self.websocket_handler)
         
+        # Memory handler for recent logs, kept synchronous so the logs API
+        # sees entries immediately
+        memory_handler = MemoryLogHandler(settings.monitoring.max_log_files * 1000)
+        memory_handler.setLevel(logging.DEBUG)
+        self.logger.addHandler(memory_handler)
+        
         # Set logger level
         self.logger.setLevel(logging.DEBUG)
     
@@ -278,6 +440,19 @@ class InstallationLogger:
         
         return context
     
+    def get_logs(self, min_level: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get recent log entries for this installation"""
+        if not self.memory_handler:
+            return []
+        return self.memory_handler.get_logs(min_level, limit)
+    
+    @property
+    def dropped_messages(self) -> int:
+        """Number of records dropped because the log queue was full"""
+        return sum(
+            h.dropped for h in self.logger.handlers if isinstance(h, BackgroundLogHandler)
+        )
+    
     def set_step(self, step: str):
         """Set current installation step"""
         self.current_step = step
@@ -373,6 +548,7 @@ class LogManager:
     
     def __init__(self):
         self.websocket_handler: Optional[WebSocketHandler] = None
+        self.background_handler: Optional[BackgroundLogHandler] = None
         self.installation_loggers: Dict[str, InstallationLogger] = {}
         self._setup_root_logger()
     
@@ -388,9 +564,9 @@ class LogManager:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(ColoredFormatter())
         console_handler.setLevel(logging.INFO)
-        root_logger.addHandler(console_handler)
         
         # Main log file
+        settings.storage.ensure_directories()
         main_log_file = Path(settings.storage.logs_directory) / "app.log"
         file_handler = logging.handlers.RotatingFileHandler(
             main_log_file,
@@ -399,7 +575,6 @@ class LogManager:
         )
         file_handler.setFormatter(JSONFormatter())
         file_handler.setLevel(logging.DEBUG)
-        root_logger.addHandler(file_handler)
         
         # Error log file
         error_log_file = Path(settings.storage.logs_directory) / "error.log"
@@ -410,7 +585,11 @@ class LogManager:
         )
         error_handler.setFormatter(JSONFormatter())
         error_handler.setLevel(logging.ERROR)
-        root_logger.addHandler(error_handler)
+        
+        # Console and file writes happen on the background log thread; logging's
+        # own exit hook closes this handler, which drains the queue first
+        self.background_handler = BackgroundLogHandler(console_handler, file_handler, error_handler)
+        root_logger.addHandler(self.background_handler)
         
         # WebSocket handler if enabled
         if settings.websocket.enabled:
@@ -437,9 +616,10 @@ class LogManager:
         key = f"{component}.{installation_id}"
         if key in self.installation_loggers:
             logger = self.installation_loggers[key]
-            # Close handlers
-            for handler in logger.logger.handlers:
+            # Close and detach handlers; logging keeps the Logger itself alive
+            for handler in list(logger.logger.handlers):
                 handler.close()
+                logger.logger.removeHandler(handler)
             del self.installation_loggers[key]
     
     def add_websocket_client(self, websocket):
@@ -462,6 +642,8 @@ class LogManager:
             installation_id = key.split('.')[1]
             component = key.split('.')[0]
             self.cleanup_installation_logger(installation_id, component)
+        
+        self.background_handler.flush()
 
 # Global log manager instance
 log_manager = LogManager()
@@ -477,7 +659,7 @@ def get_installation_logger(installation_id: str, component: str = "installer")
 # Export main functions and classes
 __all__ = [
     'LogLevel', 'LogCategory', 'LogEntry',
-    'InstallationLogger', 'LogManager',
+    'MemoryLogHandler', 'BackgroundLogHandler', 'InstallationLogger', 'LogManager',
     'get_logger', 'get_installation_logger',
     'log_manager'
 ]
\ No newline at end of file
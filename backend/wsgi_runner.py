@@ -0,0 +1,47 @@
+"""
+Programmatic Gunicorn launcher for K8s Auto Installer
+Lets main.py serve the Flask app with Gunicorn without a separate config file
+"""
+
+import os
+from typing import Any, Callable, Dict
+
+from gunicorn.app.base import BaseApplication
+
+class StandaloneApplication(BaseApplication):
+    """Gunicorn application serving an already-created WSGI app"""
+
+    def __init__(self, application: Callable, options: Dict[str, Any] = None):
+        self.application = application
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        """Apply options that Gunicorn knows about"""
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key.lower(), value)
+
+    def load(self) -> Callable:
+        """Return the WSGI app to serve"""
+        return self.application
+
+def gunicorn_options(host: str, port: int, **overrides: Any) -> Dict[str, Any]:
+    """Default Gunicorn options for the API server
+
+    A single worker process keeps installation state in one place; concurrency
+    comes from the worker's threads, and keep-alive avoids a new TCP connection
+    per status poll.
+    """
+    options = {
+        'bind': f'{host}:{port}',
+        'workers': 1,
+        'worker_class': 'gthread',
+        'threads': 2 * (os.cpu_count() or 1) + 1,
+        'worker_connections': 1000,
+        'keepalive': 5,
+    }
+    options.update(overrides)
+    return options
+
+__all__ = ['StandaloneApplication', 'gunicorn_options']